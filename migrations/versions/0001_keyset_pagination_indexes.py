@@ -0,0 +1,49 @@
+"""keyset pagination indexes
+
+Revision ID: 0001_keyset_pagination_indexes
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_keyset_pagination_indexes'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) backing the (scope, sort_key, id) keyset on every list endpoint
+INDEXES = [
+    ("ix_memory_cards_user_created_at_id", "memory_cards", ["user_id", "created_at", "id"]),
+    ("ix_graph_nodes_user_created_at_id", "graph_nodes", ["user_id", "created_at", "id"]),
+    ("ix_graph_edges_user_created_at_id", "graph_edges", ["user_id", "created_at", "id"]),
+    ("ix_conversations_user_created_at_id", "conversations", ["user_id", "created_at", "id"]),
+    ("ix_chat_messages_conversation_timestamp_id", "chat_messages", ["conversation_id", "timestamp", "id"]),
+    ("ix_mood_logs_user_timestamp_id", "mood_logs", ["user_id", "timestamp", "id"]),
+    ("ix_timeline_events_user_timestamp_id", "timeline_events", ["user_id", "timestamp", "id"]),
+    ("ix_wiki_entries_user_created_at_id", "wiki_entries", ["user_id", "created_at", "id"]),
+    ("ix_habits_user_created_at_id", "habits", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # CONCURRENTLY keeps large tables writable while the index builds; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if not inspector.has_table(table):
+                continue
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
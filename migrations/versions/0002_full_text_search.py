@@ -0,0 +1,98 @@
+"""full text search
+
+Revision ID: 0002_full_text_search
+Revises: 0001_keyset_pagination_indexes
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_full_text_search'
+down_revision: Union[str, Sequence[str], None] = '0001_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (title column, body columns); mirrors src/database/fulltext.py
+SEARCHABLE = {
+    "wiki_entries": ("title", ["summary", "content"]),
+    "memory_cards": ("title", ["content"]),
+    "attachments": ("filename", ["ocr_text", "transcription"]),
+}
+
+
+def _tsvector_expression(title, body):
+    body_text = " || ' ' || ".join(f"coalesce({name}, '')" for name in body)
+    return (
+        f"setweight(to_tsvector('english'::regconfig, coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('english'::regconfig, {body_text}), 'B')"
+    )
+
+
+def _upgrade_postgresql(inspector):
+    tables = [table for table in SEARCHABLE if inspector.has_table(table)]
+    # Generated columns are recomputed inside the writing transaction, so the index is never stale
+    for table in tables:
+        title, body = SEARCHABLE[table]
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_tsvector_expression(title, body)}) STORED"
+        )
+    with op.get_context().autocommit_block():
+        for table in tables:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+
+def _upgrade_sqlite(inspector):
+    for table, (title, body) in SEARCHABLE.items():
+        if not inspector.has_table(table):
+            continue
+        columns = [title, *body]
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{name}" for name in columns)
+        old_values = ", ".join(f"old.{name}" for name in columns)
+        fts = f"{table}_fts"
+        op.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column_list}, content='{table}', content_rowid='rowid', tokenize='porter unicode61')")
+        # Triggers run inside the writing transaction, like the Postgres generated column
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if bind.dialect.name == "sqlite":
+        _upgrade_sqlite(inspector)
+    else:
+        _upgrade_postgresql(inspector)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for table in SEARCHABLE:
+        if bind.dialect.name == "sqlite":
+            fts = f"{table}_fts"
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        else:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
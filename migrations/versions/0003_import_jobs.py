@@ -0,0 +1,54 @@
+"""import jobs
+
+Revision ID: 0003_import_jobs
+Revises: 0002_full_text_search
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_import_jobs'
+down_revision: Union[str, Sequence[str], None] = '0002_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IMPORT_JOB_STATUS = sa.Enum("pending", "importing", "enriching", "completed", "failed", name="import_job_status")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by autogenerate after the model was added already have the table
+    if sa.inspect(op.get_bind()).has_table("import_jobs"):
+        return
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("status", IMPORT_JOB_STATUS, nullable=False),
+        sa.Column("source_filename", sa.String(), nullable=True),
+        sa.Column("upload_path", sa.String(), nullable=False),
+        sa.Column("total_records", sa.Integer(), nullable=False),
+        sa.Column("imported_records", sa.Integer(), nullable=False),
+        sa.Column("failed_records", sa.Integer(), nullable=False),
+        sa.Column("enriched_records", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_import_jobs_user_created_at_id", "import_jobs", ["user_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_import_jobs_user_created_at_id", table_name="import_jobs", if_exists=True)
+    op.drop_table("import_jobs", if_exists=True)
+    IMPORT_JOB_STATUS.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""deleted files
+
+Revision ID: 0004_deleted_files
+Revises: 0003_import_jobs
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_deleted_files'
+down_revision: Union[str, Sequence[str], None] = '0003_import_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by autogenerate after the model was added already have the table
+    if sa.inspect(op.get_bind()).has_table("deleted_files"):
+        return
+    op.create_table(
+        "deleted_files",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_deleted_files_deleted_at", "deleted_files", ["deleted_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_deleted_files_deleted_at", table_name="deleted_files", if_exists=True)
+    op.drop_table("deleted_files", if_exists=True)
@@ -0,0 +1,72 @@
+"""mood rollups
+
+Revision ID: 0005_mood_rollups
+Revises: 0004_deleted_files
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_mood_rollups'
+down_revision: Union[str, Sequence[str], None] = '0004_deleted_files'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MOOD_ROLLUP_PERIOD = sa.Enum("day", "week", "month", name="mood_rollup_period")
+
+# period -> bucket start of a UTC timestamp; mirrors period_start() in src/services/mood_analytics_service.py
+PERIOD_START = {
+    "postgresql": {
+        "day": "date_trunc('day', timestamp AT TIME ZONE 'UTC')::date",
+        "week": "date_trunc('week', timestamp AT TIME ZONE 'UTC')::date",
+        "month": "date_trunc('month', timestamp AT TIME ZONE 'UTC')::date",
+    },
+    "sqlite": {
+        "day": "date(timestamp)",
+        "week": "date(timestamp, '-6 days', 'weekday 1')",
+        "month": "date(timestamp, 'start of month')",
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("mood_rollups"):
+        op.create_table(
+            "mood_rollups",
+            sa.Column("user_id", sa.Uuid(), nullable=False),
+            sa.Column("period", MOOD_ROLLUP_PERIOD, nullable=False),
+            sa.Column("period_start", sa.Date(), nullable=False),
+            sa.Column("mood_label", sa.String(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("score_sum", sa.Integer(), nullable=False),
+            sa.Column("score_count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id", "period", "period_start", "mood_label"),
+        )
+
+    # Existing logs from here on are only ever adjusted incrementally, so build their rollups once
+    if not inspector.has_table("mood_logs"):
+        return
+    op.execute("DELETE FROM mood_rollups")
+    for period, bucket in PERIOD_START[bind.dialect.name].items():
+        # A bare literal would be typed text, which Postgres won't assign to the enum column
+        period_value = f"'{period}'::mood_rollup_period" if bind.dialect.name == "postgresql" else f"'{period}'"
+        op.execute(
+            f"INSERT INTO mood_rollups (user_id, period, period_start, mood_label, count, score_sum, score_count) "
+            f"SELECT user_id, {period_value}, {bucket}, mood_label, count(*), coalesce(sum(score), 0), count(score) "
+            f"FROM mood_logs GROUP BY user_id, {bucket}, mood_label"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("mood_rollups", if_exists=True)
+    MOOD_ROLLUP_PERIOD.drop(op.get_bind(), checkfirst=True)
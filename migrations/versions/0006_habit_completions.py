@@ -0,0 +1,47 @@
+"""habit completions
+
+Revision ID: 0006_habit_completions
+Revises: 0005_mood_rollups
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_habit_completions'
+down_revision: Union[str, Sequence[str], None] = '0005_mood_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by autogenerate after the model was added already have the table.
+    # Existing habits start with an empty history: their counters were never per period.
+    if sa.inspect(op.get_bind()).has_table("habit_completions"):
+        return
+    op.create_table(
+        "habit_completions",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("habit_id", sa.Uuid(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_habit_completions_habit_completed_at", "habit_completions", ["habit_id", "completed_at"])
+    op.create_index("ix_habit_completions_user_completed_at", "habit_completions", ["user_id", "completed_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_habit_completions_user_completed_at", table_name="habit_completions", if_exists=True)
+    op.drop_index("ix_habit_completions_habit_completed_at", table_name="habit_completions", if_exists=True)
+    op.drop_table("habit_completions", if_exists=True)
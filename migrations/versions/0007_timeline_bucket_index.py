@@ -0,0 +1,37 @@
+"""timeline bucket index
+
+Revision ID: 0007_timeline_bucket_index
+Revises: 0006_habit_completions
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_timeline_bucket_index'
+down_revision: Union[str, Sequence[str], None] = '0006_habit_completions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = ("ix_timeline_events_user_timestamp_type_mood", "timeline_events", ["user_id", "timestamp", "type", "mood_context"])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    name, table, columns = INDEX
+    if not sa.inspect(op.get_bind()).has_table(table):
+        return
+    # CONCURRENTLY keeps the table writable while the index builds; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    name, table, _ = INDEX
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
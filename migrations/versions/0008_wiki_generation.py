@@ -0,0 +1,62 @@
+"""wiki generation
+
+Revision ID: 0008_wiki_generation
+Revises: 0007_timeline_bucket_index
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_wiki_generation'
+down_revision: Union[str, Sequence[str], None] = '0007_timeline_bucket_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # Databases created by autogenerate after the models changed already have all of this
+    if inspector.has_table("wiki_entries"):
+        columns = {column["name"] for column in inspector.get_columns("wiki_entries")}
+        with op.batch_alter_table("wiki_entries") as batch_op:
+            if "cluster_id" not in columns:
+                batch_op.add_column(sa.Column("cluster_id", sa.Uuid(), nullable=True))
+            if "generated_at" not in columns:
+                batch_op.add_column(sa.Column("generated_at", sa.DateTime(timezone=True), nullable=True))
+            if "sources_checked_at" not in columns:
+                batch_op.add_column(sa.Column("sources_checked_at", sa.DateTime(timezone=True), nullable=True))
+        op.create_index("ix_wiki_entries_user_cluster_id", "wiki_entries", ["user_id", "cluster_id"], unique=True, if_not_exists=True)
+
+    if inspector.has_table("wiki_entry_sources"):
+        return
+    op.create_table(
+        "wiki_entry_sources",
+        sa.Column("wiki_entry_id", sa.Uuid(), nullable=False),
+        sa.Column("memory_card_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("content_hash", sa.String(length=32), nullable=False),
+        sa.ForeignKeyConstraint(["memory_card_id"], ["memory_cards.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["wiki_entry_id"], ["wiki_entries.id"]),
+        sa.PrimaryKeyConstraint("wiki_entry_id", "memory_card_id"),
+    )
+    op.create_index("ix_wiki_entry_sources_memory_card_id", "wiki_entry_sources", ["memory_card_id"])
+    op.create_index("ix_wiki_entry_sources_user_id", "wiki_entry_sources", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_wiki_entry_sources_user_id", table_name="wiki_entry_sources", if_exists=True)
+    op.drop_index("ix_wiki_entry_sources_memory_card_id", table_name="wiki_entry_sources", if_exists=True)
+    op.drop_table("wiki_entry_sources", if_exists=True)
+    op.drop_index("ix_wiki_entries_user_cluster_id", table_name="wiki_entries", if_exists=True)
+    with op.batch_alter_table("wiki_entries") as batch_op:
+        batch_op.drop_column("sources_checked_at")
+        batch_op.drop_column("generated_at")
+        batch_op.drop_column("cluster_id")
@@ -0,0 +1,38 @@
+"""dismissed wiki clusters
+
+Revision ID: 0009_dismissed_wiki_clusters
+Revises: 0008_wiki_generation
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_dismissed_wiki_clusters'
+down_revision: Union[str, Sequence[str], None] = '0008_wiki_generation'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by autogenerate after the model was added already have the table
+    if sa.inspect(op.get_bind()).has_table("dismissed_wiki_clusters"):
+        return
+    op.create_table(
+        "dismissed_wiki_clusters",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("cluster_id", sa.Uuid(), nullable=False),
+        sa.Column("dismissed_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "cluster_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("dismissed_wiki_clusters", if_exists=True)
@@ -0,0 +1,43 @@
+"""embedding reference indexes
+
+Revision ID: 0010_embedding_reference_indexes
+Revises: 0009_dismissed_wiki_clusters
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_embedding_reference_indexes'
+down_revision: Union[str, Sequence[str], None] = '0009_dismissed_wiki_clusters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Foreign keys into embeddings, probed by the garbage collector's anti-join for every candidate
+INDEXES = [
+    ("ix_memory_cards_embedding_id", "memory_cards", ["embedding_id"]),
+    ("ix_graph_nodes_embedding_id", "graph_nodes", ["embedding_id"]),
+    ("ix_wiki_entries_embedding_id", "wiki_entries", ["embedding_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # CONCURRENTLY keeps large tables writable while the index builds; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if not inspector.has_table(table):
+                continue
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
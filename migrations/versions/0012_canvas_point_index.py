@@ -0,0 +1,50 @@
+"""canvas point index
+
+Revision ID: 0012_canvas_point_index
+Revises: 0010_embedding_reference_indexes
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_canvas_point_index'
+down_revision: Union[str, Sequence[str], None] = '0010_embedding_reference_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # SQLite gets a (user_id, x, y) B-tree in 0017 instead
+    if bind.dialect.name == "sqlite" or not sa.inspect(bind).has_table("memory_cards"):
+        return
+    # A B-tree on (x, y) seeks on x only; GiST searches the viewport rectangle in both dimensions.
+    # btree_gist lets user_id share the index, so one user's cards never scan another's.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memory_cards_user_canvas_point "
+            "ON memory_cards USING gist (user_id, point(canvas_position_x, canvas_position_y))"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_memory_cards_user_canvas_position")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_memory_cards_user_canvas_position",
+            "memory_cards",
+            ["user_id", "canvas_position_x", "canvas_position_y"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_memory_cards_user_canvas_point")
@@ -0,0 +1,39 @@
+"""sqlite timestamp text
+
+Revision ID: 0013_sqlite_timestamp_text
+Revises: 0012_canvas_point_index
+Create Date: 2026-10-20 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_sqlite_timestamp_text'
+down_revision: Union[str, Sequence[str], None] = '0012_canvas_point_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    # src.database.types.DateTime now writes whole seconds without a fraction, like CURRENT_TIMESTAMP,
+    # so values bound earlier as '... .000000' must lose it to keep comparing equal as text
+    inspector = sa.inspect(bind)
+    for table in inspector.get_table_names():
+        for column in inspector.get_columns(table):
+            if isinstance(column["type"], sa.DateTime):
+                name = column["name"]
+                op.execute(f"UPDATE {table} SET {name} = substr({name}, 1, 19) WHERE {name} LIKE '%.000000'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Both spellings read back as the same datetime
+    pass
@@ -0,0 +1,61 @@
+"""inferred edge pair index
+
+Revision ID: 0014_inferred_edge_pair_index
+Revises: 0013_sqlite_timestamp_text
+Create Date: 2026-10-20 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014_inferred_edge_pair_index'
+down_revision: Union[str, Sequence[str], None] = '0013_sqlite_timestamp_text'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keeps the oldest-by-id edge of each duplicated pair, so the unique index below can build
+DEDUPE_INFERRED_EDGES = sa.text(
+    """
+    DELETE FROM graph_edges
+    WHERE type = 'inferred' AND EXISTS (
+        SELECT 1 FROM graph_edges AS kept
+        WHERE kept.type = 'inferred'
+          AND kept.source_node_id = graph_edges.source_node_id
+          AND kept.target_node_id = graph_edges.target_node_id
+          AND kept.id < graph_edges.id
+    )
+    """
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # Databases created by autogenerate after the model changed already have the index
+    if not inspector.has_table("graph_edges"):
+        return
+    if "uq_graph_edges_inferred_pair" not in {index["name"] for index in inspector.get_indexes("graph_edges")}:
+        op.execute(DEDUPE_INFERRED_EDGES)
+    # CONCURRENTLY keeps large tables writable while the index builds; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        # Edge inference's ON CONFLICT (source_node_id, target_node_id) WHERE type = 'inferred' needs it
+        op.create_index(
+            "uq_graph_edges_inferred_pair",
+            "graph_edges",
+            ["source_node_id", "target_node_id"],
+            unique=True,
+            postgresql_where=sa.text("type = 'inferred'"),
+            sqlite_where=sa.text("type = 'inferred'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("uq_graph_edges_inferred_pair", table_name="graph_edges", postgresql_concurrently=True, if_exists=True)
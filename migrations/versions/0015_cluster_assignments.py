@@ -0,0 +1,45 @@
+"""cluster assignments
+
+Revision ID: 0015_cluster_assignments
+Revises: 0014_inferred_edge_pair_index
+Create Date: 2026-10-20 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015_cluster_assignments'
+down_revision: Union[str, Sequence[str], None] = '0014_inferred_edge_pair_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by autogenerate after the model was added already have the table
+    if sa.inspect(op.get_bind()).has_table("cluster_assignments"):
+        return
+    op.create_table(
+        "cluster_assignments",
+        sa.Column("node_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("memory_card_id", sa.Uuid(), nullable=True),
+        sa.Column("cluster_id", sa.Uuid(), nullable=False),
+        sa.Column("cluster_label", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["memory_card_id"], ["memory_cards.id"]),
+        sa.ForeignKeyConstraint(["node_id"], ["graph_nodes.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("node_id"),
+    )
+    op.create_index("ix_cluster_assignments_user_id", "cluster_assignments", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_cluster_assignments_user_id", table_name="cluster_assignments", if_exists=True)
+    op.drop_table("cluster_assignments", if_exists=True)
@@ -0,0 +1,37 @@
+"""graph node centrality
+
+Revision ID: 0016_graph_node_centrality
+Revises: 0015_cluster_assignments
+Create Date: 2026-10-20 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0016_graph_node_centrality'
+down_revision: Union[str, Sequence[str], None] = '0015_cluster_assignments'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # Databases created by autogenerate after the model changed already have the column
+    if not inspector.has_table("graph_nodes"):
+        return
+    if "centrality" in {column["name"] for column in inspector.get_columns("graph_nodes")}:
+        return
+    # Nullable, so existing rows are picked up by the next background refresh
+    with op.batch_alter_table("graph_nodes") as batch_op:
+        batch_op.add_column(sa.Column("centrality", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("graph_nodes") as batch_op:
+        batch_op.drop_column("centrality")
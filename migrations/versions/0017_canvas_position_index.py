@@ -0,0 +1,40 @@
+"""canvas position index
+
+Revision ID: 0017_canvas_position_index
+Revises: 0016_graph_node_centrality
+Create Date: 2026-10-20 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0017_canvas_position_index'
+down_revision: Union[str, Sequence[str], None] = '0016_graph_node_centrality'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # Postgres searches the viewport with the GiST point index from 0012; the on-device canvas
+    # is small enough for a B-tree on (user_id, x, y)
+    if bind.dialect.name != "sqlite" or not sa.inspect(bind).has_table("memory_cards"):
+        return
+    op.create_index(
+        "ix_memory_cards_user_canvas_position",
+        "memory_cards",
+        ["user_id", "canvas_position_x", "canvas_position_y"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.drop_index("ix_memory_cards_user_canvas_position", table_name="memory_cards", if_exists=True)
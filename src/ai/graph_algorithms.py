@@ -0,0 +1,147 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def knn_similarity_pairs(
+    matrix: np.ndarray,
+    k: int,
+    min_similarity: float,
+    block_size: int = 1024,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-k cosine neighbours for every row of an L2-normalised matrix.
+
+    Similarities are computed one block of rows at a time (`block @ matrix.T`)
+    so peak memory is `block_size * n` floats instead of `n * n`. Returns
+    `(rows, cols, similarities)` with each undirected pair reported once
+    (`rows < cols`).
+    """
+    n = matrix.shape[0]
+    if n < 2 or k <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    k = min(k, n - 1)
+    rows, cols, sims = [], [], []
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = matrix[start:stop] @ matrix.T
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(block, top, axis=1)
+        keep = top_sims >= min_similarity
+
+        block_rows = np.broadcast_to(np.arange(start, stop)[:, None], top.shape)
+        rows.append(block_rows[keep])
+        cols.append(top[keep])
+        sims.append(top_sims[keep])
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    sims = np.concatenate(sims).astype(np.float32)
+
+    # A pair found from both ends is only reported once
+    low, high = np.minimum(rows, cols), np.maximum(rows, cols)
+    _, unique = np.unique(low * n + high, return_index=True)
+    return low[unique], high[unique], sims[unique]
+
+
+def label_propagation(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    labels: np.ndarray,
+    active: np.ndarray,
+    max_iterations: int,
+    seed: int = 0,
+) -> Tuple[np.ndarray, int]:
+    """Weighted label propagation over an undirected edge list.
+
+    Only nodes flagged in `active` may change label; the others keep their
+    current label and just vote for it, which is what makes incremental
+    reclustering of a dirty neighbourhood cheap. Updates are semi-synchronous
+    (a random half of the active nodes per round) to avoid the label
+    oscillation plain synchronous propagation shows on bipartite structures.
+    Returns the new labels and the number of rounds run.
+    """
+    labels = labels.copy()
+    if len(sources) == 0 or not active.any():
+        return labels, 0
+
+    src = np.concatenate([sources, targets])
+    dst = np.concatenate([targets, sources])
+    w = np.concatenate([weights, weights]).astype(np.float64)
+    into_active = active[dst]
+    src, dst, w = src[into_active], dst[into_active], w[into_active]
+    if len(src) == 0:
+        return labels, 0
+
+    label_space = int(labels.max()) + 1
+    rng = np.random.default_rng(seed)
+    rounds = 0
+    for rounds in range(1, max_iterations + 1):
+        # Sum edge weight per (node, candidate label)
+        keys, inverse = np.unique(dst * label_space + labels[src], return_inverse=True)
+        votes = np.bincount(inverse, weights=w)
+        nodes, candidates = keys // label_space, keys % label_space
+
+        # Highest vote per node, ties resolved in favour of the current label
+        votes = votes + np.where(candidates == labels[nodes], 1e-9, 0.0)
+        order = np.lexsort((votes, nodes))
+        nodes, candidates = nodes[order], candidates[order]
+        last = np.r_[nodes[1:] != nodes[:-1], True]
+        best_nodes, best_labels = nodes[last], candidates[last]
+
+        changed = labels[best_nodes] != best_labels
+        if not changed.any():
+            break
+        update = changed & (rng.random(len(best_nodes)) < 0.5)
+        labels[best_nodes[update]] = best_labels[update]
+
+    return labels, rounds
+
+
+def pagerank(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    n: int,
+    damping: float = 0.85,
+    tolerance: float = 1e-6,
+    max_iterations: int = 100,
+    initial: np.ndarray | None = None,
+) -> Tuple[np.ndarray, int]:
+    """Weighted PageRank on an undirected edge list by sparse power iteration.
+
+    Each iteration is one `np.bincount` scatter over the edge list, i.e. a
+    sparse matrix-vector product without materialising the matrix. Passing
+    the previous scores as `initial` warm-starts the iteration, so a small
+    graph change converges in a handful of rounds. Returns scores summing to
+    1 and the number of iterations run.
+    """
+    if n == 0:
+        return np.empty(0, dtype=np.float64), 0
+
+    src = np.concatenate([sources, targets])
+    dst = np.concatenate([targets, sources])
+    w = np.concatenate([weights, weights]).astype(np.float64)
+    out_weight = np.bincount(src, weights=w, minlength=n)
+    dangling = out_weight == 0
+    transition = w / np.where(out_weight[src] > 0, out_weight[src], 1.0)
+
+    if initial is not None and initial.shape == (n,) and initial.sum() > 0:
+        scores = initial / initial.sum()
+    else:
+        scores = np.full(n, 1.0 / n)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        spread = np.bincount(dst, weights=scores[src] * transition, minlength=n)
+        updated = damping * (spread + scores[dangling].sum() / n) + (1.0 - damping) / n
+        delta = np.abs(updated - scores).sum()
+        scores = updated
+        if delta < tolerance:
+            break
+
+    return scores, iterations
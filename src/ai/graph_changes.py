@@ -0,0 +1,41 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Set
+from uuid import UUID
+
+
+class GraphChangeTracker:
+    """Records which graph nodes changed since each derived view was last computed.
+
+    Every consumer (clustering, centrality, ...) gets its own dirty set per user
+    so each can recompute incrementally on its own schedule.
+    """
+
+    def __init__(self):
+        self._dirty: Dict[str, Dict[UUID, Set[UUID]]] = {}
+
+    def register(self, consumer: str):
+        self._dirty.setdefault(consumer, defaultdict(set))
+
+    def mark(self, user_id: UUID, node_ids: Iterable[UUID]):
+        node_ids = set(node_ids)
+        if not node_ids:
+            return
+        for dirty in self._dirty.values():
+            dirty[user_id].update(node_ids)
+
+    def pending(self, consumer: str, user_id: UUID) -> bool:
+        return bool(self._dirty[consumer].get(user_id))
+
+    def dirty_users(self, consumer: str) -> Set[UUID]:
+        return {user_id for user_id, node_ids in self._dirty[consumer].items() if node_ids}
+
+    def drain(self, consumer: str, user_id: UUID) -> Set[UUID]:
+        return self._dirty[consumer].pop(user_id, set())
+
+    def restore(self, consumer: str, user_id: UUID, node_ids: Iterable[UUID]):
+        # Put drained changes back when a recompute fails part-way
+        self._dirty[consumer][user_id].update(node_ids)
+
+
+# Process-wide tracker fed by the graph services
+graph_changes = GraphChangeTracker()
@@ -0,0 +1,129 @@
+import logging
+import os
+import re
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Lowercase words (with an optional apostrophe part) and the punctuation that carries mood
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|[?!]")
+
+NEUTRAL_LABEL = "Neutral"
+
+# Fallback when no trained model is installed: one unit of evidence per listed token
+MOOD_LEXICON: Dict[str, Tuple[str, ...]] = {
+    "Stressed": (
+        "stress", "stressed", "stressful", "stressing", "worried", "worry", "worrying", "anxious",
+        "anxiety", "overwhelmed", "nervous", "panic", "panicking", "pressure", "deadline", "deadlines",
+        "exhausted", "tense", "frustrated", "frustrating",
+    ),
+    "Sad": (
+        "sad", "unhappy", "depressed", "lonely", "miss", "missed", "cry", "cried", "crying",
+        "grief", "hurt", "disappointed", "upset", "heartbroken", "tired",
+    ),
+    "Excited": (
+        "excited", "exciting", "great", "thrilled", "awesome", "amazing", "finally", "wow",
+        "incredible", "fantastic", "!",
+    ),
+    "Happy": (
+        "happy", "glad", "joy", "joyful", "grateful", "thankful", "love", "loved", "lovely", "fun",
+        "enjoyed", "proud", "smile", "laughed", "wonderful",
+    ),
+    "Calm": (
+        "calm", "relaxed", "relaxing", "peaceful", "rested", "quiet", "chill", "meditated", "meditation",
+    ),
+    "Curious": (
+        "?", "curious", "wonder", "wondering", "learn", "learning", "explore", "interesting", "idea",
+    ),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class MoodClassifier:
+    """Bag-of-words linear mood model, applied to a whole batch of texts at once.
+
+    A text's logits are the bias plus the weight rows of its in-vocabulary
+    tokens; the label is the arg-max and the score its softmax probability.
+    Tokenizing is the only per-text Python work: the batch's token ids go
+    through one gather and one `bincount` per label, so throughput is bound
+    by the regex, not by the model.
+    """
+
+    def __init__(self, vocabulary: Mapping[str, int], weights: np.ndarray, bias: np.ndarray, labels: Sequence[str]):
+        self.vocabulary = dict(vocabulary)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = list(labels)
+
+    @classmethod
+    def load(cls, path: str) -> "MoodClassifier":
+        # An .npz with `vocabulary` (V strings), `weights` (V x L), `bias` (L) and `labels` (L strings)
+        with np.load(path, allow_pickle=False) as model:
+            vocabulary = {token: index for index, token in enumerate(model["vocabulary"].tolist())}
+            return cls(vocabulary, model["weights"], model["bias"], model["labels"].tolist())
+
+    @classmethod
+    def from_lexicon(cls, lexicon: Mapping[str, Sequence[str]] = MOOD_LEXICON, neutral_bias: float = 0.5) -> "MoodClassifier":
+        # Neutral has no words, only a head start that a single matching word overturns
+        labels = [NEUTRAL_LABEL] + [label for label in lexicon if label != NEUTRAL_LABEL]
+        vocabulary: Dict[str, int] = {}
+        for words in lexicon.values():
+            for word in words:
+                vocabulary.setdefault(word, len(vocabulary))
+        weights = np.zeros((len(vocabulary), len(labels)), dtype=np.float32)
+        for label, words in lexicon.items():
+            for word in words:
+                weights[vocabulary[word], labels.index(label)] = 1.0
+        bias = np.zeros(len(labels), dtype=np.float32)
+        bias[0] = neutral_bias
+        return cls(vocabulary, weights, bias, labels)
+
+    def classify(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(label, score) for each text, in order."""
+        n = len(texts)
+        if n == 0:
+            return []
+        lookup = self.vocabulary.get
+        ids: List[int] = []
+        owners: List[int] = []
+        for row, text in enumerate(texts):
+            hits = [index for index in map(lookup, tokenize(text or "")) if index is not None]
+            ids.extend(hits)
+            owners.extend([row] * len(hits))
+
+        logits = np.tile(self.bias.astype(np.float64), (n, 1))
+        if ids:
+            contributions = self.weights[np.asarray(ids, dtype=np.int64)]
+            owners_array = np.asarray(owners, dtype=np.int64)
+            for column in range(len(self.labels)):
+                logits[:, column] += np.bincount(owners_array, weights=contributions[:, column], minlength=n)
+
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        scores = probabilities[np.arange(n), best]
+        return [(self.labels[label], float(score)) for label, score in zip(best.tolist(), scores.tolist())]
+
+
+_mood_classifier: Optional[MoodClassifier] = None
+
+
+def get_mood_classifier() -> MoodClassifier:
+    # Loaded once per process; the lexicon stands in until a trained model is installed
+    global _mood_classifier
+    if _mood_classifier is None:
+        path = os.path.join(settings.GLOBAL_MODELS_PATH, settings.MOOD_MODEL_PATH)
+        if os.path.exists(path):
+            _mood_classifier = MoodClassifier.load(path)
+        else:
+            logger.info("No mood model at %s; classifying moods with the built-in lexicon", path)
+            _mood_classifier = MoodClassifier.from_lexicon()
+    return _mood_classifier
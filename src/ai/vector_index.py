@@ -0,0 +1,131 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    # L2-normalise so that a dot product is the cosine similarity
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return vectors / norms
+
+
+class _Partition:
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids: List[UUID] = []
+        self.rows: Dict[UUID, int] = {}
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def load(self, ids: Sequence[UUID], vectors: np.ndarray):
+        self.ids = list(ids)
+        self.rows = {id_: row for row, id_ in enumerate(self.ids)}
+        self.matrix = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(self.ids), self.dim))
+
+    def upsert(self, ids: Sequence[UUID], vectors: np.ndarray):
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        new_rows = []
+        for id_, vector in zip(ids, vectors):
+            row = self.rows.get(id_)
+            if row is None:
+                self.rows[id_] = len(self.ids)
+                self.ids.append(id_)
+                new_rows.append(vector)
+            else:
+                self.matrix[row] = vector
+        if new_rows:
+            self.matrix = np.vstack([self.matrix, np.stack(new_rows)])
+
+    def remove(self, ids: Iterable[UUID]):
+        doomed = {self.rows[id_] for id_ in ids if id_ in self.rows}
+        if not doomed:
+            return
+        keep = np.array([row for row in range(len(self.ids)) if row not in doomed], dtype=np.int64)
+        self.ids = [self.ids[row] for row in keep]
+        self.rows = {id_: row for row, id_ in enumerate(self.ids)}
+        self.matrix = self.matrix[keep]
+
+
+class VectorIndex:
+    """In-process cosine similarity index, partitioned per user and source type.
+
+    Vectors are kept L2-normalised in a dense float32 matrix so a top-k lookup
+    is a single matrix-vector product. Partitions are loaded lazily from the
+    `embeddings` table and kept in sync by the services that write embeddings.
+    """
+
+    def __init__(self):
+        self._partitions: Dict[Tuple[UUID, str], _Partition] = {}
+
+    def is_loaded(self, user_id: UUID, namespace: str) -> bool:
+        return (user_id, namespace) in self._partitions
+
+    def load(self, user_id: UUID, namespace: str, ids: Sequence[UUID], vectors: Sequence[Sequence[float]]):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1] if vectors.ndim == 2 and len(ids) else 0
+        partition = _Partition(dim)
+        if len(ids):
+            partition.load(ids, vectors)
+        self._partitions[(user_id, namespace)] = partition
+
+    def upsert(self, user_id: UUID, namespace: str, ids: Sequence[UUID], vectors: Sequence[Sequence[float]]):
+        if not ids:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        partition = self._partitions.get((user_id, namespace))
+        if partition is None or (len(partition) == 0 and partition.dim != vectors.shape[-1]):
+            partition = _Partition(vectors.shape[-1])
+            self._partitions[(user_id, namespace)] = partition
+        partition.upsert(ids, vectors)
+
+    def remove(self, user_id: UUID, namespace: str, ids: Iterable[UUID]):
+        partition = self._partitions.get((user_id, namespace))
+        if partition is not None:
+            partition.remove(ids)
+
+    def drop(self, user_id: UUID, namespace: Optional[str] = None):
+        for key in [key for key in self._partitions if key[0] == user_id and namespace in (None, key[1])]:
+            del self._partitions[key]
+
+    def snapshot(self, user_id: UUID, namespace: str) -> Tuple[List[UUID], np.ndarray]:
+        partition = self._partitions.get((user_id, namespace))
+        if partition is None:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return list(partition.ids), partition.matrix
+
+    def search(
+        self,
+        user_id: UUID,
+        namespace: str,
+        query: Sequence[float],
+        k: int,
+        min_similarity: float = -1.0,
+        exclude: Iterable[UUID] = (),
+    ) -> List[Tuple[UUID, float]]:
+        partition = self._partitions.get((user_id, namespace))
+        if partition is None or len(partition) == 0:
+            return []
+
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        similarities = partition.matrix @ query
+        for id_ in exclude:
+            row = partition.rows.get(id_)
+            if row is not None:
+                similarities[row] = -np.inf
+
+        k = min(k, len(partition))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [
+            (partition.ids[row], float(similarities[row]))
+            for row in top
+            if similarities[row] >= min_similarity
+        ]
+
+
+# Process-wide index shared by the AI pipeline and graph services
+vector_index = VectorIndex()
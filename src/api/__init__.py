@@ -2,7 +2,7 @@ from fastapi import APIRouter
 
 api_router = APIRouter()
 
-from . import auth, users, memory_cards, attachments, graph, chat, life_os
+from . import auth, users, memory_cards, attachments, graph, chat, life_os, realtime, search, imports, export
 
 api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
@@ -11,3 +11,7 @@ api_router.include_router(attachments.router, prefix="/attachments", tags=["Atta
 api_router.include_router(graph.router, prefix="/graph", tags=["Graph"])
 api_router.include_router(chat.router, prefix="/chat", tags=["Chat"])
 api_router.include_router(life_os.router, prefix="/life-os", tags=["Life OS"])
+api_router.include_router(realtime.router, prefix="/realtime", tags=["Realtime"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(imports.router, prefix="/imports", tags=["Imports"])
+api_router.include_router(export.router, prefix="/export", tags=["Export"])
@@ -1,10 +1,11 @@
 from typing import Annotated, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, status, UploadFile, File
 
 from src.schemas.attachment import AttachmentResponse
-from src.services.attachment_service import AttachmentService
+from src.core.tasks import run_with_session
+from src.services.attachment_service import AttachmentService, process_attachment_job
 from src.api.deps import CurrentUser
 
 router = APIRouter()
@@ -14,9 +15,13 @@ async def upload_attachment_for_memory_card(
     memory_card_id: UUID,
     file: Annotated[UploadFile, File(...)],
     current_user_id: CurrentUser,
-    attachment_service: Annotated[AttachmentService, Depends()]
+    attachment_service: Annotated[AttachmentService, Depends()],
+    background_tasks: BackgroundTasks
 ):
-    return await attachment_service.upload_attachment(UUID(current_user_id), memory_card_id, file)
+    attachment = await attachment_service.upload_attachment(UUID(current_user_id), memory_card_id, file)
+    # OCR/transcription runs after the response; progress arrives as attachment events
+    background_tasks.add_task(run_with_session, process_attachment_job, UUID(current_user_id), attachment.id)
+    return attachment
 
 @router.get("/{memory_card_id}", response_model=List[AttachmentResponse])
 async def get_attachments_for_memory_card(
@@ -1,11 +1,14 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
+from src.schemas.common import Page
 from src.schemas.chat import ConversationCreate, ConversationResponse, ChatMessageCreate, ChatMessageResponse
 from src.services.chat_service import ChatService
 from src.services.ai_pipeline_service import AiPipelineService
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.serialization import page_response, ndjson_response, wants_ndjson
 from src.api.deps import CurrentUser
 
 router = APIRouter()
@@ -19,12 +22,15 @@ async def create_conversation(
 ):
     return await chat_service.create_conversation(UUID(current_user_id), conversation_data)
 
-@router.get("/conversations", response_model=List[ConversationResponse])
+@router.get("/conversations", response_model=Page[ConversationResponse])
 async def get_all_conversations(
     current_user_id: CurrentUser,
-    chat_service: Annotated[ChatService, Depends()]
+    chat_service: Annotated[ChatService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await chat_service.get_all_conversations(UUID(current_user_id))
+    items, next_cursor = await chat_service.get_all_conversations(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation_by_id(
@@ -54,13 +60,19 @@ async def create_chat_message(
 ):
     return await chat_service.create_chat_message(UUID(current_user_id), conversation_id, message_data)
 
-@router.get("/conversations/{conversation_id}/messages", response_model=List[ChatMessageResponse])
+@router.get("/conversations/{conversation_id}/messages", response_model=Page[ChatMessageResponse])
 async def get_messages_for_conversation(
+    request: Request,
     conversation_id: UUID,
     current_user_id: CurrentUser,
-    chat_service: Annotated[ChatService, Depends()]
+    chat_service: Annotated[ChatService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await chat_service.get_messages_for_conversation(UUID(current_user_id), conversation_id)
+    if wants_ndjson(request):
+        return ndjson_response(await chat_service.stream_messages_for_conversation(UUID(current_user_id), conversation_id, cursor=cursor))
+    items, next_cursor = await chat_service.get_messages_for_conversation(UUID(current_user_id), conversation_id, limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.post("/conversations/{conversation_id}/chat-with-ai", response_model=ChatMessageResponse)
 async def chat_with_ai(
@@ -3,7 +3,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.connection import get_db_session
-from src.core.security import get_current_user_id
+from src.core.security import get_current_user_id, get_optional_user_id
 from src.services.user_service import UserService
 from src.services.auth_service import AuthService
 from src.services.memory_card_service import MemoryCardService
@@ -12,10 +12,20 @@ from src.services.graph_service import GraphService
 from src.services.chat_service import ChatService
 from src.services.life_os_service import LifeOsService
 from src.services.ai_pipeline_service import AiPipelineService
+from src.services.edge_inference_service import EdgeInferenceService
+from src.services.clustering_service import ClusteringService
+from src.services.cascade_delete_service import CascadeDeleteService
+from src.services.search_service import SearchService
+from src.services.import_service import ImportService
+from src.services.export_service import ExportService
+from src.services.mood_analytics_service import MoodAnalyticsService
+from src.services.habit_stats_service import HabitStatsService
+from src.services.timeline_service import TimelineService
 
 # Database session dependency
-async def get_db() -> Generator[AsyncSession, None, None]:
-    async for session in get_db_session():
+async def get_db(user_id: Annotated[str | None, Depends(get_optional_user_id)]) -> Generator[AsyncSession, None, None]:
+    # Knowing the user lets the session keep their reads on the primary right after they write
+    async for session in get_db_session(user_id):
         yield session
 
 # Current user ID dependency
@@ -45,3 +55,30 @@ def get_life_os_service(db: Annotated[AsyncSession, Depends(get_db)]) -> LifeOsS
 
 def get_ai_pipeline_service(db: Annotated[AsyncSession, Depends(get_db)]) -> AiPipelineService:
     return AiPipelineService(db)
+
+def get_edge_inference_service(db: Annotated[AsyncSession, Depends(get_db)]) -> EdgeInferenceService:
+    return EdgeInferenceService(db)
+
+def get_clustering_service(db: Annotated[AsyncSession, Depends(get_db)]) -> ClusteringService:
+    return ClusteringService(db)
+
+def get_cascade_delete_service(db: Annotated[AsyncSession, Depends(get_db)]) -> CascadeDeleteService:
+    return CascadeDeleteService(db)
+
+def get_search_service(db: Annotated[AsyncSession, Depends(get_db)]) -> SearchService:
+    return SearchService(db)
+
+def get_import_service(db: Annotated[AsyncSession, Depends(get_db)]) -> ImportService:
+    return ImportService(db)
+
+def get_export_service(db: Annotated[AsyncSession, Depends(get_db)]) -> ExportService:
+    return ExportService(db)
+
+def get_mood_analytics_service(db: Annotated[AsyncSession, Depends(get_db)]) -> MoodAnalyticsService:
+    return MoodAnalyticsService(db)
+
+def get_habit_stats_service(db: Annotated[AsyncSession, Depends(get_db)]) -> HabitStatsService:
+    return HabitStatsService(db)
+
+def get_timeline_service(db: Annotated[AsyncSession, Depends(get_db)]) -> TimelineService:
+    return TimelineService(db)
\ No newline at end of file
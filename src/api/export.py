@@ -0,0 +1,25 @@
+from typing import Annotated, Optional
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.services.export_service import ExportService
+from src.api.deps import CurrentUser
+
+router = APIRouter()
+
+@router.get("/", response_class=StreamingResponse)
+async def export_account(
+    current_user_id: CurrentUser,
+    export_service: Annotated[ExportService, Depends()],
+    since: Optional[datetime] = Query(None, description="Only rows created or updated at or after this time, e.g. the next_since of the previous backup's manifest")
+):
+    # Built while it downloads; the request session stays open until the last byte is sent
+    filename = f"memoroo-export-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.zip"
+    return StreamingResponse(
+        export_service.export_archive(UUID(current_user_id), since),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,10 +1,16 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, status
 
-from src.schemas.graph import GraphNodeCreate, GraphNodeUpdate, GraphNodeResponse, GraphEdgeCreate, GraphEdgeUpdate, GraphEdgeResponse
+from src.schemas.graph import GraphNodeCreate, GraphNodeUpdate, GraphNodeResponse, GraphEdgeCreate, GraphEdgeUpdate, GraphEdgeResponse, ClusterAssignmentResponse, GraphBatchRequest, GraphBatchResponse
+from src.schemas.common import BulkDeleteRequest, BulkDeleteResponse, Page
 from src.services.graph_service import GraphService
+from src.services.clustering_service import ClusteringService, recompute_clusters_job
+from src.services.edge_inference_service import infer_edges_job, rebuild_inferred_edges_job
+from src.core.tasks import run_with_session
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.serialization import page_response, ndjson_response, wants_ndjson
 from src.api.deps import CurrentUser
 
 router = APIRouter()
@@ -14,16 +20,27 @@ router = APIRouter()
 async def create_graph_node(
     node_data: GraphNodeCreate,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
 ):
-    return await graph_service.create_node(UUID(current_user_id), node_data)
+    node = await graph_service.create_node(UUID(current_user_id), node_data)
+    if node.embedding_id:
+        background_tasks.add_task(run_with_session, infer_edges_job, UUID(current_user_id), [node.id])
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return node
 
-@router.get("/nodes", response_model=List[GraphNodeResponse])
+@router.get("/nodes", response_model=Page[GraphNodeResponse])
 async def get_all_graph_nodes(
+    request: Request,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await graph_service.get_all_nodes(UUID(current_user_id))
+    if wants_ndjson(request):
+        return ndjson_response(graph_service.stream_all_nodes(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await graph_service.get_all_nodes(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.get("/nodes/{node_id}", response_model=GraphNodeResponse)
 async def get_graph_node_by_id(
@@ -38,34 +55,72 @@ async def update_graph_node(
     node_id: UUID,
     node_data: GraphNodeUpdate,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
 ):
-    return await graph_service.update_node(UUID(current_user_id), node_id, node_data)
+    node = await graph_service.update_node(UUID(current_user_id), node_id, node_data)
+    # Re-embedded nodes get their similarity edges recomputed
+    if node.embedding_id and "embedding_id" in node_data.model_fields_set:
+        background_tasks.add_task(run_with_session, infer_edges_job, UUID(current_user_id), [node.id])
+        background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return node
 
 @router.delete("/nodes/{node_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_graph_node(
     node_id: UUID,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
 ):
     await graph_service.delete_node(UUID(current_user_id), node_id)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
     return None
 
+@router.post("/nodes/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_graph_nodes(
+    delete_data: BulkDeleteRequest,
+    current_user_id: CurrentUser,
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
+):
+    deleted = await graph_service.delete_nodes(UUID(current_user_id), delete_data.ids)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return BulkDeleteResponse(deleted=deleted)
+
 # --- Graph Edges ---
 @router.post("/edges", response_model=GraphEdgeResponse, status_code=status.HTTP_201_CREATED)
 async def create_graph_edge(
     edge_data: GraphEdgeCreate,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
+):
+    edge = await graph_service.create_edge(UUID(current_user_id), edge_data)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return edge
+
+@router.post("/edges/infer", status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_inferred_graph_edges(
+    current_user_id: CurrentUser,
+    background_tasks: BackgroundTasks
 ):
-    return await graph_service.create_edge(UUID(current_user_id), edge_data)
+    # Full-graph kNN rebuild; runs after the response is sent
+    background_tasks.add_task(run_with_session, rebuild_inferred_edges_job, UUID(current_user_id))
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return {"status": "accepted"}
 
-@router.get("/edges", response_model=List[GraphEdgeResponse])
+@router.get("/edges", response_model=Page[GraphEdgeResponse])
 async def get_all_graph_edges(
+    request: Request,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await graph_service.get_all_edges(UUID(current_user_id))
+    if wants_ndjson(request):
+        return ndjson_response(graph_service.stream_all_edges(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await graph_service.get_all_edges(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.get("/edges/{edge_id}", response_model=GraphEdgeResponse)
 async def get_graph_edge_by_id(
@@ -80,15 +135,53 @@ async def update_graph_edge(
     edge_id: UUID,
     edge_data: GraphEdgeUpdate,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
 ):
-    return await graph_service.update_edge(UUID(current_user_id), edge_id, edge_data)
+    edge = await graph_service.update_edge(UUID(current_user_id), edge_id, edge_data)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return edge
 
 @router.delete("/edges/{edge_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_graph_edge(
     edge_id: UUID,
     current_user_id: CurrentUser,
-    graph_service: Annotated[GraphService, Depends()]
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
 ):
     await graph_service.delete_edge(UUID(current_user_id), edge_id)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
     return None
+
+# --- Batch mutations ---
+@router.post("/batch", response_model=GraphBatchResponse, status_code=status.HTTP_201_CREATED)
+async def apply_graph_batch(
+    batch: GraphBatchRequest,
+    current_user_id: CurrentUser,
+    graph_service: Annotated[GraphService, Depends()],
+    background_tasks: BackgroundTasks
+):
+    # Creates many nodes and edges in a single transaction
+    result = await graph_service.apply_batch(UUID(current_user_id), batch)
+    embedded_node_ids = [node.id for node in result.nodes if node.embedding_id]
+    if embedded_node_ids:
+        background_tasks.add_task(run_with_session, infer_edges_job, UUID(current_user_id), embedded_node_ids)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return result
+
+# --- Clusters ---
+@router.get("/clusters", response_model=List[ClusterAssignmentResponse])
+async def get_cluster_assignments(
+    current_user_id: CurrentUser,
+    clustering_service: Annotated[ClusteringService, Depends()]
+):
+    # Precomputed assignments for both the canvas and the graph explorer
+    return await clustering_service.get_cluster_assignments(UUID(current_user_id))
+
+@router.post("/clusters/recompute", status_code=status.HTTP_202_ACCEPTED)
+async def recompute_clusters(
+    current_user_id: CurrentUser,
+    background_tasks: BackgroundTasks
+):
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id), full=True)
+    return {"status": "accepted"}
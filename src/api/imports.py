@@ -0,0 +1,45 @@
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, status
+
+from src.schemas.common import Page
+from src.schemas.import_job import ImportJobResponse
+from src.services.import_service import ImportService, run_import_job
+from src.core.serialization import page_response
+from src.core.tasks import run_with_session
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.api.deps import CurrentUser
+
+router = APIRouter()
+
+@router.post("/", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_import(
+    request: Request,
+    current_user_id: CurrentUser,
+    import_service: Annotated[ImportService, Depends()],
+    background_tasks: BackgroundTasks,
+    filename: Optional[str] = Query(None, max_length=255)
+):
+    # The raw body is either NDJSON (one card per line) or a zip of .ndjson files plus the files they reference
+    job = await import_service.create_job(UUID(current_user_id), request.stream(), filename)
+    background_tasks.add_task(run_with_session, run_import_job, UUID(current_user_id), job.id)
+    return job
+
+@router.get("/", response_model=Page[ImportJobResponse])
+async def get_all_imports(
+    current_user_id: CurrentUser,
+    import_service: Annotated[ImportService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    items, next_cursor = await import_service.get_all_jobs(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: UUID,
+    current_user_id: CurrentUser,
+    import_service: Annotated[ImportService, Depends()]
+):
+    return await import_service.get_job(UUID(current_user_id), job_id)
@@ -1,15 +1,25 @@
 from typing import Annotated, List, Optional
+from datetime import date, datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Query, Request
 
+from src.schemas.common import Page
 from src.schemas.life_os import (
-    MoodLogCreate, MoodLogResponse,
-    TimelineEventCreate, TimelineEventResponse,
-    WikiEntryCreate, WikiEntryUpdate, WikiEntryResponse,
-    HabitCreate, HabitUpdate, HabitResponse
+    MoodLogCreate, MoodLogResponse, MoodPeriod, MoodAnalyticsResponse,
+    TimelineEventCreate, TimelineEventResponse, TimelineBucketSize, TimelineResponse,
+    WikiEntryCreate, WikiEntryUpdate, WikiEntryResponse, WikiEntrySourceResponse,
+    HabitCreate, HabitUpdate, HabitResponse, HabitSummary
 )
 from src.services.life_os_service import LifeOsService
+from src.services.mood_analytics_service import MoodAnalyticsService, period_start
+from src.services.habit_stats_service import HabitStatsService
+from src.services.timeline_service import TimelineService, bucket_floor
+from src.services.mood_backfill_service import backfill_moods_job
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.serialization import page_response, ndjson_response, wants_ndjson
+from src.core.response_cache import cached_response
+from src.core.tasks import run_with_session
 from src.api.deps import CurrentUser
 
 router = APIRouter()
@@ -23,12 +33,19 @@ async def create_mood_log(
 ):
     return await life_os_service.create_mood_log(UUID(current_user_id), log_data)
 
-@router.get("/mood-logs", response_model=List[MoodLogResponse])
+@router.get("/mood-logs", response_model=Page[MoodLogResponse])
+@cached_response(Page[MoodLogResponse], "mood_log")
 async def get_all_mood_logs(
+    request: Request,
     current_user_id: CurrentUser,
-    life_os_service: Annotated[LifeOsService, Depends()]
+    life_os_service: Annotated[LifeOsService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await life_os_service.get_all_mood_logs(UUID(current_user_id))
+    if wants_ndjson(request):
+        return ndjson_response(life_os_service.stream_all_mood_logs(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await life_os_service.get_all_mood_logs(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.delete("/mood-logs/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_mood_log(
@@ -39,6 +56,31 @@ async def delete_mood_log(
     await life_os_service.delete_mood_log(UUID(current_user_id), log_id)
     return None
 
+def _current_mood_period(params) -> Optional[date]:
+    # Without `end` the range ends at the current period, which moves on at UTC midnight
+    return None if params["end"] else period_start(params["period"].value, datetime.now(timezone.utc).date())
+
+@router.get("/mood-analytics", response_model=MoodAnalyticsResponse)
+@cached_response(MoodAnalyticsResponse, "mood_log", vary=_current_mood_period)
+async def get_mood_analytics(
+    current_user_id: CurrentUser,
+    mood_analytics_service: Annotated[MoodAnalyticsService, Depends()],
+    period: MoodPeriod = Query(MoodPeriod.day),
+    start: Optional[date] = Query(None, description="First bucket (UTC); defaults to 90 periods before end"),
+    end: Optional[date] = Query(None, description="Last bucket (UTC); defaults to today"),
+    window: int = Query(7, ge=1, le=365, description="Periods in the moving average")
+):
+    return await mood_analytics_service.get_mood_analytics(UUID(current_user_id), period.value, start, end, window)
+
+@router.post("/mood-backfill", status_code=status.HTTP_202_ACCEPTED)
+async def backfill_moods(
+    current_user_id: CurrentUser,
+    background_tasks: BackgroundTasks
+):
+    # Classifies the caller's chat messages and timeline events that have no mood_context yet
+    background_tasks.add_task(run_with_session, backfill_moods_job, UUID(current_user_id))
+    return None
+
 # --- Timeline Events ---
 @router.post("/timeline-events", response_model=TimelineEventResponse, status_code=status.HTTP_201_CREATED)
 async def create_timeline_event(
@@ -48,12 +90,40 @@ async def create_timeline_event(
 ):
     return await life_os_service.create_timeline_event(UUID(current_user_id), event_data)
 
-@router.get("/timeline-events", response_model=List[TimelineEventResponse])
+@router.get("/timeline-events", response_model=Page[TimelineEventResponse])
+@cached_response(Page[TimelineEventResponse], "timeline_event", "memory_card") # Deleting a card deletes its events
 async def get_all_timeline_events(
+    request: Request,
     current_user_id: CurrentUser,
-    life_os_service: Annotated[LifeOsService, Depends()]
+    life_os_service: Annotated[LifeOsService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    if wants_ndjson(request):
+        return ndjson_response(life_os_service.stream_all_timeline_events(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await life_os_service.get_all_timeline_events(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
+
+def _current_timeline_bucket(params) -> Optional[datetime]:
+    # Without `end` the range ends at the bucket containing now, which moves on every hour at the least
+    return None if params["end"] else bucket_floor(params["bucket"].value, datetime.now(timezone.utc))
+
+@router.get("/timeline", response_model=TimelineResponse)
+@cached_response(TimelineResponse, "timeline_event", "memory_card", vary=_current_timeline_bucket)
+async def get_timeline(
+    current_user_id: CurrentUser,
+    timeline_service: Annotated[TimelineService, Depends()],
+    bucket: TimelineBucketSize = Query(TimelineBucketSize.day),
+    start: Optional[datetime] = Query(None, description="Range start (UTC if naive); defaults to 90 buckets before end"),
+    end: Optional[datetime] = Query(None, description="Falls in the last bucket; defaults to now"),
+    detail_start: Optional[datetime] = Query(None, description="Full events are returned only from detail_start to detail_end"),
+    detail_end: Optional[datetime] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await life_os_service.get_all_timeline_events(UUID(current_user_id))
+    return await timeline_service.get_timeline(
+        UUID(current_user_id), bucket.value, start, end, detail_start, detail_end, limit=limit, cursor=cursor
+    )
 
 @router.delete("/timeline-events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_timeline_event(
@@ -73,14 +143,23 @@ async def create_wiki_entry(
 ):
     return await life_os_service.create_wiki_entry(UUID(current_user_id), entry_data)
 
-@router.get("/wiki-entries", response_model=List[WikiEntryResponse])
+@router.get("/wiki-entries", response_model=Page[WikiEntryResponse])
+@cached_response(Page[WikiEntryResponse], "wiki_entry")
 async def get_all_wiki_entries(
+    request: Request,
     current_user_id: CurrentUser,
-    life_os_service: Annotated[LifeOsService, Depends()]
+    life_os_service: Annotated[LifeOsService, Depends()],
+    search: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    return await life_os_service.get_all_wiki_entries(UUID(current_user_id))
+    if wants_ndjson(request):
+        return ndjson_response(life_os_service.stream_all_wiki_entries(UUID(current_user_id), search_query=search, cursor=cursor))
+    items, next_cursor = await life_os_service.get_all_wiki_entries(UUID(current_user_id), search_query=search, limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
 
 @router.get("/wiki-entries/{entry_id}", response_model=WikiEntryResponse)
+@cached_response(WikiEntryResponse, "wiki_entry")
 async def get_wiki_entry_by_id(
     entry_id: UUID,
     current_user_id: CurrentUser,
@@ -88,6 +167,15 @@ async def get_wiki_entry_by_id(
 ):
     return await life_os_service.get_wiki_entry_by_id(UUID(current_user_id), entry_id)
 
+@router.get("/wiki-entries/{entry_id}/sources", response_model=List[WikiEntrySourceResponse])
+@cached_response(List[WikiEntrySourceResponse], "wiki_entry", "memory_card")
+async def get_wiki_entry_sources(
+    entry_id: UUID,
+    current_user_id: CurrentUser,
+    life_os_service: Annotated[LifeOsService, Depends()]
+):
+    return await life_os_service.get_wiki_entry_sources(UUID(current_user_id), entry_id)
+
 @router.put("/wiki-entries/{entry_id}", response_model=WikiEntryResponse)
 async def update_wiki_entry(
     entry_id: UUID,
@@ -115,14 +203,34 @@ async def create_habit(
 ):
     return await life_os_service.create_habit(UUID(current_user_id), habit_data)
 
-@router.get("/habits", response_model=List[HabitResponse])
+def _utc_today(params) -> date:
+    # Current values and streaks are recomputed as of today, so a cached habit expires at UTC midnight
+    return datetime.now(timezone.utc).date()
+
+@router.get("/habits", response_model=Page[HabitResponse])
+@cached_response(Page[HabitResponse], "habit", vary=_utc_today)
 async def get_all_habits(
+    request: Request,
     current_user_id: CurrentUser,
-    life_os_service: Annotated[LifeOsService, Depends()]
+    life_os_service: Annotated[LifeOsService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    if wants_ndjson(request):
+        return ndjson_response(life_os_service.stream_all_habits(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await life_os_service.get_all_habits(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
+
+# Not response-cached: streaks and the heatmap move on at midnight without any write
+@router.get("/habits/summary", response_model=List[HabitSummary])
+async def get_habit_summaries(
+    current_user_id: CurrentUser,
+    habit_stats_service: Annotated[HabitStatsService, Depends()]
 ):
-    return await life_os_service.get_all_habits(UUID(current_user_id))
+    return await habit_stats_service.get_habit_summaries(UUID(current_user_id))
 
 @router.get("/habits/{habit_id}", response_model=HabitResponse)
+@cached_response(HabitResponse, "habit", vary=_utc_today)
 async def get_habit_by_id(
     habit_id: UUID,
     current_user_id: CurrentUser,
@@ -143,9 +251,10 @@ async def update_habit(
 async def complete_habit_step(
     habit_id: UUID,
     current_user_id: CurrentUser,
-    life_os_service: Annotated[LifeOsService, Depends()]
+    life_os_service: Annotated[LifeOsService, Depends()],
+    value: float = Query(1.0, gt=0, description="Amount completed, in the habit's unit")
 ):
-    return await life_os_service.complete_habit_step(UUID(current_user_id), habit_id)
+    return await life_os_service.complete_habit_step(UUID(current_user_id), habit_id, value)
 
 @router.delete("/habits/{habit_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_habit(
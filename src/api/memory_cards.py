@@ -1,10 +1,17 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
 
-from src.schemas.memory_card import MemoryCardCreate, MemoryCardUpdate, MemoryCardResponse, MemoryCardCanvasPositionUpdate
+from src.schemas.common import BulkDeleteRequest, BulkDeleteResponse, Page
+from src.schemas.memory_card import MemoryCardCreate, MemoryCardUpdate, MemoryCardResponse, MemoryCardCanvasPositionUpdate, MemoryCardCanvasPositionBatch, MemoryCardCanvasPositionBatchResponse, CanvasViewportResponse
 from src.services.memory_card_service import MemoryCardService
+from src.services.canvas_position_writer import canvas_position_writer
+from src.services.clustering_service import recompute_clusters_job
+from src.core.tasks import run_with_session
+from src.core.response_cache import cached_response
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.serialization import page_response, ndjson_response, wants_ndjson
 from src.api.deps import CurrentUser
 
 router = APIRouter()
@@ -17,14 +24,58 @@ async def create_memory_card(
 ):
     return await memory_card_service.create_memory_card(UUID(current_user_id), card_data)
 
-@router.get("/", response_model=List[MemoryCardResponse])
+@router.get("/", response_model=Page[MemoryCardResponse])
+@cached_response(Page[MemoryCardResponse], "memory_card", "attachment") # Attachment changes rewrite cards' attachment_id
 async def get_all_memory_cards(
+    request: Request,
     current_user_id: CurrentUser,
-    memory_card_service: Annotated[MemoryCardService, Depends()]
+    memory_card_service: Annotated[MemoryCardService, Depends()],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    if wants_ndjson(request):
+        return ndjson_response(memory_card_service.stream_all_memory_cards(UUID(current_user_id), cursor=cursor))
+    items, next_cursor = await memory_card_service.get_all_memory_cards(UUID(current_user_id), limit=limit, cursor=cursor)
+    return page_response(items, next_cursor)
+
+@router.get("/viewport", response_model=CanvasViewportResponse)
+async def get_canvas_viewport(
+    current_user_id: CurrentUser,
+    memory_card_service: Annotated[MemoryCardService, Depends()],
+    min_x: float = Query(...),
+    min_y: float = Query(...),
+    max_x: float = Query(...),
+    max_y: float = Query(...),
+    zoom: float = Query(1.0, gt=0)
+):
+    if min_x > max_x or min_y > max_y:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Empty viewport bounding box")
+    return await memory_card_service.get_canvas_viewport(UUID(current_user_id), min_x, min_y, max_x, max_y, zoom)
+
+@router.patch("/positions", response_model=MemoryCardCanvasPositionBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def update_memory_card_positions(
+    position_data: MemoryCardCanvasPositionBatch,
+    current_user_id: CurrentUser
 ):
-    return await memory_card_service.get_all_memory_cards(UUID(current_user_id))
+    # Written asynchronously; repeated moves of a card within the flush window collapse to the last one
+    accepted = canvas_position_writer.submit(
+        UUID(current_user_id), ((position.id, position.x, position.y) for position in position_data.positions)
+    )
+    return MemoryCardCanvasPositionBatchResponse(accepted=accepted)
+
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_memory_cards(
+    delete_data: BulkDeleteRequest,
+    current_user_id: CurrentUser,
+    memory_card_service: Annotated[MemoryCardService, Depends()],
+    background_tasks: BackgroundTasks
+):
+    deleted = await memory_card_service.delete_memory_cards(UUID(current_user_id), delete_data.ids)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
+    return BulkDeleteResponse(deleted=deleted)
 
 @router.get("/{memory_card_id}", response_model=MemoryCardResponse)
+@cached_response(MemoryCardResponse, "memory_card", "attachment")
 async def get_memory_card_by_id(
     memory_card_id: UUID,
     current_user_id: CurrentUser,
@@ -54,7 +105,9 @@ async def update_memory_card_position(
 async def delete_memory_card(
     memory_card_id: UUID,
     current_user_id: CurrentUser,
-    memory_card_service: Annotated[MemoryCardService, Depends()]
+    memory_card_service: Annotated[MemoryCardService, Depends()],
+    background_tasks: BackgroundTasks
 ):
     await memory_card_service.delete_memory_card(UUID(current_user_id), memory_card_id)
+    background_tasks.add_task(run_with_session, recompute_clusters_job, UUID(current_user_id))
     return None
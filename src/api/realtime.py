@@ -0,0 +1,61 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from src.config.settings import settings
+from src.core.events import change_broker
+from src.core.security import decode_access_token
+from src.schemas.memory_card import MemoryCardCanvasPositionBatch
+from src.services.canvas_position_writer import canvas_position_writer
+
+router = APIRouter()
+
+async def _send_changes(websocket: WebSocket, subscription):
+    window_seconds = settings.REALTIME_COALESCE_MS / 1000
+    while True:
+        events, resync = await subscription.next_batch(window_seconds)
+        # Awaiting the send is the backpressure: events pile up (coalesced) in the subscription meanwhile
+        await websocket.send_json(jsonable_encoder({"events": events, "resync": resync}))
+
+async def _receive_messages(websocket: WebSocket, user_id: UUID):
+    while True:
+        message = await websocket.receive_json()
+        if message.get("type") == "positions":
+            # Canvas drags share the coalescing writer with PATCH /memory-cards/positions
+            try:
+                batch = MemoryCardCanvasPositionBatch.model_validate(message)
+            except ValidationError:
+                await websocket.send_json({"error": "invalid positions message"})
+                continue
+            canvas_position_writer.submit(user_id, ((position.id, position.x, position.y) for position in batch.positions))
+        elif message.get("type") == "ping":
+            await websocket.send_json({"type": "pong"})
+
+@router.websocket("/ws")
+async def change_feed(websocket: WebSocket, token: str = Query(...)):
+    # Browsers can't set an Authorization header on WebSocket requests, so the JWT comes as a query param
+    try:
+        user_id = UUID(decode_access_token(token))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = change_broker.subscribe(user_id)
+    tasks = [
+        asyncio.create_task(_send_changes(websocket, subscription)),
+        asyncio.create_task(_receive_messages(websocket, user_id)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        change_broker.unsubscribe(user_id, subscription)
@@ -0,0 +1,25 @@
+from typing import Annotated, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from src.schemas.common import Page
+from src.schemas.search import SearchEntityType, SearchHit
+from src.services.search_service import SearchService
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.api.deps import CurrentUser
+
+router = APIRouter()
+
+@router.get("/", response_model=Page[SearchHit])
+async def search(
+    current_user_id: CurrentUser,
+    search_service: Annotated[SearchService, Depends()],
+    q: str = Query(..., min_length=1, max_length=256),
+    types: Optional[List[SearchEntityType]] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
+):
+    entity_types = [entity_type.value for entity_type in types] if types else None
+    items, next_cursor = await search_service.search(UUID(current_user_id), q, entity_types, limit=limit, cursor=cursor)
+    return {"items": items, "next_cursor": next_cursor}
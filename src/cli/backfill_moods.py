@@ -0,0 +1,48 @@
+"""Classify the mood of existing chat messages and timeline events.
+
+    python -m src.cli.backfill_moods
+    python -m src.cli.backfill_moods --table timeline_events --overwrite
+
+Only rows without a mood_context are classified unless --overwrite is
+given. The change events this process publishes never reach a running
+server, whose response cache would keep serving the old moods: run this
+while the server is stopped, and use POST /api/life-os/mood-backfill
+(which runs the same backfill inside the server) otherwise.
+"""
+import argparse
+import asyncio
+
+from src.database.connection import AsyncSessionLocal, async_engine, replica_engine
+from src.services.mood_backfill_service import MOOD_BACKFILL_TARGETS, MoodBackfillProgress, MoodBackfillService
+
+
+def _report(progress: MoodBackfillProgress):
+    print(f"{progress.table}: {progress.rows} rows, {progress.rows_per_second:,.0f} rows/s", flush=True)
+
+
+async def backfill(tables: list[str], overwrite: bool, batch_size: int | None):
+    try:
+        async with AsyncSessionLocal() as db:
+            service = MoodBackfillService(db)
+            for table in tables:
+                progress = await service.backfill(table, overwrite=overwrite, batch_size=batch_size, on_batch=_report)
+                print(f"{table}: done, {progress.rows} rows in {progress.seconds:.1f}s")
+    finally:
+        await async_engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill mood_context with the batched mood classifier.")
+    parser.add_argument("--table", choices=[*MOOD_BACKFILL_TARGETS, "all"], default="all")
+    parser.add_argument("--overwrite", action="store_true", help="Reclassify rows that already have a mood_context")
+    parser.add_argument("--batch-size", type=int, help="Rows per transaction (default MOOD_BACKFILL_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    tables = list(MOOD_BACKFILL_TARGETS) if args.table == "all" else [args.table]
+    asyncio.run(backfill(tables, args.overwrite, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Write a user's account export to a zip file, e.g. for nightly backups.
+
+    python -m src.cli.export alice backups/alice-full.zip
+    python -m src.cli.export alice backups/alice-2026-10-19.zip --since-archive backups/alice-full.zip
+
+`--since-archive` exports only what changed since that earlier archive was
+taken (its manifest's next_since, a little before its exported_at, so a
+row can appear in both; restore archives in order). Deleted rows are not
+recorded in an incremental export; take a full one now and then.
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.future import select
+
+from src.database.connection import AsyncSessionLocal, async_engine, replica_engine
+from src.models.user import User
+from src.services.export_service import ExportService, read_manifest
+
+
+async def _resolve_user(db, user: str) -> UUID:
+    try:
+        return UUID(user)
+    except ValueError:
+        user_id = (await db.execute(select(User.id).filter(User.username == user))).scalar_one_or_none()
+        if user_id is None:
+            raise SystemExit(f"No user named {user!r}")
+        return user_id
+
+
+async def export(user: str, output: str, since: datetime | None):
+    # Written to a side file and renamed at the end, so a failed run never leaves a truncated backup
+    partial_path = f"{output}.partial"
+    try:
+        async with AsyncSessionLocal() as db:
+            user_id = await _resolve_user(db, user)
+            with open(partial_path, "wb") as out:
+                async for chunk in ExportService(db).export_archive(user_id, since):
+                    out.write(chunk)
+        os.replace(partial_path, output)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        await async_engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a MemoRoo account as a zip of NDJSON tables and attachment files.")
+    parser.add_argument("user", help="Username or user id")
+    parser.add_argument("output", help="Path of the zip file to write")
+    since = parser.add_mutually_exclusive_group()
+    since.add_argument("--since", type=datetime.fromisoformat, help="Only rows created or updated at or after this ISO timestamp")
+    since.add_argument("--since-archive", help="Only rows changed since this earlier export was taken")
+    args = parser.parse_args()
+
+    if args.since_archive:
+        manifest = read_manifest(args.since_archive)
+        # Archives from before next_since was recorded only have exported_at
+        args.since = datetime.fromisoformat(manifest.get("next_since") or manifest["exported_at"])
+    asyncio.run(export(args.user, args.output, args.since))
+
+
+if __name__ == "__main__":
+    main()
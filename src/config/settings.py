@@ -1,16 +1,33 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, SecretStr
+from typing import Optional
 import os
 
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     ASYNC_DATABASE_URL: str = Field(..., env="ASYNC_DATABASE_URL")
+    ASYNC_READ_REPLICA_URL: Optional[str] = Field(None, env="ASYNC_READ_REPLICA_URL") # Unset: reads use the primary
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = Field(5.0, env="READ_YOUR_WRITES_WINDOW_SECONDS") # Keep a user's reads on the primary after they write
+
+    # Embedded SQLite (on-device mode, when ASYNC_DATABASE_URL is sqlite+aiosqlite:///path/to/file.db)
+    SQLITE_MMAP_SIZE_MB: int = Field(256, env="SQLITE_MMAP_SIZE_MB")
+    SQLITE_CACHE_SIZE_KB: int = Field(16384, env="SQLITE_CACHE_SIZE_KB") # Page cache per connection
+    SQLITE_STATEMENT_CACHE_SIZE: int = Field(256, env="SQLITE_STATEMENT_CACHE_SIZE") # Prepared statements kept per connection
+    SQLITE_READER_POOL_SIZE: int = Field(4, env="SQLITE_READER_POOL_SIZE")
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = Field(30.0, env="SQLITE_WRITE_TIMEOUT_SECONDS") # Max wait for the writer connection
+
+    DB_ECHO: bool = Field(False, env="DB_ECHO") # Raw SQL logging; slows every query
+    DB_SLOW_QUERY_MS: float = Field(100.0, env="DB_SLOW_QUERY_MS")
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(10, env="DB_N_PLUS_ONE_THRESHOLD") # Same statement shape this many times per request
 
     # Security settings
     SECRET_KEY: SecretStr = Field(..., env="SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_BCRYPT_ROUNDS: int = Field(12, env="PASSWORD_BCRYPT_ROUNDS") # Changing it rehashes each password at its next successful login
+    PASSWORD_HASH_WORKERS: int = Field(os.cpu_count() or 2, env="PASSWORD_HASH_WORKERS") # Threads hashing in parallel; bcrypt releases the GIL
+    PASSWORD_HASH_MAX_QUEUE: int = Field(64, env="PASSWORD_HASH_MAX_QUEUE") # Hashes waiting for a thread before new logins get 503
 
     # File storage settings
     MEDIA_PATH: str = Field("data/users", env="MEDIA_PATH") # Relative to project root
@@ -21,6 +38,71 @@ class Settings(BaseSettings):
     OCR_MODEL_PATH: str = Field("ocr/ocr_tflite_model.tflite", env="OCR_MODEL_PATH")
     WHISPER_MODEL_PATH: str = Field("whisper/whisper_tiny_int8.tflite", env="WHISPER_MODEL_PATH")
     EMBEDDING_MODEL_PATH: str = Field("embeddings/embedding_model.tflite", env="EMBEDDING_MODEL_PATH")
+    MOOD_MODEL_PATH: str = Field("mood/mood_classifier.npz", env="MOOD_MODEL_PATH") # Missing: a built-in keyword lexicon is used
+
+    # Realtime change feed
+    REALTIME_COALESCE_MS: int = Field(50, env="REALTIME_COALESCE_MS")
+    REALTIME_MAX_PENDING_EVENTS: int = Field(1000, env="REALTIME_MAX_PENDING_EVENTS") # Per connection, before forcing a resync
+
+    # Per-user response cache (ETag / 304) for read endpoints; only safe when every write goes through this process
+    RESPONSE_CACHE_ENABLED: bool = Field(True, env="RESPONSE_CACHE_ENABLED")
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(2000, env="RESPONSE_CACHE_MAX_ENTRIES")
+    RESPONSE_CACHE_MAX_BODY_BYTES: int = Field(256 * 1024, env="RESPONSE_CACHE_MAX_BODY_BYTES") # Larger responses still get an ETag but aren't stored
+
+    # Bulk import (NDJSON or zip uploads, processed as a background job)
+    IMPORT_MAX_UPLOAD_MB: int = Field(2048, env="IMPORT_MAX_UPLOAD_MB")
+    IMPORT_MAX_FILE_MB: int = Field(512, env="IMPORT_MAX_FILE_MB") # Uncompressed size of one archived attachment
+    IMPORT_MAX_EXTRACTED_MB: int = Field(8192, env="IMPORT_MAX_EXTRACTED_MB") # Uncompressed attachment bytes per import
+    IMPORT_BATCH_SIZE: int = Field(1000, env="IMPORT_BATCH_SIZE") # Cards per multi-row INSERT and transaction
+    IMPORT_ENRICH_BATCH_SIZE: int = Field(200, env="IMPORT_ENRICH_BATCH_SIZE") # Cards embedded and added to the graph per transaction
+    IMPORT_CHUNK_CHARS: int = Field(2000, env="IMPORT_CHUNK_CHARS") # Longer content also gets per-chunk graph nodes
+    IMPORT_MAX_REPORTED_ERRORS: int = Field(100, env="IMPORT_MAX_REPORTED_ERRORS")
+
+    # Account export
+    EXPORT_SINCE_OVERLAP_SECONDS: int = Field(600, env="EXPORT_SINCE_OVERLAP_SECONDS") # Incremental exports reach back this far before the previous one: longest write transaction plus replica lag
+
+    # Background garbage collection of deleted files and orphaned embeddings
+    GC_INTERVAL_SECONDS: int = Field(600, env="GC_INTERVAL_SECONDS")
+    GC_BATCH_SIZE: int = Field(500, env="GC_BATCH_SIZE") # Rows or files removed per transaction
+    GC_GRACE_SECONDS: int = Field(3600, env="GC_GRACE_SECONDS") # Unreferenced rows and files younger than this may belong to a write in progress
+
+    # Habit statistics, computed from the habit_completions log
+    HABIT_STATS_LOOKBACK_DAYS: int = Field(730, env="HABIT_STATS_LOOKBACK_DAYS") # Completions read per habit; longer streaks are capped here
+    HABIT_HEATMAP_DAYS: int = Field(365, env="HABIT_HEATMAP_DAYS") # Daily totals returned per habit by the summary
+
+    # Neural Canvas
+    CANVAS_POSITION_FLUSH_MS: int = Field(100, env="CANVAS_POSITION_FLUSH_MS") # Coalescing window for card moves
+    CANVAS_TILE_ZOOM_THRESHOLD: float = Field(0.35, env="CANVAS_TILE_ZOOM_THRESHOLD") # Below this zoom the viewport returns density tiles
+    CANVAS_TILE_SIZE: float = Field(256.0, env="CANVAS_TILE_SIZE") # Tile edge in screen pixels
+    CANVAS_VIEWPORT_MAX_CARDS: int = Field(500, env="CANVAS_VIEWPORT_MAX_CARDS")
+
+    # Graph edge inference (kNN over node embeddings)
+    EDGE_INFERENCE_TOP_K: int = Field(8, env="EDGE_INFERENCE_TOP_K")
+    EDGE_INFERENCE_MIN_SIMILARITY: float = Field(0.75, env="EDGE_INFERENCE_MIN_SIMILARITY")
+    EDGE_INFERENCE_BLOCK_SIZE: int = Field(1024, env="EDGE_INFERENCE_BLOCK_SIZE")
+
+    # Graph clustering (label propagation over graph_edges)
+    CLUSTERING_MAX_ITERATIONS: int = Field(30, env="CLUSTERING_MAX_ITERATIONS")
+    CLUSTERING_EDGE_VISIT_BUDGET: int = Field(5_000_000, env="CLUSTERING_EDGE_VISIT_BUDGET") # Edge visits per recompute
+    CLUSTERING_INFERRED_EDGE_WEIGHT: float = Field(0.5, env="CLUSTERING_INFERRED_EDGE_WEIGHT") # Weight of embedding-similarity edges
+
+    # Graph centrality (PageRank) and its use as a retrieval prior
+    PAGERANK_DAMPING: float = Field(0.85, env="PAGERANK_DAMPING")
+    PAGERANK_TOLERANCE: float = Field(1e-6, env="PAGERANK_TOLERANCE")
+    PAGERANK_MAX_ITERATIONS: int = Field(100, env="PAGERANK_MAX_ITERATIONS")
+    CENTRALITY_REFRESH_INTERVAL_SECONDS: int = Field(300, env="CENTRALITY_REFRESH_INTERVAL_SECONDS")
+    RAG_TOP_K: int = Field(5, env="RAG_TOP_K")
+    RAG_CANDIDATE_MULTIPLIER: int = Field(4, env="RAG_CANDIDATE_MULTIPLIER") # Vector hits fetched per returned result
+    RAG_CENTRALITY_WEIGHT: float = Field(0.15, env="RAG_CENTRALITY_WEIGHT")
+
+    # Mood backfill (python -m src.cli.backfill_moods)
+    MOOD_BACKFILL_BATCH_SIZE: int = Field(2000, env="MOOD_BACKFILL_BATCH_SIZE") # Rows classified and updated per transaction
+
+    # Wiki generation (an LLM summary per memory cluster, regenerated only when its cards change)
+    WIKI_GENERATION_INTERVAL_SECONDS: int = Field(1800, env="WIKI_GENERATION_INTERVAL_SECONDS")
+    WIKI_GENERATION_BUDGET_SECONDS: float = Field(120.0, env="WIKI_GENERATION_BUDGET_SECONDS") # LLM time per run; the rest waits for the next one
+    WIKI_MIN_CLUSTER_SIZE: int = Field(3, env="WIKI_MIN_CLUSTER_SIZE") # Smaller clusters get no entry
+    WIKI_PROMPT_MAX_CHARS: int = Field(6000, env="WIKI_PROMPT_MAX_CHARS") # Card text fed to the LLM per entry
 
     # Sentry DSN for error tracking (optional)
     SENTRY_DSN: str | None = Field(None, env="SENTRY_DSN")
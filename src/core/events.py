@@ -0,0 +1,122 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from src.config.settings import settings
+
+
+@dataclass
+class ChangeEvent:
+    entity: str # e.g., "memory_card", "graph_node", "graph_edge", "attachment", "chat_message"
+    action: str # "created", "updated" or "deleted"
+    id: UUID
+    data: Optional[Dict[str, Any]] = field(default=None) # Small payload, e.g. a new canvas position
+
+    def merge(self, newer: "ChangeEvent") -> "ChangeEvent":
+        # A create followed by updates is still a create; a delete always wins
+        if self.action == "created" and newer.action == "updated":
+            return ChangeEvent(self.entity, "created", self.id, {**(self.data or {}), **(newer.data or {})} or None)
+        return newer
+
+
+class Subscription:
+    """Per-connection event buffer.
+
+    Events for the same entity are coalesced in place, so the buffer is
+    bounded by the number of distinct entities touched rather than by the
+    number of writes. If a slow consumer still lets it grow past
+    `max_pending`, the buffer is dropped and the consumer is told to resync.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, UUID], ChangeEvent] = {}
+        self._ready = asyncio.Event()
+        self._overflowed = False
+
+    def push(self, event: ChangeEvent):
+        key = (event.entity, event.id)
+        if key in self._pending:
+            self._pending[key] = self._pending[key].merge(event)
+        elif self._overflowed:
+            pass
+        elif len(self._pending) >= self.max_pending:
+            self._pending.clear()
+            self._overflowed = True
+        else:
+            self._pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self, window_seconds: float) -> Tuple[List[ChangeEvent], bool]:
+        await self._ready.wait()
+        # Let a burst of writes land before draining
+        await asyncio.sleep(window_seconds)
+        events, resync = list(self._pending.values()), self._overflowed
+        self._pending.clear()
+        self._overflowed = False
+        self._ready.clear()
+        return events, resync
+
+
+class ChangeBroker(ABC):
+    """Fan-out of change events to a user's open connections.
+
+    This implementation is in-process; a shared broker (Redis, Postgres
+    LISTEN/NOTIFY) only has to provide the same three methods. Listeners
+    are process-local hooks that see every published batch, whether or not
+    anyone is subscribed (e.g. response cache invalidation).
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[UUID, Tuple[ChangeEvent, ...]], None]] = []
+
+    def add_listener(self, listener: Callable[[UUID, Tuple[ChangeEvent, ...]], None]):
+        self._listeners.append(listener)
+
+    def _notify_listeners(self, user_id: UUID, events: Tuple[ChangeEvent, ...]):
+        for listener in self._listeners:
+            listener(user_id, events)
+
+    @abstractmethod
+    def subscribe(self, user_id: UUID) -> Subscription:
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, user_id: UUID, subscription: Subscription):
+        ...
+
+    @abstractmethod
+    def publish(self, user_id: UUID, *events: ChangeEvent):
+        ...
+
+
+class InProcessChangeBroker(ChangeBroker):
+    def __init__(self, max_pending: int):
+        super().__init__()
+        self.max_pending = max_pending
+        self._subscriptions: Dict[UUID, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, user_id: UUID) -> Subscription:
+        subscription = Subscription(self.max_pending)
+        self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: UUID, subscription: Subscription):
+        subscriptions = self._subscriptions.get(user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[user_id]
+
+    def publish(self, user_id: UUID, *events: ChangeEvent):
+        # Never blocks the writer: pushing only touches in-memory buffers
+        self._notify_listeners(user_id, events)
+        for subscription in self._subscriptions.get(user_id, ()):
+            for event in events:
+                subscription.push(event)
+
+
+change_broker: ChangeBroker = InProcessChangeBroker(settings.REALTIME_MAX_PENDING_EVENTS)
@@ -42,3 +42,39 @@ class UnauthorizedAccessException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this resource",
         )
+
+class InvalidGraphBatchException(HTTPException):
+    def __init__(self, detail: str = "Invalid graph batch"):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail,
+        )
+
+class InvalidCursorException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+class ImportJobNotFoundException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+
+class ImportTooLargeException(HTTPException):
+    def __init__(self, detail: str = "Import upload too large"):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail,
+        )
+
+class PasswordHashingBusyException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Hashable
+from weakref import WeakValueDictionary
+
+
+class KeyedLocks:
+    """An asyncio.Lock per key, kept only while something holds or awaits it.
+
+    A defaultdict of locks gains an entry for every key it ever sees. Here
+    the table holds weak references: `async with locks[key]` keeps the lock
+    alive for the holder and every waiter, and once the last of them is done
+    the entry disappears.
+    """
+
+    def __init__(self):
+        self._locks: "WeakValueDictionary[Hashable, asyncio.Lock]" = WeakValueDictionary()
+
+    def __getitem__(self, key: Hashable) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -0,0 +1,130 @@
+import hashlib
+import inspect
+import os
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from src.config.settings import settings
+from src.core.events import ChangeEvent, change_broker
+from src.core.serialization import wants_ndjson
+
+
+class ResponseCache:
+    """Per-user cache of serialized read responses.
+
+    Every (user, entity type) pair has a generation counter that the change
+    broker bumps on each write. A cached body is stored together with the
+    generations of the entity types it was built from, and is served (or
+    answered with 304) only while none of them has moved. Counters live in
+    process memory, so this is only correct when all writes for a user
+    publish through this process's broker; run with
+    RESPONSE_CACHE_ENABLED=false behind several workers.
+    """
+
+    def __init__(self, max_entries: int, max_body_bytes: int):
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        # ETags from an earlier process never match: its counters started from zero too
+        self._nonce = os.urandom(4).hex()
+        self._generations: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[int, ...], bytes]]" = OrderedDict()
+
+    def on_change(self, user_id: UUID, events: Tuple[ChangeEvent, ...]):
+        for entity in {event.entity for event in events}:
+            self._generations[(str(user_id), entity)] += 1
+
+    def generations(self, user_id: str, entities: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get((user_id, entity), 0) for entity in entities)
+
+    def etag(self, key: Tuple, generations: Tuple[int, ...]) -> str:
+        digest = hashlib.blake2b(repr((key, generations)).encode(), digest_size=8).hexdigest()
+        return f'W/"{self._nonce}-{digest}"'
+
+    def get(self, key: Tuple, generations: Tuple[int, ...]) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != generations:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Tuple, generations: Tuple[int, ...], body: bytes):
+        if len(body) > self.max_body_bytes:
+            return
+        self._entries[key] = (generations, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison (RFC 9110 13.1.2): the W/ prefix is ignored on both sides
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def cached_response(response_model: Any, *entities: str, vary: Optional[Callable[[Dict[str, Any]], Hashable]] = None):
+    """Serve a GET endpoint from the response cache.
+
+    `entities` are the change-event entity types the response is built
+    from; a write to any of them for the user invalidates it. The endpoint
+    must take the caller as `current_user_id`. On a hit the endpoint (and
+    its queries) never runs: a matching If-None-Match gets a bare 304, and
+    anything else gets the stored JSON bytes. Responses that also depend
+    on something besides the query string, such as a range that defaults
+    to "now", pass `vary`: it gets the endpoint's arguments, and its result
+    becomes part of the cache key and ETag.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, _response_cache_request: Request, **kwargs):
+            request = _response_cache_request
+            # Streams are never buffered into the cache
+            if not settings.RESPONSE_CACHE_ENABLED or wants_ndjson(request):
+                return await endpoint(*args, **kwargs)
+
+            user_id = str(kwargs["current_user_id"])
+            key = (user_id, request.url.path, tuple(sorted(request.query_params.multi_items())))
+            if vary is not None:
+                key += (vary(kwargs),)
+            # Snapshot before querying, so a write that lands mid-query leaves the entry already stale
+            generations = response_cache.generations(user_id, entities)
+            etag = response_cache.etag(key, generations)
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            body = response_cache.get(key, generations)
+            if body is None:
+                result = await endpoint(*args, **kwargs)
+                if isinstance(result, Response):
+                    body = result.body # Already encoded, e.g. by page_response
+                else:
+                    body = adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+                response_cache.put(key, generations, body)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        signature = inspect.signature(endpoint)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("_response_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrapper
+
+    return decorator
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_MAX_BODY_BYTES)
+change_broker.add_listener(response_cache.on_change)
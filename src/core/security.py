@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Any, Callable, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,9 +10,12 @@ from passlib.context import CryptContext
 from pydantic import BaseModel, ValidationError
 
 from src.config.settings import settings
+from src.core.exceptions import PasswordHashingBusyException
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds still verify, and verify_and_update hands back a replacement
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token", auto_error=False)
 
 class Token(BaseModel):
     access_token: str
@@ -25,6 +30,63 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool instead of the event loop.
+
+    Each hash costs 100-300 ms of CPU, which on the loop would stall every
+    other request. bcrypt releases the GIL while it works, so the
+    PASSWORD_HASH_WORKERS threads hash in parallel, one core each. Calls
+    beyond that wait in the pool's queue. Once PASSWORD_HASH_MAX_QUEUE are
+    waiting, new calls fail fast with 503, so a login burst can't build an
+    unbounded backlog.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0 # Running plus queued
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashingBusyException()
+        self.in_flight += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        # The new hash is set when the stored one used other cost parameters than the current ones
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.in_flight - self.queued,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -35,7 +97,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY.get_secret_value(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> str:
+def decode_access_token(token: str) -> str:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,3 +112,15 @@ async def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) ->
     except (JWTError, ValidationError):
         raise credentials_exception
     return token_data.user_id
+
+async def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> str:
+    return decode_access_token(token)
+
+async def get_optional_user_id(token: Annotated[str | None, Depends(optional_oauth2_scheme)]) -> str | None:
+    # For dependencies that behave differently for signed-in users but must not reject anonymous requests
+    if token is None:
+        return None
+    try:
+        return decode_access_token(token)
+    except HTTPException:
+        return None
@@ -0,0 +1,51 @@
+from typing import Any, AsyncIterator, List, Optional, Sequence, Type
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Column, Row
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded by pydantic-core straight from dicts and plain rows.
+
+    Returning it from a route skips FastAPI's response_model validation,
+    so the content must already have the response schema's shape (see
+    `response_columns`).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def response_columns(model, schema: Type[BaseModel]) -> List[Column]:
+    # Select exactly what the response exposes, as plain rows: no ORM identity map or instrumented objects
+    return [column for column in model.__table__.columns if column.key in schema.model_fields]
+
+
+def _as_dict(row: Any) -> Any:
+    # Rows straight from a query, or dicts a service has already adjusted
+    return row if isinstance(row, dict) else row._asdict()
+
+
+def page_response(rows: Sequence[Row], next_cursor: Optional[str]) -> FastJSONResponse:
+    return FastJSONResponse({"items": [_as_dict(row) for row in rows], "next_cursor": next_cursor})
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(batches: AsyncIterator[Sequence[Row]]) -> StreamingResponse:
+    # One JSON object per line, sent as the database cursor yields each batch.
+    # The request-scoped session stays open until the body has been sent.
+    async def body():
+        async for batch in batches:
+            yield b"".join(pydantic_core.to_json(_as_dict(row)) + b"\n" for row in batch)
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
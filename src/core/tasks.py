@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.connection import AsyncSessionLocal, pin_to_primary
+from src.database.dialect import IS_SQLITE
+from src.database.instrumentation import job_stats
+
+logger = logging.getLogger(__name__)
+
+
+async def run_with_session(job: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any):
+    # Background jobs outlive the request session, so each one opens its own.
+    # Failures are logged rather than raised since nobody is awaiting the result.
+    name = getattr(job, "__qualname__", repr(job))
+    with job_stats(name):
+        async with AsyncSessionLocal() as session:
+            # Jobs usually act on rows written moments ago, which a replica may not have yet. The
+            # SQLite reader pool has no lag, so there jobs read from it and hold the single writer
+            # connection only from their first write to its commit.
+            if not IS_SQLITE:
+                pin_to_primary(session)
+            try:
+                await job(session, *args, **kwargs)
+            except Exception:
+                await session.rollback()
+                logger.exception("Background job %s failed", name)
+
+
+async def run_periodically(interval_seconds: float, job: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any):
+    # Started from the app lifespan and cancelled on shutdown
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_with_session(job, *args, **kwargs)
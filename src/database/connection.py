@@ -1,18 +1,130 @@
+import time
+from typing import Dict, Optional
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event, Select
 
 from src.config.settings import settings
+from src.core.events import change_broker
+from src.database.dialect import IS_SQLITE
+from src.database.instrumentation import instrument_engine
+from src.database.sqlite import configure_sqlite_engine
 
 # Synchronous engine for Alembic migrations
-sync_engine = create_engine(settings.DATABASE_URL, echo=True)
+sync_engine = create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
 
 # Asynchronous engine for FastAPI application
-async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, echo=True)
+if IS_SQLITE:
+    # On-device mode. The primary gets exactly one connection, which makes its pool the
+    # single-writer queue: writing sessions wait their turn there instead of failing with
+    # "database is locked". Plain reads are routed to a separate read-only pool (see
+    # RoutingSession), which WAL lets run alongside the writer.
+    sqlite_connect_args = {"cached_statements": settings.SQLITE_STATEMENT_CACHE_SIZE}
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, echo=settings.DB_ECHO, logging_name="primary",
+        pool_size=1, max_overflow=0, pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS,
+        connect_args=sqlite_connect_args,
+    )
+    replica_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, echo=settings.DB_ECHO, logging_name="reader",
+        pool_size=settings.SQLITE_READER_POOL_SIZE, max_overflow=0,
+        connect_args=sqlite_connect_args,
+    )
+    configure_sqlite_engine(async_engine.sync_engine)
+    configure_sqlite_engine(replica_engine.sync_engine, read_only=True)
+else:
+    async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, echo=settings.DB_ECHO, logging_name="primary")
+    # Optional read replica; without one every statement goes to the primary
+    replica_engine = None
+    if settings.ASYNC_READ_REPLICA_URL:
+        replica_engine = create_async_engine(settings.ASYNC_READ_REPLICA_URL, echo=settings.DB_ECHO, logging_name="replica")
+
+instrument_engine(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+
+# session.info keys
+PIN_PRIMARY = "pin_primary"
+SESSION_USER_ID = "user_id"
+
+
+class RecentWriters:
+    """Users who committed a write within the last few seconds, whose reads stay on the primary.
+
+    Covers replica lag between a write and the client's next request. The
+    window is per process; behind several workers it relies on the user's
+    requests landing on the same one, otherwise reads may briefly lag.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._until: Dict[str, float] = {}
+
+    def mark(self, user_id: str):
+        now = time.monotonic()
+        self._until[user_id] = now + self.window_seconds
+        if len(self._until) > 10000:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+
+    def is_recent(self, user_id: str) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_WINDOW_SECONDS)
+# Background jobs commit without a user's session; every published change marks its user as well
+change_broker.add_listener(lambda user_id, events: recent_writers.mark(str(user_id)))
+
+
+class RoutingSession(Session):
+    """Plain SELECTs go to the replica; flushes, DML, locking reads and anything after a write go to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engine is None or self.info.get(PIN_PRIMARY):
+            return async_engine.sync_engine
+        if not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None:
+            return replica_engine.sync_engine
+        # First write of the session: later reads must see it, so stay on the primary from here on
+        self.info[PIN_PRIMARY] = True
+        return async_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session):
+    if session.info.get(PIN_PRIMARY) and session.info.get(SESSION_USER_ID):
+        recent_writers.mark(session.info[SESSION_USER_ID])
+    _release_primary(session)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _release_primary_after_rollback(session: Session, previous_transaction):
+    _release_primary(session)
+
+
+def _release_primary(session: Session):
+    # SQLite readers see every committed write at once, so once a write transaction ends the
+    # session's reads can leave the single writer connection for the reader pool again
+    if IS_SQLITE:
+        session.info.pop(PIN_PRIMARY, None)
+
+
+# Objects stay loaded after commit so rows returned by INSERT ... RETURNING can be
+# serialized without a lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine, class_=AsyncSession, sync_session_class=RoutingSession
+)
+
+
+def pin_to_primary(session: AsyncSession):
+    session.info[PIN_PRIMARY] = True
 
-AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=async_engine, class_=AsyncSession)
 
 # Dependency to get an async session
-async def get_db_session():
+async def get_db_session(user_id: Optional[str] = None):
     async with AsyncSessionLocal() as session:
+        if user_id is not None:
+            session.info[SESSION_USER_ID] = user_id
+            if not IS_SQLITE and recent_writers.is_recent(user_id):
+                pin_to_primary(session)
         yield session
@@ -0,0 +1,34 @@
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+
+from src.config.settings import settings
+
+# Embedded (on-device) mode runs the same schema and services on a SQLite file
+IS_SQLITE = make_url(settings.ASYNC_DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def upsert_insert(model):
+    # INSERT ... ON CONFLICT has the same API on both backends, but lives in each dialect
+    return sqlite.insert(model) if IS_SQLITE else postgresql.insert(model)
+
+
+# strftime() arguments giving the start of a UTC bucket; SQLite stores timestamps as naive UTC text
+_SQLITE_BUCKETS = {
+    "hour": ("'%Y-%m-%d %H:00:00'",),
+    "day": ("'%Y-%m-%d 00:00:00'",),
+    "week": ("'%Y-%m-%d 00:00:00'", "'-6 days'", "'weekday 1'"),
+    "month": ("'%Y-%m-01 00:00:00'",),
+}
+
+
+def time_bucket(column, bucket: str):
+    # Start of the UTC hour, day, week (Monday) or month containing `column`: a naive timestamp on
+    # Postgres, text on SQLite. Arguments are inlined rather than bound, so the same expression in
+    # SELECT and GROUP BY compiles identically.
+    if bucket not in _SQLITE_BUCKETS:
+        raise ValueError(f"Unknown time bucket {bucket!r}")
+    if IS_SQLITE:
+        fmt, *modifiers = _SQLITE_BUCKETS[bucket]
+        return func.strftime(literal_column(fmt), column, *map(literal_column, modifiers))
+    return func.date_trunc(literal_column(f"'{bucket}'"), func.timezone(literal_column("'UTC'"), column))
@@ -0,0 +1,112 @@
+"""Full-text search over the searchable entity tables.
+
+Postgres keeps a generated, weighted `search_vector` tsvector column with a
+GIN index on each table; SQLite keeps an external-content FTS5 table
+(`<table>_fts`) updated by triggers. Both are created by migration
+0002_full_text_search and change in the same transaction as the row.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, column, func, literal, literal_column, select, table
+
+from src.database.dialect import IS_SQLITE
+from src.models.attachment import Attachment
+from src.models.memory_card import MemoryCard
+from src.models.wiki_entry import WikiEntry
+
+# Must match the configuration baked into the generated columns
+TS_CONFIG = literal_column("'english'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=2"
+TITLE_WEIGHT = 4.0 # bm25 column weight on SQLite; Postgres weights title 'A' vs body 'B'
+
+
+@dataclass(frozen=True)
+class SearchableEntity:
+    entity_type: str
+    model: type
+    title_column: str
+    body_columns: Tuple[str, ...]
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table_name}_fts"
+
+
+SEARCHABLE = {
+    entity.entity_type: entity
+    for entity in (
+        SearchableEntity("wiki_entry", WikiEntry, "title", ("summary", "content")),
+        SearchableEntity("memory_card", MemoryCard, "title", ("content",)),
+        SearchableEntity("attachment", Attachment, "filename", ("ocr_text", "transcription")),
+    )
+}
+
+
+def fts5_query(query: str) -> Optional[str]:
+    # Every term is quoted so user input can't reach FTS5 query syntax; terms are ANDed
+    # and the last one is prefix-matched for search-as-you-type
+    terms = [term.replace('"', '""') for term in query.split()]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def ts_query(query: str):
+    return func.websearch_to_tsquery(TS_CONFIG, query)
+
+
+def match_clause(entity: SearchableEntity, query: str):
+    """WHERE clause restricting `entity`'s table to rows matching `query`."""
+    if IS_SQLITE:
+        fts = table(entity.fts_table, column("rowid"))
+        return literal_column(f"{entity.table_name}.rowid").in_(
+            select(fts.c.rowid).where(literal_column(entity.fts_table).op("MATCH")(fts5_query(query) or '""'))
+        )
+    return literal_column(f"{entity.table_name}.search_vector").op("@@")(ts_query(query))
+
+
+def hits_query(entity: SearchableEntity, user_id: UUID, query: str) -> Select:
+    """One entity's matches as (entity_type, id, title, created_at, rank, text).
+
+    `text` is a ready highlighted snippet on SQLite and the raw body on
+    Postgres, where ts_headline is applied later to the final page only.
+    """
+    model = entity.model
+    title = getattr(model, entity.title_column)
+    columns = [
+        literal(entity.entity_type).label("entity_type"),
+        model.id.label("id"),
+        title.label("title"),
+        model.created_at.label("created_at"),
+    ]
+    if IS_SQLITE:
+        fts = literal_column(entity.fts_table)
+        weights = [TITLE_WEIGHT] + [1.0] * len(entity.body_columns)
+        fts_rows = table(entity.fts_table, column("rowid"))
+        return (
+            select(
+                *columns,
+                # bm25 is lower-is-better; negate so both backends sort rank descending
+                (-func.bm25(fts, *weights)).label("rank"),
+                func.snippet(fts, -1, "<mark>", "</mark>", "…", 16).label("text"),
+            )
+            .select_from(model.__table__.join(fts_rows, literal_column(f"{entity.table_name}.rowid") == fts_rows.c.rowid))
+            .where(fts.op("MATCH")(fts5_query(query)), model.user_id == user_id)
+        )
+    search_vector = literal_column(f"{entity.table_name}.search_vector")
+    body = func.concat_ws(" ", *(getattr(model, name) for name in entity.body_columns))
+    return select(
+        *columns,
+        func.ts_rank_cd(search_vector, ts_query(query)).label("rank"),
+        body.label("text"),
+    ).where(search_vector.op("@@")(ts_query(query)), model.user_id == user_id)
+
+
+def headline(text_column, query: str):
+    return func.ts_headline(TS_CONFIG, text_column, ts_query(query), HEADLINE_OPTIONS)
@@ -0,0 +1,174 @@
+import bisect
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bind placeholders in the styles our drivers use: $1, %(name)s, ?, :name
+_PLACEHOLDER = r"(?:\$\d+(?:::\w+)?|%\(\w+\)s|\?|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+SLOWEST_KEPT = 3
+
+
+def fingerprint(statement: str) -> str:
+    # Same query shape => same fingerprint, whatever the IN-list length or literals
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+        self.slowest.append((seconds, statement))
+        self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+        del self.slowest[SLOWEST_KEPT:]
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        # The same statement shape run this often in one request is almost always an N+1 loop
+        return {shape: count for shape, count in self.fingerprints.items() if count >= threshold}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def start_request_stats() -> QueryStats:
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start_times"].pop()
+    if seconds * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", seconds * 1000, fingerprint(statement))
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+
+def instrument_engine(engine: Engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["le_inf"]
+        return {"count": self.count, "sum": self.total, "buckets": dict(zip(labels, self.buckets))}
+
+
+class RouteQueryMetrics:
+    """Per-route histograms of query count and DB time, aggregated in-process."""
+
+    QUERY_COUNT_BOUNDS = (1, 2, 5, 10, 20, 50, 100)
+    DB_TIME_MS_BOUNDS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(self):
+        self._query_counts: Dict[str, Histogram] = defaultdict(lambda: Histogram(self.QUERY_COUNT_BOUNDS))
+        self._db_time_ms: Dict[str, Histogram] = defaultdict(lambda: Histogram(self.DB_TIME_MS_BOUNDS))
+        self._repeated: Counter = Counter()
+
+    def observe(self, route: str, stats: QueryStats):
+        self._query_counts[route].observe(stats.count)
+        self._db_time_ms[route].observe(stats.total_seconds * 1000)
+        if stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+            self._repeated[route] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            route: {
+                "query_count": self._query_counts[route].snapshot(),
+                "db_time_ms": self._db_time_ms[route].snapshot(),
+                "requests_with_repeated_queries": self._repeated[route],
+            }
+            for route in self._query_counts
+        }
+
+
+route_query_metrics = RouteQueryMetrics()
+
+
+@contextmanager
+def job_stats(name: str) -> Iterator[QueryStats]:
+    # Background tasks run inside the triggering request's context; without their own stats a job's
+    # batched queries would count against that route and read as an N+1 there
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        route_query_metrics.observe(f"job {name}", stats)
+
+
+class QueryInstrumentationMiddleware:
+    """Collects per-request SQL stats; plain ASGI so streaming responses are not buffered."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.ENVIRONMENT == "development":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.total_seconds * 1000:.1f}".encode()))
+                if stats.slowest:
+                    headers.append((b"x-db-slowest-ms", f"{stats.slowest[0][0] * 1000:.1f}".encode()))
+                repeated = stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD)
+                if repeated:
+                    headers.append((b"x-db-repeated-queries", str(max(repeated.values())).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            route_query_metrics.observe(f"{scope['method']} {route_path}", stats)
+            for shape, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD).items():
+                logger.warning("Possible N+1 on %s %s: %d x %s", scope["method"], route_path, count, shape)
@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import Row, Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.exceptions import InvalidCursorException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 1000 # Rows fetched per round trip when streaming a whole list
+
+
+SortValue = Union[datetime, float]
+
+
+def encode_cursor(sort_value: SortValue, row_id: UUID) -> str:
+    # Timestamps travel as ISO strings, numeric keys (e.g. search rank) as JSON numbers
+    value = sort_value.isoformat() if isinstance(sort_value, datetime) else float(sort_value)
+    payload = json.dumps([value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[SortValue, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, (int, float)):
+            raise ValueError(sort_value)
+        return sort_value, UUID(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def _selects_entity(query: Select) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and isinstance(descriptions[0]["expr"], type)
+
+
+def keyset_order(
+    query: Select,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Select:
+    """Order `query` by (sort_column, id_column) and start it after `cursor`."""
+    if cursor is not None:
+        key = tuple_(sort_column, id_column)
+        # Bound with the columns' own types, so the cursor is formatted like the stored values
+        sort_value, row_id = decode_cursor(cursor)
+        after = tuple_(literal(sort_value, sort_column.type), literal(row_id, id_column.type))
+        query = query.filter(key < after if descending else key > after)
+
+    if descending:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column,
+    id_column,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """Keyset page over (sort_column, id_column); returns the rows and the cursor for the next page.
+
+    The row comparison lets Postgres seek straight into a (filter, sort_column, id) index,
+    so every page costs the same however deep the client has scrolled. An entity query
+    returns ORM objects; a column query returns plain rows.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = keyset_order(query, sort_column, id_column, cursor, descending)
+
+    # One extra row tells us whether another page exists without a COUNT
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all() if _selects_entity(query) else result.all())
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+async def stream_keyset(
+    db: AsyncSession,
+    query: Select,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the whole keyset-ordered result in batches as the database cursor produces them.
+
+    Runs on a server-side cursor, so memory stays at one batch however long the list is.
+    """
+    query = keyset_order(query, sort_column, id_column, cursor, descending)
+    result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for batch in result.partitions():
+        yield batch
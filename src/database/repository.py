@@ -0,0 +1,69 @@
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.database.base import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+OwnerClause = Callable[[UUID], ColumnElement]
+
+
+class OwnedRepository(Generic[ModelT]):
+    """Ownership-checked writes that each cost one statement plus the commit.
+
+    Inserts and updates come back through `RETURNING`, so there is no
+    `refresh()` afterwards and updates don't load the row first; a row that
+    doesn't exist and a row owned by someone else both come back as `None`.
+    """
+
+    def __init__(self, db: AsyncSession, model: Type[ModelT], owner_clause: Optional[OwnerClause] = None):
+        self.db = db
+        self.model = model
+        # Models scoped through a parent (e.g. chat messages via their conversation) pass their own clause
+        self.owner_clause = owner_clause or (lambda user_id: model.user_id == user_id)
+
+    def _owned(self, user_id: UUID, row_id: UUID):
+        return (self.model.id == row_id, self.owner_clause(user_id))
+
+    async def get(self, user_id: UUID, row_id: UUID) -> Optional[ModelT]:
+        result = await self.db.execute(select(self.model).filter(*self._owned(user_id, row_id)))
+        return result.scalar_one_or_none()
+
+    async def insert(self, values: Dict[str, Any], commit: bool = True) -> ModelT:
+        row = await self.db.scalar(insert(self.model).values(**values).returning(self.model))
+        if commit:
+            await self.db.commit()
+        return row
+
+    async def update(self, user_id: UUID, row_id: UUID, values: Dict[str, Any], commit: bool = True) -> Optional[ModelT]:
+        if not values:
+            return await self.get(user_id, row_id)
+        row = await self.db.scalar(
+            update(self.model)
+            .where(*self._owned(user_id, row_id))
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if commit and row is not None:
+            await self.db.commit()
+        return row
+
+    async def delete(self, user_id: UUID, row_id: UUID, *returning: ColumnElement, commit: bool = True) -> Optional[Row]:
+        # Returns the requested columns of the deleted row (its id by default), or None if nothing matched
+        result = await self.db.execute(
+            delete(self.model)
+            .where(*self._owned(user_id, row_id))
+            .returning(*(returning or (self.model.id,)))
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if commit and row is not None:
+            await self.db.commit()
+        return row
@@ -0,0 +1,24 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.settings import settings
+
+
+def configure_sqlite_engine(engine: Engine, read_only: bool = False):
+    """Applies the per-connection PRAGMAs for on-device use."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers run alongside the single writer
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL; only the last transactions can be lost on power failure, never corrupted
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_WRITE_TIMEOUT_SECONDS * 1000)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
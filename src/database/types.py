@@ -0,0 +1,87 @@
+"""Column types that map to native Postgres types and degrade to portable ones elsewhere.
+
+Models import `UUID`, `ARRAY`, `JSONB` and `DateTime` from here instead of
+`sqlalchemy`/`sqlalchemy.dialects.postgresql`, so the same schema runs on
+Postgres and on embedded SQLite. On Postgres the DDL is unchanged.
+"""
+import uuid
+from datetime import datetime, timezone
+
+import sqlalchemy
+from sqlalchemy import JSON, String, Uuid
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator, to_instance
+
+# Native uuid on Postgres, CHAR(32) elsewhere; accepts as_uuid like the Postgres type
+UUID = Uuid
+
+# JSONB on Postgres, JSON (text) elsewhere
+JSONB = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+class ARRAY(TypeDecorator):
+    """Native ARRAY on Postgres, a JSON list elsewhere.
+
+    Only whole-value reads and writes are portable; array operators such as
+    `any()` or `contains()` remain Postgres-only.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self, item_type):
+        super().__init__()
+        self.item_type = to_instance(item_type)
+        self._uuid_items = isinstance(self.item_type, Uuid)
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.ARRAY(self.item_type))
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or not self._uuid_items:
+            return value
+        return [str(item) for item in value]
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or not self._uuid_items:
+            return value
+        return [uuid.UUID(item) for item in value]
+
+
+class _TimestampText(String):
+    # Plain text to the driver, but still declared DATETIME in SQLite DDL
+    __visit_name__ = "DATETIME"
+
+
+class DateTime(TypeDecorator):
+    """Native timestamp on Postgres; on SQLite, naive UTC text in the format SQLite itself writes.
+
+    SQLite compares timestamps as text. `CURRENT_TIMESTAMP` (every
+    `server_default=func.now()`) stores `YYYY-MM-DD HH:MM:SS`, while the stock
+    type binds `YYYY-MM-DD HH:MM:SS.000000`, a longer string that sorts after
+    the stored one for the same instant. Binding without the fraction when it
+    is zero, as `isoformat` does, makes the two agree, so range filters and
+    keyset cursors see server-defaulted and app-written rows consistently.
+    """
+
+    impl = sqlalchemy.DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(_TimestampText())
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=" ")
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return datetime.fromisoformat(value)
@@ -4,6 +4,14 @@ from contextlib import asynccontextmanager
 
 from src.config.settings import settings
 from src.api import api_router
+from src.core.security import password_hasher
+from src.core.tasks import run_periodically
+from src.database.instrumentation import QueryInstrumentationMiddleware, route_query_metrics
+from src.services.canvas_position_writer import canvas_position_writer
+from src.services.centrality_service import refresh_centrality_job
+from src.services.garbage_collection_service import collect_garbage_job, gc_stats
+from src.services.wiki_generation_service import generate_wiki_entries_job
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,9 +20,18 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("MemoRoo Backend starting up...")
     # Initialize AI models here, load vector store, etc.
+    periodic_tasks = [
+        asyncio.create_task(run_periodically(settings.CENTRALITY_REFRESH_INTERVAL_SECONDS, refresh_centrality_job)),
+        asyncio.create_task(run_periodically(settings.GC_INTERVAL_SECONDS, collect_garbage_job)),
+        asyncio.create_task(run_periodically(settings.WIKI_GENERATION_INTERVAL_SECONDS, generate_wiki_entries_job)),
+    ]
     logger.info("MemoRoo Backend started.")
     yield
     logger.info("MemoRoo Backend shutting down...")
+    for task in periodic_tasks:
+        task.cancel()
+    await asyncio.gather(*periodic_tasks, return_exceptions=True)
+    await canvas_position_writer.flush_all()
     # Clean up resources, save state if necessary
     logger.info("MemoRoo Backend shut down.")
 
@@ -36,8 +53,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryInstrumentationMiddleware)
+
 app.include_router(api_router, prefix="/api")
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "environment": settings.ENVIRONMENT}
+
+# Unauthenticated and revealing (routes, statement shapes, load), so served in development only, like the docs
+if settings.ENVIRONMENT == "development":
+    @app.get("/metrics/db")
+    async def db_metrics():
+        # Per-route (and per-job) query count and DB time histograms since process start
+        return route_query_metrics.snapshot()
+
+    @app.get("/metrics/gc")
+    async def gc_metrics():
+        # Files, bytes and rows reclaimed by the garbage collector, last run and since process start
+        return gc_stats.snapshot()
+
+    @app.get("/metrics/auth")
+    async def auth_metrics():
+        # Password hashing pool: threads busy, hashes waiting for one, and logins turned away
+        return password_hasher.snapshot()
@@ -10,3 +10,10 @@ from .mood_log import MoodLog
 from .timeline_event import TimelineEvent
 from .wiki_entry import WikiEntry
 from .habit import Habit
+from .cluster_assignment import ClusterAssignment
+from .import_job import ImportJob
+from .deleted_file import DeletedFile
+from .mood_rollup import MoodRollup
+from .habit_completion import HabitCompletion
+from .wiki_entry_source import WikiEntrySource
+from .dismissed_wiki_cluster import DismissedWikiCluster
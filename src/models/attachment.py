@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, ForeignKey, Integer, Text
+from src.database.types import UUID, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
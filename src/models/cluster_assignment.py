@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, ForeignKey
+from src.database.types import UUID, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from src.database.base import Base
+
+class ClusterAssignment(Base):
+    __tablename__ = "cluster_assignments"
+
+    node_id = Column(UUID(as_uuid=True), ForeignKey("graph_nodes.id"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    memory_card_id = Column(UUID(as_uuid=True), ForeignKey("memory_cards.id"), nullable=True)
+    cluster_id = Column(UUID(as_uuid=True), nullable=False) # Id of the node whose label the cluster converged on
+    cluster_label = Column(String, nullable=True) # Dominant tag, or label of the best-connected member
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+
+    node = relationship("GraphNode", backref="cluster_assignment")
+
+    def __repr__(self):
+        return f"<ClusterAssignment(node_id='{self.node_id}' cluster_id='{self.cluster_id}' label='{self.cluster_label}' )>"
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
+from src.database.types import UUID, DateTime
+from sqlalchemy.sql import func
+import uuid
+
+from src.database.base import Base
+
+# Tombstone for a stored file whose row is gone; the garbage collector unlinks it later
+class DeletedFile(Base):
+    __tablename__ = "deleted_files"
+    __table_args__ = (
+        # The collector works through tombstones oldest first
+        Index("ix_deleted_files_deleted_at", "deleted_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    path = Column(String, nullable=False)
+    size = Column(Integer, nullable=True) # As recorded on the row; the collector reports what it actually frees
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<DeletedFile(id='{self.id}' path='{self.path}' )>"
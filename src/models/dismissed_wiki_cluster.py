@@ -0,0 +1,16 @@
+from sqlalchemy import Column, ForeignKey
+from src.database.types import UUID, DateTime
+from sqlalchemy.sql import func
+
+from src.database.base import Base
+
+# A memory cluster whose generated wiki entry the user deleted; generation leaves it alone from then on
+class DismissedWikiCluster(Base):
+    __tablename__ = "dismissed_wiki_clusters"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    cluster_id = Column(UUID(as_uuid=True), primary_key=True)
+    dismissed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<DismissedWikiCluster(user_id='{self.user_id}' cluster_id='{self.cluster_id}' )>"
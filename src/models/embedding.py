@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, ForeignKey, Enum, Float
+from src.database.types import UUID, ARRAY, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
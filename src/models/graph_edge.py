@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, ForeignKey, Float, Index, text
+from src.database.types import UUID, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,19 @@ from src.database.base import Base
 
 class GraphEdge(Base):
     __tablename__ = "graph_edges"
+    __table_args__ = (
+        # One similarity edge per node pair, so edge inference can upsert
+        Index(
+            "uq_graph_edges_inferred_pair",
+            "source_node_id",
+            "target_node_id",
+            unique=True,
+            postgresql_where=text("type = 'inferred'"),
+            sqlite_where=text("type = 'inferred'"),
+        ),
+        # Keyset pagination over (created_at, id)
+        Index("ix_graph_edges_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
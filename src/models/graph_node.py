@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Float
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
+from sqlalchemy import Column, String, ForeignKey, Text, Enum, Float, Index
+from src.database.types import UUID, ARRAY, JSONB, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,12 @@ from src.database.base import Base
 
 class GraphNode(Base):
     __tablename__ = "graph_nodes"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id)
+        Index("ix_graph_nodes_user_created_at_id", "user_id", "created_at", "id"),
+        # The garbage collector's "still referenced" anti-join on embeddings
+        Index("ix_graph_nodes_embedding_id", "embedding_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -16,11 +22,12 @@ class GraphNode(Base):
     type = Column(Enum("source", "chunk", "inferred", "root", "memory-card", "insight", "pain-point", "solution", name="graph_node_type"), nullable=False)
     memory_card_id = Column(UUID(as_uuid=True), ForeignKey("memory_cards.id"), nullable=True)
     embedding_id = Column(UUID(as_uuid=True), ForeignKey("embeddings.id"), nullable=True)
-    tags = Column(ARRAY(String), default=[]))
+    tags = Column(ARRAY(String), default=[])
     metadata = Column(JSONB, default={})
     position_3d_x = Column(Float, nullable=True)
     position_3d_y = Column(Float, nullable=True)
     position_3d_z = Column(Float, nullable=True)
+    centrality = Column(Float, nullable=True) # PageRank scaled to 0-1, refreshed in the background
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, ForeignKey, Integer, Text, Float, Index
+from src.database.types import UUID, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,10 @@ from src.database.base import Base
 
 class Habit(Base):
     __tablename__ = "habits"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id)
+        Index("ix_habits_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, Float, Index
+from src.database.types import UUID, DateTime
+from sqlalchemy.sql import func
+import uuid
+
+from src.database.base import Base
+
+# One row per completed step; habit streaks and period totals are computed from these
+class HabitCompletion(Base):
+    __tablename__ = "habit_completions"
+    __table_args__ = (
+        # A habit's history in time order, and a user's recent history across habits
+        Index("ix_habit_completions_habit_completed_at", "habit_id", "completed_at"),
+        Index("ix_habit_completions_user_completed_at", "user_id", "completed_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    habit_id = Column(UUID(as_uuid=True), ForeignKey("habits.id"), nullable=False)
+    value = Column(Float, nullable=False, default=1.0)
+    completed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<HabitCompletion(id='{self.id}' habit_id='{self.habit_id}' value={self.value} )>"
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, ForeignKey, Integer, Enum, Index
+from src.database.types import UUID, JSONB, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+
+from src.database.base import Base
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id)
+        Index("ix_import_jobs_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    status = Column(Enum("pending", "importing", "enriching", "completed", "failed", name="import_job_status"), nullable=False, default="pending")
+    source_filename = Column(String, nullable=True)
+    upload_path = Column(String, nullable=False) # Spooled upload, removed once the job finishes
+    total_records = Column(Integer, nullable=False, default=0)
+    imported_records = Column(Integer, nullable=False, default=0)
+    failed_records = Column(Integer, nullable=False, default=0)
+    enriched_records = Column(Integer, nullable=False, default=0)
+    errors = Column(JSONB, default=[]) # First IMPORT_MAX_REPORTED_ERRORS problems: {"line", "error"}
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    user = relationship("User", backref="import_jobs")
+
+    def __repr__(self):
+        return f"<ImportJob(id='{self.id}' status='{self.status}' imported={self.imported_records}/{self.total_records} )>"
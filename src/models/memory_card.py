@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Float
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
+from sqlalchemy import DDL, Column, String, ForeignKey, Text, Enum, Float, Index, event, text
+from src.database.types import UUID, ARRAY, JSONB, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,22 @@ from src.database.base import Base
 
 class MemoryCard(Base):
     __tablename__ = "memory_cards"
+    __table_args__ = (
+        # The canvas viewport query's rectangle search. A B-tree on (x, y) only seeks on x and then
+        # filters the whole x-slab by y, so Postgres gets a GiST index on the point (user_id through
+        # btree_gist); the on-device SQLite canvas is small enough for the B-tree.
+        Index(
+            "ix_memory_cards_user_canvas_point",
+            "user_id",
+            text("point(canvas_position_x, canvas_position_y)"),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_memory_cards_user_canvas_position", "user_id", "canvas_position_x", "canvas_position_y").ddl_if(dialect="sqlite"),
+        # Keyset pagination over (created_at, id)
+        Index("ix_memory_cards_user_created_at_id", "user_id", "created_at", "id"),
+        # The garbage collector's "still referenced" anti-join on embeddings
+        Index("ix_memory_cards_embedding_id", "embedding_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -17,7 +33,7 @@ class MemoryCard(Base):
     url = Column(String, nullable=True)
     attachment_id = Column(UUID(as_uuid=True), ForeignKey("attachments.id"), nullable=True)
     embedding_id = Column(UUID(as_uuid=True), ForeignKey("embeddings.id"), nullable=True)
-    tags = Column(ARRAY(String), default=[]))
+    tags = Column(ARRAY(String), default=[])
     metadata = Column(JSONB, default={})
     canvas_position_x = Column(Float, nullable=True)
     canvas_position_y = Column(Float, nullable=True)
@@ -30,3 +46,11 @@ class MemoryCard(Base):
 
     def __repr__(self):
         return f"<MemoryCard(id=\\'{self.id}\\' title=\\'{self.title}\\' type=\\'{self.type}\\' user_id=\\'{self.user_id}\\' )>"
+
+
+# The GiST index's user_id column needs btree_gist; migration 0012 installs it on migrated databases
+event.listen(
+    MemoryCard.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
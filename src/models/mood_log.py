@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, ForeignKey, Integer, Text, Index
+from src.database.types import UUID, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,10 @@ from src.database.base import Base
 
 class MoodLog(Base):
     __tablename__ = "mood_logs"
+    __table_args__ = (
+        # Keyset pagination over (timestamp, id)
+        Index("ix_mood_logs_user_timestamp_id", "user_id", "timestamp", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
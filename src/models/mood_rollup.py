@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Date, ForeignKey, Integer, Enum
+from src.database.types import UUID
+
+from src.database.base import Base
+
+class MoodRollup(Base):
+    __tablename__ = "mood_rollups"
+
+    # One row per (user, period, bucket, label); kept in step with mood_logs by MoodAnalyticsService
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    period = Column(Enum("day", "week", "month", name="mood_rollup_period"), primary_key=True)
+    period_start = Column(Date, primary_key=True) # UTC day, Monday of the ISO week, or first of the month
+    mood_label = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0) # Logs that have a score
+
+    def __repr__(self):
+        return f"<MoodRollup(user_id='{self.user_id}' period='{self.period}' period_start='{self.period_start}' mood_label='{self.mood_label}' count={self.count} )>"
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, ForeignKey, Text, Enum, Index
+from src.database.types import UUID, JSONB, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,12 @@ from src.database.base import Base
 
 class TimelineEvent(Base):
     __tablename__ = "timeline_events"
+    __table_args__ = (
+        # Keyset pagination over (timestamp, id)
+        Index("ix_timeline_events_user_timestamp_id", "user_id", "timestamp", "id"),
+        # Covers the bucketed timeline counts, which then never read the table itself
+        Index("ix_timeline_events_user_timestamp_type_mood", "user_id", "timestamp", "type", "mood_context"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
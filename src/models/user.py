@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String
+from src.database.types import UUID, DateTime
 from sqlalchemy.sql import func
 import uuid
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, ForeignKey, Text, Index
+from src.database.types import UUID, ARRAY, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -8,6 +8,14 @@ from src.database.base import Base
 
 class WikiEntry(Base):
     __tablename__ = "wiki_entries"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id)
+        Index("ix_wiki_entries_user_created_at_id", "user_id", "created_at", "id"),
+        # At most one generated entry per memory cluster
+        Index("ix_wiki_entries_user_cluster_id", "user_id", "cluster_id", unique=True),
+        # The garbage collector's "still referenced" anti-join on embeddings
+        Index("ix_wiki_entries_embedding_id", "embedding_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -15,8 +23,11 @@ class WikiEntry(Base):
     type = Column(String, nullable=True) # e.g., "Project", "Event", "Knowledge"
     summary = Column(Text, nullable=False)
     content = Column(Text, nullable=True) # Full content, if different from summary
-    tags = Column(ARRAY(String), default=[]))
+    tags = Column(ARRAY(String), default=[])
     embedding_id = Column(UUID(as_uuid=True), ForeignKey("embeddings.id"), nullable=True)
+    cluster_id = Column(UUID(as_uuid=True), nullable=True) # Memory cluster a generated entry summarizes; null for user-written entries
+    generated_at = Column(DateTime(timezone=True), nullable=True)
+    sources_checked_at = Column(DateTime(timezone=True), nullable=True) # Cards last seen matching their provenance hashes
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
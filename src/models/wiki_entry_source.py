@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from src.database.types import UUID
+
+from src.database.base import Base
+
+# Provenance of a generated wiki entry: the cards it was summarized from, as they were then
+class WikiEntrySource(Base):
+    __tablename__ = "wiki_entry_sources"
+    __table_args__ = (
+        # Card deletes drop the card's provenance rows
+        Index("ix_wiki_entry_sources_memory_card_id", "memory_card_id"),
+    )
+
+    wiki_entry_id = Column(UUID(as_uuid=True), ForeignKey("wiki_entries.id"), primary_key=True)
+    memory_card_id = Column(UUID(as_uuid=True), ForeignKey("memory_cards.id"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    content_hash = Column(String(32), nullable=False) # card_content_hash() of the card when the entry was generated
+
+    def __repr__(self):
+        return f"<WikiEntrySource(wiki_entry_id='{self.wiki_entry_id}' memory_card_id='{self.memory_card_id}' )>"
@@ -1,7 +1,10 @@
+from .common import BulkDeleteRequest, BulkDeleteResponse, Page
 from .user import UserCreate, UserResponse
 from .auth import Token, TokenData, UserLogin
-from .memory_card import MemoryCardCreate, MemoryCardUpdate, MemoryCardResponse, MemoryCardCanvasPositionUpdate
+from .memory_card import MemoryCardCreate, MemoryCardUpdate, MemoryCardResponse, MemoryCardCanvasPositionUpdate, MemoryCardCanvasPositionBatch
 from .attachment import AttachmentResponse
-from .graph import GraphNodeCreate, GraphNodeUpdate, GraphNodeResponse, GraphEdgeResponse
+from .graph import GraphNodeCreate, GraphNodeUpdate, GraphNodeResponse, GraphEdgeResponse, ClusterAssignmentResponse, GraphBatchRequest, GraphBatchResponse
 from .chat import ChatMessageCreate, ChatMessageResponse, ConversationResponse
-from .life_os import MoodLogCreate, MoodLogResponse, TimelineEventCreate, TimelineEventResponse, WikiEntryCreate, WikiEntryUpdate, WikiEntryResponse, HabitCreate, HabitUpdate, HabitResponse
+from .life_os import MoodLogCreate, MoodLogResponse, MoodPeriod, MoodBucket, MoodAnalyticsResponse, TimelineEventCreate, TimelineEventResponse, TimelineBucketSize, TimelineBucket, TimelineResponse, WikiEntryCreate, WikiEntryUpdate, WikiEntryResponse, WikiEntrySourceResponse, HabitCreate, HabitUpdate, HabitResponse, HabitPeriodTotal, HabitSummary
+from .search import SearchEntityType, SearchHit
+from .import_job import ImportJobStatus, ImportRecord, ImportJobResponse
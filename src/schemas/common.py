@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=10000)
+
+class BulkDeleteResponse(BaseModel):
+    deleted: int
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None # Pass back as ?cursor= to fetch the next page; null on the last page
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from enum import Enum as PyEnum
 
@@ -31,12 +31,14 @@ class GraphNodeCreate(GraphNodeBase):
 class GraphNodeUpdate(GraphNodeBase):
     label: Optional[str] = None
     type: Optional[GraphNodeType] = None
+    embedding_id: Optional[UUID] = None
 
 class GraphNodeResponse(GraphNodeBase):
     id: UUID
     user_id: UUID
     memory_card_id: Optional[UUID] = None
     embedding_id: Optional[UUID] = None
+    centrality: Optional[float] = None
     created_at: datetime
     updated_at: datetime
 
@@ -65,3 +67,31 @@ class GraphEdgeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ClusterAssignmentResponse(BaseModel):
+    node_id: UUID
+    memory_card_id: Optional[UUID] = None
+    cluster_id: UUID
+    cluster_label: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# Batch mutation schemas
+class GraphNodeBatchCreate(GraphNodeCreate):
+    temp_id: Optional[str] = Field(None, description="Client-side id that edges in the same batch can reference")
+
+class GraphEdgeBatchCreate(BaseModel):
+    source: str = Field(..., description="Existing node id or a temp_id from the same batch")
+    target: str = Field(..., description="Existing node id or a temp_id from the same batch")
+    type: str = Field(..., description="e.g., Informs, Constraints, Derives Insight")
+    strength: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+class GraphBatchRequest(BaseModel):
+    nodes: List[GraphNodeBatchCreate] = Field([], max_length=5000)
+    edges: List[GraphEdgeBatchCreate] = Field([], max_length=20000)
+
+class GraphBatchResponse(BaseModel):
+    nodes: List[GraphNodeResponse]
+    edges: List[GraphEdgeResponse]
+    temp_ids: Dict[str, UUID] = {} # temp_id -> created node id
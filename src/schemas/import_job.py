@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, List
+from uuid import UUID
+from enum import Enum as PyEnum
+
+from src.schemas.memory_card import MemoryCardCreate
+
+class ImportJobStatus(str, PyEnum):
+    pending = "pending"
+    importing = "importing"
+    enriching = "enriching" # Cards are in; embeddings and graph nodes are being built
+    completed = "completed"
+    failed = "failed"
+
+class ImportRecord(MemoryCardCreate):
+    """One line of an import NDJSON file."""
+    created_at: Optional[datetime] = None # Keeps the original note's date; defaults to now
+    file: Optional[str] = Field(None, description="Path of the attached file inside the uploaded zip archive")
+
+class ImportRecordError(BaseModel):
+    source: Optional[str] = None # File inside the archive, for zip uploads
+    line: int
+    error: str
+
+class ImportJobResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    status: ImportJobStatus
+    source_filename: Optional[str] = None
+    total_records: int
+    imported_records: int
+    failed_records: int
+    enriched_records: int
+    errors: List[ImportRecordError] = []
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
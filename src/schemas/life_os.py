@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Dict, Optional, List
 from uuid import UUID
 from enum import Enum as PyEnum
 
@@ -19,6 +19,29 @@ class MoodLogResponse(MoodLogCreate):
     class Config:
         from_attributes = True
 
+# Mood analytics (served from the mood_rollups table)
+class MoodPeriod(str, PyEnum):
+    day = "day"
+    week = "week" # ISO weeks, starting Monday
+    month = "month"
+
+class MoodBucket(BaseModel):
+    period_start: date
+    count: int
+    average_score: Optional[float] = None # None when no log in the bucket has a score
+    moving_average: Optional[float] = None # Score average over this and the previous window - 1 periods
+    labels: Dict[str, int] # mood_label -> logs
+
+class MoodAnalyticsResponse(BaseModel):
+    period: MoodPeriod
+    start: date
+    end: date
+    window: int
+    count: int
+    average_score: Optional[float] = None
+    labels: Dict[str, int] # Distribution over the whole range
+    buckets: List[MoodBucket] # Only periods with at least one log, oldest first
+
 # TimelineEvent Schemas
 class TimelineEventType(str, PyEnum):
     voice = "voice"
@@ -48,6 +71,26 @@ class TimelineEventResponse(TimelineEventBase):
     class Config:
         from_attributes = True
 
+class TimelineBucketSize(str, PyEnum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+    month = "month"
+
+class TimelineBucket(BaseModel):
+    start: datetime # UTC hour, day, Monday of the week, or first of the month
+    count: int
+    types: Dict[str, int] # Events per type
+    dominant_mood: Optional[str] = None # Most frequent mood_context; ties go to the alphabetically first
+
+class TimelineResponse(BaseModel):
+    bucket: TimelineBucketSize
+    start: datetime
+    end: datetime # Exclusive
+    buckets: List[TimelineBucket] # Only buckets with at least one event, oldest first
+    events: List[TimelineEventResponse] # The detail window, newest first
+    next_cursor: Optional[str] = None # Next page of the detail window
+
 # WikiEntry Schemas
 class WikiEntryBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
@@ -70,12 +113,22 @@ class WikiEntryResponse(WikiEntryBase):
     id: UUID
     user_id: UUID
     embedding_id: Optional[UUID] = None
+    cluster_id: Optional[UUID] = None # Set on entries generated from a memory cluster
+    generated_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
 
+class WikiEntrySourceResponse(BaseModel):
+    memory_card_id: UUID
+    title: str
+    content_hash: str # Of the card as it was summarized; differs once the card has been edited
+
+    class Config:
+        from_attributes = True
+
 # Habit Schemas
 class HabitBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -104,3 +157,16 @@ class HabitResponse(HabitBase):
 
     class Config:
         from_attributes = True
+
+class HabitPeriodTotal(BaseModel):
+    period_start: date # UTC day, Monday of the week, or first of the month, after the habit's frequency
+    total: float
+    met: bool # Reached target_value, or had any completion when there is no target
+
+class HabitSummary(HabitResponse):
+    # current_value and streak_count are recomputed from the completion log as of today
+    longest_streak: int
+    completions: int
+    periods: List[HabitPeriodTotal] # Most recent periods, the current one last
+    heatmap_start: date
+    heatmap: List[float] # Daily totals from heatmap_start to today
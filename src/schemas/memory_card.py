@@ -42,3 +42,41 @@ class MemoryCardResponse(MemoryCardBase):
 class MemoryCardCanvasPositionUpdate(BaseModel):
     x: float
     y: float
+
+class MemoryCardCanvasPosition(BaseModel):
+    id: UUID
+    x: float
+    y: float
+
+class MemoryCardCanvasPositionBatch(BaseModel):
+    positions: List[MemoryCardCanvasPosition] = Field(..., min_length=1, max_length=5000)
+
+class MemoryCardCanvasPositionBatchResponse(BaseModel):
+    accepted: int
+
+# Canvas viewport schemas
+class CanvasCardSummary(BaseModel):
+    id: UUID
+    title: str
+    type: MemoryCardType
+    tags: Optional[List[str]] = []
+    canvas_position_x: float
+    canvas_position_y: float
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CanvasDensityTile(BaseModel):
+    tile_x: int
+    tile_y: int
+    count: int
+    center_x: float # Mean card position within the tile
+    center_y: float
+
+class CanvasViewportResponse(BaseModel):
+    mode: str # "cards" or "tiles"
+    tile_size: Optional[float] = None # Canvas units per tile in "tiles" mode
+    cards: List[CanvasCardSummary] = []
+    tiles: List[CanvasDensityTile] = []
+    truncated: bool = False
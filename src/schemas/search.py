@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from enum import Enum as PyEnum
+
+class SearchEntityType(str, PyEnum):
+    WIKI_ENTRY = "wiki_entry"
+    MEMORY_CARD = "memory_card"
+    ATTACHMENT = "attachment"
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    id: UUID
+    title: str
+    snippet: Optional[str] = None # Matched terms wrapped in <mark></mark>
+    rank: float
+    created_at: Optional[datetime] = None
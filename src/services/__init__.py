@@ -6,3 +6,16 @@ from .graph_service import GraphService
 from .chat_service import ChatService
 from .life_os_service import LifeOsService
 from .ai_pipeline_service import AiPipelineService
+from .edge_inference_service import EdgeInferenceService
+from .clustering_service import ClusteringService
+from .centrality_service import CentralityService
+from .cascade_delete_service import CascadeDeleteService
+from .search_service import SearchService
+from .import_service import ImportService
+from .export_service import ExportService
+from .garbage_collection_service import GarbageCollectionService
+from .mood_analytics_service import MoodAnalyticsService
+from .habit_stats_service import HabitStatsService
+from .timeline_service import TimelineService
+from .wiki_generation_service import WikiGenerationService
+from .mood_backfill_service import MoodBackfillService
@@ -1,14 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from uuid import UUID
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import asyncio
 import os
 
 from src.config.settings import settings
+from src.ai.mood_classifier import get_mood_classifier
+from src.ai.vector_index import vector_index
 from src.models.memory_card import MemoryCard
 from src.models.attachment import Attachment
 from src.models.embedding import Embedding
 from src.models.graph_node import GraphNode
 from src.models.chat_message import ChatMessage
+from src.services.edge_inference_service import EdgeInferenceService, GRAPH_NODE_NAMESPACE
 
 # NOTE: In a production environment, actual AI model loading and inference logic
 # would be implemented here using ExecuTorch, TFLite, or ONNX Runtimes
@@ -22,6 +27,7 @@ class AiPipelineService:
         self.ocr_model = self._load_ocr_model()
         self.whisper_model = self._load_whisper_model()
         self.embedding_model = self._load_embedding_model()
+        self.mood_model = get_mood_classifier() # Shared per process; a lexicon until a trained model is installed
         self.vector_store = self._initialize_vector_store() # Faiss/Annoy index
 
     def _get_model_path(self, relative_path: str) -> str:
@@ -58,8 +64,8 @@ class AiPipelineService:
     def _initialize_vector_store(self):
         # Initialize Faiss/Annoy index for efficient similarity search
         # This would typically load a pre-built index or build one from existing embeddings
-        # print("Initializing on-device vector store (Faiss/Annoy)") # Removed print
-        return "Mock Vector Store"
+        # Partitions are loaded lazily per user from the embeddings table
+        return vector_index
 
     async def generate_embeddings(self, text: str) -> List[float]:
         # Simulate embedding generation using the loaded model
@@ -68,6 +74,11 @@ class AiPipelineService:
         # print(f"Generating embeddings for text: {text[:50]}...") # Removed print
         return [0.1] * 1024 # Mock 1024-dimensional vector
 
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        # One batched forward pass; bulk paths (imports, backfills) should prefer this over per-text calls
+        # In real implementation: pad/truncate to the model's sequence length and run self.embedding_model.infer(batch)
+        return [[0.1] * 1024 for _ in texts] # Mock 1024-dimensional vectors
+
     async def perform_ocr(self, file_path: str) -> str:
         # Simulate OCR using the loaded model and preprocessing utilities
         # In real implementation: call self.ocr_model.infer(image_data) with Arm Compute Library acceleration
@@ -86,31 +97,49 @@ class AiPipelineService:
         # print(f"Performing LLM inference with prompt: {prompt[:50]}...") # Removed print
         return "AI generated response based on prompt and context."
 
-    async def perform_rag_search(self, query: str, user_id: UUID) -> List[Dict[str, Any]]:
+    async def perform_rag_search(self, query: str, user_id: UUID, top_k: int | None = None) -> List[Dict[str, Any]]:
+        top_k = top_k or settings.RAG_TOP_K
+
         # 1. Query embedding engine to generate query embedding
         query_embedding = await self.generate_embeddings(query)
 
-        # 2. Retrieve top-k relevant memory embeddings for the user from vector store
-        # This would involve querying the Faiss/Annoy index with the generated query_embedding.
-        # print(f"Performing RAG search for query: {query[:50]}...") # Removed print
-        mock_results = [
-            {"memory_card_id": UUID("a0eebc99-9c0b-4ef8-bb6d-6bb9bd380611"), "score": 0.95, "content": "User mentioned they struggle to organize random screenshots and voice notes."}, 
-            {"memory_card_id": UUID("b0eebc99-9c0b-4ef8-bb6d-6bb9bd380612"), "score": 0.88, "content": "Backend Specs v2: Implementing vector embeddings for semantic chunking."}
-        ]
-        # 3. Build contextual prompt and call ExecuTorch LLM
-        # 4. Return structured JSON
-        return mock_results # Mock results
+        # 2. Over-fetch candidates from the user's graph-node partition of the vector store
+        await EdgeInferenceService(self.db, self.vector_store).ensure_index(user_id)
+        candidates = dict(self.vector_store.search(
+            user_id, GRAPH_NODE_NAMESPACE, query_embedding, k=top_k * settings.RAG_CANDIDATE_MULTIPLIER
+        ))
+        if not candidates:
+            return []
+
+        # 3. Re-rank with the precomputed centrality prior so hub memories win near-ties
+        result = await self.db.execute(
+            select(GraphNode.id, GraphNode.memory_card_id, GraphNode.centrality, GraphNode.description, MemoryCard.content)
+            .join(MemoryCard, GraphNode.memory_card_id == MemoryCard.id)
+            .filter(GraphNode.user_id == user_id, GraphNode.id.in_(list(candidates)))
+        )
+        weight = settings.RAG_CENTRALITY_WEIGHT
+        ranked = sorted(
+            (
+                {
+                    "memory_card_id": row.memory_card_id,
+                    "score": (1.0 - weight) * candidates[row.id] + weight * (row.centrality or 0.0),
+                    "content": row.content or row.description or "",
+                }
+                for row in result.all()
+            ),
+            key=lambda hit: hit["score"],
+            reverse=True,
+        )
+        # 4. Caller builds the contextual prompt from the returned content
+        return ranked[:top_k]
 
     async def detect_mood_sentiment(self, text: str) -> str:
-        # Simulate mood detection using an on-device model
-        # print(f"Detecting mood for text: {text[:50]}...") # Removed print
-        if "stress" in text.lower() or "worried" in text.lower():
-            return "Stressed"
-        elif "excited" in text.lower() or "great" in text.lower():
-            return "Excited"
-        elif "?" in text:
-            return "Curious"
-        return "Neutral"
+        label, _ = self.mood_model.classify([text])[0]
+        return label
+
+    async def detect_mood_sentiment_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        # One vectorized pass returning (label, score) per text; bulk paths (backfills, imports) should prefer this
+        return await asyncio.to_thread(self.mood_model.classify, texts)
 
     async def extract_metadata(self, content: str) -> Dict[str, Any]:
         # Simulate metadata extraction from content (e.g., from a document)
@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 import os
 import shutil
+import uuid
 
 from fastapi import UploadFile
 
@@ -11,10 +13,25 @@ from src.models.attachment import Attachment
 from src.models.memory_card import MemoryCard
 from src.core.exceptions import AttachmentNotFoundException, MemoryCardNotFoundException, UnauthorizedAccessException
 from src.config.settings import settings
+from src.core.events import ChangeEvent, change_broker
+from src.database.repository import OwnedRepository
+from src.services.ai_pipeline_service import AiPipelineService
+from src.services.garbage_collection_service import defer_file_deletion
+
+
+def _extracted_text_field(mimetype: str) -> Optional[str]:
+    # Column filled in by background processing, or None when there is nothing to extract
+    if mimetype.startswith("image/") or mimetype == "application/pdf":
+        return "ocr_text"
+    if mimetype.startswith("audio/"):
+        return "transcription"
+    return None
+
 
 class AttachmentService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.attachments = OwnedRepository(db, Attachment)
 
     async def get_attachment_by_id(self, user_id: UUID, attachment_id: UUID) -> Attachment:
         result = await self.db.execute(
@@ -54,27 +71,73 @@ class AttachmentService:
             shutil.copyfileobj(file.file, buffer)
 
         # Create Attachment record
-        new_attachment = Attachment(
-            user_id=user_id,
-            memory_card_id=memory_card_id,
-            filename=file.filename,
-            mimetype=file.content_type,
-            file_url=file_path, # Store local path
-            size=file.size
+        new_attachment = await self.attachments.insert({
+            "user_id": user_id,
+            "memory_card_id": memory_card_id,
+            "filename": file.filename,
+            "mimetype": file.content_type,
+            "file_url": file_path, # Store local path
+            "size": file.size,
+        })
+        status = "queued" if _extracted_text_field(new_attachment.mimetype) else "stored"
+        change_broker.publish(user_id, ChangeEvent("attachment", "created", new_attachment.id, {"memory_card_id": memory_card_id, "status": status}))
+
+        return new_attachment
+
+    async def process_attachment(self, user_id: UUID, attachment_id: UUID):
+        # OCR or transcription, with a status event at each step so clients can show progress
+        attachment = await self.attachments.get(user_id, attachment_id)
+        if not attachment:
+            return # Deleted before processing started
+        field = _extracted_text_field(attachment.mimetype)
+        if field is None:
+            return
+        memory_card_id, file_path = attachment.memory_card_id, attachment.file_url
+        # Inference can take a while; hold no connection or transaction across it
+        await self.db.commit()
+        self._publish_status(user_id, attachment_id, memory_card_id, "processing")
+
+        try:
+            pipeline = AiPipelineService(self.db)
+            extract = pipeline.perform_ocr if field == "ocr_text" else pipeline.transcribe_audio
+            text = await extract(file_path)
+        except Exception:
+            self._publish_status(user_id, attachment_id, memory_card_id, "failed")
+            raise
+
+        result = await self.db.execute(
+            update(Attachment)
+            .where(Attachment.id == attachment_id, Attachment.user_id == user_id)
+            .values({field: text})
+            .returning(Attachment.id)
         )
-        self.db.add(new_attachment)
+        if result.scalar_one_or_none() is None:
+            await self.db.rollback()
+            return # Deleted while processing
         await self.db.commit()
-        await self.db.refresh(new_attachment)
-        
-        return new_attachment
+        self._publish_status(user_id, attachment_id, memory_card_id, "processed")
+
+    def _publish_status(self, user_id: UUID, attachment_id: UUID, memory_card_id: UUID, status: str):
+        change_broker.publish(user_id, ChangeEvent("attachment", "updated", attachment_id, {"memory_card_id": memory_card_id, "status": status}))
 
     async def delete_attachment(self, user_id: UUID, attachment_id: UUID):
-        attachment = await self.get_attachment_by_id(user_id, attachment_id)
-        
-        # Delete file from disk
-        if os.path.exists(attachment.file_url):
-            os.remove(attachment.file_url)
-
-        # Delete record from database
-        await self.db.delete(attachment)
+        # Cards that use this as their primary attachment just lose the reference
+        await self.db.execute(
+            update(MemoryCard)
+            .where(MemoryCard.user_id == user_id, MemoryCard.attachment_id == attachment_id)
+            .values(attachment_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = await self.attachments.delete(user_id, attachment_id, Attachment.file_url, Attachment.size, commit=False)
+        if not deleted:
+            await self.db.rollback()
+            raise AttachmentNotFoundException()
+
+        # The file goes with the next garbage collection
+        await defer_file_deletion(self.db, user_id, [deleted])
         await self.db.commit()
+        change_broker.publish(user_id, ChangeEvent("attachment", "deleted", attachment_id))
+
+
+async def process_attachment_job(db: AsyncSession, user_id: UUID, attachment_id: UUID):
+    await AttachmentService(db).process_attachment(user_id, attachment_id)
@@ -6,7 +6,7 @@ from uuid import UUID
 from src.models.user import User
 from src.schemas.auth import UserLogin, Token
 from src.core.exceptions import InvalidCredentialsException
-from src.core.security import verify_password, create_access_token
+from src.core.security import password_hasher, create_access_token
 from src.config.settings import settings
 
 class AuthService:
@@ -23,9 +23,16 @@ class AuthService:
         )
         user = result.scalar_one_or_none()
 
-        if not user or not verify_password(user_data.password, user.password_hash):
+        if not user:
             raise InvalidCredentialsException()
-        
+        valid, new_hash = await password_hasher.verify_and_update(user_data.password, user.password_hash)
+        if not valid:
+            raise InvalidCredentialsException()
+
+        if new_hash:
+            # Stored with other bcrypt rounds than configured; only a login sees the plain password to redo it
+            user.password_hash = new_hash
+            await self.db.commit()
         return user
 
     async def create_user_access_token(self, user_id: UUID) -> Token:
@@ -0,0 +1,66 @@
+import asyncio
+from uuid import UUID
+from typing import Dict, Iterable, Tuple
+
+from src.config.settings import settings
+from src.core.tasks import run_with_session
+from src.services.memory_card_service import MemoryCardService
+
+Position = Tuple[float, float]
+
+
+class CanvasPositionWriter:
+    """Coalesces canvas drags into batched UPDATEs per user per window.
+
+    The first move for a user opens a short window; moves arriving during it
+    overwrite earlier positions for the same card, and only the latest
+    position per card is written when the window closes. A user has at most
+    one flush in flight.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._pending: Dict[UUID, Dict[UUID, Position]] = {}
+        self._flushes: Dict[UUID, asyncio.Task] = {}
+
+    def submit(self, user_id: UUID, positions: Iterable[Tuple[UUID, float, float]]) -> int:
+        pending = self._pending.setdefault(user_id, {})
+        accepted = 0
+        for memory_card_id, x, y in positions:
+            pending[memory_card_id] = (x, y)
+            accepted += 1
+        if user_id not in self._flushes:
+            self._flushes[user_id] = asyncio.create_task(self._flush_after_window(user_id))
+        return accepted
+
+    async def _flush_after_window(self, user_id: UUID):
+        # A user's batches are written one after another by this one task, so an older batch can
+        # never commit after a newer one. Moves that arrive during a write go out a window later.
+        try:
+            while user_id in self._pending:
+                try:
+                    await asyncio.sleep(self.window_seconds)
+                finally:
+                    positions = self._pending.pop(user_id, {})
+                    if positions:
+                        await run_with_session(write_positions_job, user_id, positions)
+        finally:
+            self._flushes.pop(user_id, None)
+
+    async def flush_all(self):
+        # Called on shutdown so no accepted move is lost
+        flushes = list(self._flushes.values())
+        for flush in flushes:
+            flush.cancel()
+        await asyncio.gather(*flushes, return_exceptions=True)
+        # A flush cancelled before it first ran never reached its write
+        for user_id in list(self._pending):
+            await run_with_session(write_positions_job, user_id, self._pending.pop(user_id))
+        self._flushes.clear()
+
+
+async def write_positions_job(db, user_id: UUID, positions: Dict[UUID, Position]):
+    await MemoryCardService(db).update_canvas_positions(user_id, positions)
+
+
+canvas_position_writer = CanvasPositionWriter(settings.CANVAS_POSITION_FLUSH_MS / 1000)
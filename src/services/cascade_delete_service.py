@@ -0,0 +1,130 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, update, or_
+from uuid import UUID
+from typing import List, Sequence, Set, Tuple
+
+from src.ai.graph_changes import graph_changes
+from src.ai.vector_index import vector_index
+from src.core.events import ChangeEvent, change_broker
+from src.database.connection import pin_to_primary
+from src.models.attachment import Attachment
+from src.models.cluster_assignment import ClusterAssignment
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+from src.models.memory_card import MemoryCard
+from src.models.timeline_event import TimelineEvent
+from src.models.wiki_entry_source import WikiEntrySource
+from src.services.edge_inference_service import GRAPH_NODE_NAMESPACE
+from src.services.garbage_collection_service import defer_file_deletion
+
+# Rows are removed with set-based statements; nothing is loaded into the session
+NO_SYNC = {"synchronize_session": False}
+
+
+class CascadeDeleteService:
+    """Deletes graph nodes and memory cards together with everything that points at them.
+
+    Each public method runs a fixed handful of `DELETE ... WHERE id IN (...)`
+    statements in one transaction, regardless of how many ids are passed, and
+    then tells the in-process indexes about the removed nodes in one go.
+    Attachment files and embeddings are left to the garbage collector: files
+    are tombstoned in the same transaction, and embeddings whose source is
+    gone are found by its anti-join.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _delete_graph_nodes(self, user_id: UUID, node_ids: Sequence[UUID]) -> Tuple[List[UUID], Set[UUID]]:
+        edge_result = await self.db.execute(
+            delete(GraphEdge)
+            .where(
+                GraphEdge.user_id == user_id,
+                or_(GraphEdge.source_node_id.in_(node_ids), GraphEdge.target_node_id.in_(node_ids)),
+            )
+            .returning(GraphEdge.source_node_id, GraphEdge.target_node_id)
+            .execution_options(**NO_SYNC)
+        )
+        neighbour_ids = {node_id for row in edge_result.all() for node_id in row}
+
+        await self.db.execute(
+            delete(ClusterAssignment)
+            .where(ClusterAssignment.user_id == user_id, ClusterAssignment.node_id.in_(node_ids))
+            .execution_options(**NO_SYNC)
+        )
+        node_result = await self.db.execute(
+            delete(GraphNode)
+            .where(GraphNode.user_id == user_id, GraphNode.id.in_(node_ids))
+            .returning(GraphNode.id)
+            .execution_options(**NO_SYNC)
+        )
+        deleted_ids = list(node_result.scalars().all())
+        return deleted_ids, neighbour_ids - set(deleted_ids)
+
+    def _notify_indexes(self, user_id: UUID, deleted_node_ids: List[UUID], neighbour_ids: Set[UUID]):
+        vector_index.remove(user_id, GRAPH_NODE_NAMESPACE, deleted_node_ids)
+        graph_changes.mark(user_id, neighbour_ids)
+        change_broker.publish(user_id, *(ChangeEvent("graph_node", "deleted", node_id) for node_id in deleted_node_ids))
+
+    async def delete_graph_nodes(self, user_id: UUID, node_ids: Sequence[UUID]) -> int:
+        node_ids = list(set(node_ids))
+        if not node_ids:
+            return 0
+        deleted_ids, neighbour_ids = await self._delete_graph_nodes(user_id, node_ids)
+        await self.db.commit()
+        self._notify_indexes(user_id, deleted_ids, neighbour_ids)
+        return len(deleted_ids)
+
+    async def delete_memory_cards(self, user_id: UUID, memory_card_ids: Sequence[UUID]) -> int:
+        memory_card_ids = list(set(memory_card_ids))
+        if not memory_card_ids:
+            return 0
+
+        # The deletes below follow from this read, so it must see nodes a lagging replica may not have yet
+        pin_to_primary(self.db)
+        node_result = await self.db.execute(
+            select(GraphNode.id).filter(GraphNode.user_id == user_id, GraphNode.memory_card_id.in_(memory_card_ids))
+        )
+        node_ids = list(node_result.scalars().all())
+        deleted_node_ids, neighbour_ids = [], set()
+        if node_ids:
+            deleted_node_ids, neighbour_ids = await self._delete_graph_nodes(user_id, node_ids)
+
+        await self.db.execute(
+            delete(TimelineEvent)
+            .where(TimelineEvent.user_id == user_id, TimelineEvent.memory_card_id.in_(memory_card_ids))
+            .execution_options(**NO_SYNC)
+        )
+        # Generated wiki entries lose the card from their provenance and are rewritten on the next run
+        await self.db.execute(
+            delete(WikiEntrySource)
+            .where(WikiEntrySource.user_id == user_id, WikiEntrySource.memory_card_id.in_(memory_card_ids))
+            .execution_options(**NO_SYNC)
+        )
+        # memory_cards.attachment_id and attachments.memory_card_id reference each other
+        await self.db.execute(
+            update(MemoryCard)
+            .where(MemoryCard.user_id == user_id, MemoryCard.id.in_(memory_card_ids))
+            .values(attachment_id=None)
+            .execution_options(**NO_SYNC)
+        )
+        attachment_result = await self.db.execute(
+            delete(Attachment)
+            .where(Attachment.user_id == user_id, Attachment.memory_card_id.in_(memory_card_ids))
+            .returning(Attachment.file_url, Attachment.size)
+            .execution_options(**NO_SYNC)
+        )
+        await defer_file_deletion(self.db, user_id, attachment_result.all())
+        card_result = await self.db.execute(
+            delete(MemoryCard)
+            .where(MemoryCard.user_id == user_id, MemoryCard.id.in_(memory_card_ids))
+            .returning(MemoryCard.id)
+            .execution_options(**NO_SYNC)
+        )
+        deleted_card_ids = list(card_result.scalars().all())
+        await self.db.commit()
+
+        self._notify_indexes(user_id, deleted_node_ids, neighbour_ids)
+        change_broker.publish(user_id, *(ChangeEvent("memory_card", "deleted", card_id) for card_id in deleted_card_ids))
+        return len(deleted_card_ids)
@@ -0,0 +1,103 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from uuid import UUID
+from typing import Set
+import logging
+
+import numpy as np
+
+from src.ai.graph_algorithms import pagerank
+from src.ai.graph_changes import graph_changes
+from src.config.settings import settings
+from src.core.locks import KeyedLocks
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+
+logger = logging.getLogger(__name__)
+
+CENTRALITY_CONSUMER = "centrality"
+graph_changes.register(CENTRALITY_CONSUMER)
+
+# Stored scores that moved less than this are not rewritten
+CENTRALITY_WRITE_EPSILON = 1e-4
+
+_recompute_locks = KeyedLocks()
+
+
+class CentralityService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def recompute_centrality(self, user_id: UUID, full: bool = False) -> int:
+        async with _recompute_locks[user_id]:
+            dirty = graph_changes.drain(CENTRALITY_CONSUMER, user_id)
+            try:
+                return await self._recompute(user_id, full)
+            except Exception:
+                graph_changes.restore(CENTRALITY_CONSUMER, user_id, dirty)
+                raise
+
+    async def _recompute(self, user_id: UUID, full: bool) -> int:
+        nodes = (await self.db.execute(
+            select(GraphNode.id, GraphNode.centrality).filter(GraphNode.user_id == user_id)
+        )).all()
+        if not nodes:
+            return 0
+        edges = (await self.db.execute(
+            select(GraphEdge.source_node_id, GraphEdge.target_node_id, GraphEdge.strength)
+            .filter(GraphEdge.user_id == user_id)
+        )).all()
+
+        row_of = {node.id: row for row, node in enumerate(nodes)}
+        edges = [edge for edge in edges if edge.source_node_id in row_of and edge.target_node_id in row_of]
+        sources = np.array([row_of[edge.source_node_id] for edge in edges], dtype=np.int64)
+        targets = np.array([row_of[edge.target_node_id] for edge in edges], dtype=np.int64)
+        weights = np.array([edge.strength if edge.strength is not None else 1.0 for edge in edges], dtype=np.float64)
+
+        # Warm-start from the stored scores; new nodes start at the mean
+        stored = np.array([node.centrality if node.centrality is not None else np.nan for node in nodes], dtype=np.float64)
+        initial = None
+        if not full and not np.isnan(stored).all():
+            initial = np.where(np.isnan(stored), np.nanmean(stored), stored)
+
+        scores, _ = pagerank(
+            sources,
+            targets,
+            weights,
+            len(nodes),
+            damping=settings.PAGERANK_DAMPING,
+            tolerance=settings.PAGERANK_TOLERANCE,
+            max_iterations=settings.PAGERANK_MAX_ITERATIONS,
+            initial=initial,
+        )
+        # Stored on a 0-1 scale so it blends directly with cosine similarity
+        scaled = scores / scores.max()
+
+        changed = np.isnan(stored) | (np.abs(scaled - np.nan_to_num(stored)) > CENTRALITY_WRITE_EPSILON)
+        params = [
+            {"id": nodes[row].id, "centrality": float(scaled[row])}
+            for row in np.flatnonzero(changed).tolist()
+        ]
+        if params:
+            await self.db.execute(update(GraphNode), params)
+        await self.db.commit()
+        return len(params)
+
+    async def users_needing_refresh(self) -> Set[UUID]:
+        result = await self.db.execute(
+            select(GraphNode.user_id).filter(GraphNode.centrality.is_(None)).distinct()
+        )
+        return set(result.scalars().all()) | graph_changes.dirty_users(CENTRALITY_CONSUMER)
+
+
+# Entry point for the periodic refresh started in the app lifespan
+async def refresh_centrality_job(db: AsyncSession):
+    service = CentralityService(db)
+    for user_id in await service.users_needing_refresh():
+        # One user's failure (their dirty set is restored for the next run) must not starve the rest
+        try:
+            await service.recompute_centrality(user_id)
+        except Exception:
+            await db.rollback()
+            logger.exception("Centrality refresh failed for user %s", user_id)
@@ -1,12 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete
+from sqlalchemy import Row, delete
 from uuid import UUID
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple, Optional
 
 from src.models.conversation import Conversation
 from src.models.chat_message import ChatMessage
-from src.schemas.chat import ConversationCreate, ChatMessageCreate
+from src.schemas.chat import ConversationCreate, ConversationResponse, ChatMessageCreate, ChatMessageResponse
+from src.core.events import ChangeEvent, change_broker
+from src.core.serialization import response_columns
+from src.database.pagination import paginate, stream_keyset, DEFAULT_PAGE_SIZE
+from src.database.repository import OwnedRepository
 from src.core.exceptions import UserNotFoundException, ConversationNotFoundException, ChatMessageNotFoundException, UnauthorizedAccessException
 
 class ConversationNotFoundException(Exception):
@@ -18,6 +22,12 @@ class ChatMessageNotFoundException(Exception):
 class ChatService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.conversations = OwnedRepository(db, Conversation)
+        # Messages carry no user_id; they are owned through their conversation
+        self.messages = OwnedRepository(
+            db, ChatMessage,
+            lambda user_id: ChatMessage.conversation_id.in_(select(Conversation.id).filter(Conversation.user_id == user_id)),
+        )
 
     # --- Conversations ---
     async def get_conversation_by_id(self, user_id: UUID, conversation_id: UUID) -> Conversation:
@@ -29,21 +39,25 @@ class ChatService:
             raise ConversationNotFoundException(f"Conversation with id {conversation_id} not found.")
         return conversation
 
-    async def get_all_conversations(self, user_id: UUID) -> List[Conversation]:
-        result = await self.db.execute(select(Conversation).filter(Conversation.user_id == user_id))
-        return result.scalars().all()
+    async def get_all_conversations(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        query = select(*response_columns(Conversation, ConversationResponse)).filter(Conversation.user_id == user_id)
+        rows, next_cursor = await paginate(self.db, query, Conversation.created_at, Conversation.id, limit, cursor)
+        # Messages are paged on their own endpoint; the list keeps the schema's empty default
+        return [{**row._asdict(), "messages": []} for row in rows], next_cursor
 
     async def create_conversation(self, user_id: UUID, conversation_data: ConversationCreate) -> Conversation:
-        new_conversation = Conversation(**conversation_data.model_dump(), user_id=user_id)
-        self.db.add(new_conversation)
-        await self.db.commit()
-        await self.db.refresh(new_conversation)
-        return new_conversation
+        return await self.conversations.insert({**conversation_data.model_dump(), "user_id": user_id})
     
     async def delete_conversation(self, user_id: UUID, conversation_id: UUID):
-        conversation = await self.get_conversation_by_id(user_id, conversation_id)
-        await self.db.delete(conversation)
-        await self.db.commit()
+        # Messages first, in the same transaction, so the conversation row has nothing pointing at it
+        await self.db.execute(
+            delete(ChatMessage)
+            .where(ChatMessage.conversation_id == conversation_id, self.messages.owner_clause(user_id))
+            .execution_options(synchronize_session=False)
+        )
+        if not await self.conversations.delete(user_id, conversation_id):
+            await self.db.rollback()
+            raise ConversationNotFoundException(f"Conversation with id {conversation_id} not found.")
 
     # --- Chat Messages ---
     async def get_message_by_id(self, user_id: UUID, message_id: UUID) -> ChatMessage:
@@ -56,24 +70,28 @@ class ChatService:
             raise ChatMessageNotFoundException(f"Chat message with id {message_id} not found.")
         return message
 
-    async def get_messages_for_conversation(self, user_id: UUID, conversation_id: UUID) -> List[ChatMessage]:
+    async def get_messages_for_conversation(self, user_id: UUID, conversation_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
         conversation = await self.get_conversation_by_id(user_id, conversation_id) # Ensures conversation belongs to user
-        result = await self.db.execute(
-            select(ChatMessage).filter(ChatMessage.conversation_id == conversation_id).order_by(ChatMessage.timestamp)
-        )
-        return result.scalars().all()
+        query = select(*response_columns(ChatMessage, ChatMessageResponse)).filter(ChatMessage.conversation_id == conversation_id)
+        # Oldest first, as before; the cursor walks forward through the transcript
+        return await paginate(self.db, query, ChatMessage.timestamp, ChatMessage.id, limit, cursor, descending=False)
+
+    async def stream_messages_for_conversation(self, user_id: UUID, conversation_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        # Ownership is checked up front, before the response starts streaming
+        await self.get_conversation_by_id(user_id, conversation_id)
+        query = select(*response_columns(ChatMessage, ChatMessageResponse)).filter(ChatMessage.conversation_id == conversation_id)
+        return stream_keyset(self.db, query, ChatMessage.timestamp, ChatMessage.id, cursor, descending=False)
 
     async def create_chat_message(self, user_id: UUID, conversation_id: UUID, message_data: ChatMessageCreate) -> ChatMessage:
         # Ensure conversation exists and belongs to user
         await self.get_conversation_by_id(user_id, conversation_id)
 
-        new_message = ChatMessage(**message_data.model_dump(), conversation_id=conversation_id)
-        self.db.add(new_message)
-        await self.db.commit()
-        await self.db.refresh(new_message)
+        new_message = await self.messages.insert({**message_data.model_dump(), "conversation_id": conversation_id})
+        change_broker.publish(user_id, ChangeEvent("chat_message", "created", new_message.id, {"conversation_id": conversation_id}))
         return new_message
     
     async def delete_chat_message(self, user_id: UUID, message_id: UUID):
-        message = await self.get_message_by_id(user_id, message_id)
-        await self.db.delete(message)
-        await self.db.commit()
+        deleted = await self.messages.delete(user_id, message_id, ChatMessage.conversation_id)
+        if not deleted:
+            raise ChatMessageNotFoundException(f"Chat message with id {message_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("chat_message", "deleted", message_id, {"conversation_id": deleted.conversation_id}))
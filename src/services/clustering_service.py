@@ -0,0 +1,143 @@
+from collections import Counter, defaultdict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from uuid import UUID
+from typing import Dict, List, Set
+
+import numpy as np
+
+from src.ai.graph_algorithms import label_propagation
+from src.ai.graph_changes import graph_changes
+from src.config.settings import settings
+from src.core.locks import KeyedLocks
+from src.database.dialect import upsert_insert
+from src.models.cluster_assignment import ClusterAssignment
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+from src.services.edge_inference_service import INFERRED_EDGE_TYPE
+
+CLUSTERS_CONSUMER = "clusters"
+graph_changes.register(CLUSTERS_CONSUMER)
+
+ASSIGNMENT_UPSERT_BATCH_SIZE = 1000
+
+# One recompute per user at a time; queued jobs find the dirty set already drained
+_recompute_locks = KeyedLocks()
+
+
+class ClusteringService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_cluster_assignments(self, user_id: UUID) -> List[ClusterAssignment]:
+        result = await self.db.execute(select(ClusterAssignment).filter(ClusterAssignment.user_id == user_id))
+        return result.scalars().all()
+
+    async def recompute_clusters(self, user_id: UUID, full: bool = False) -> int:
+        async with _recompute_locks[user_id]:
+            dirty = graph_changes.drain(CLUSTERS_CONSUMER, user_id)
+            try:
+                return await self._recompute(user_id, dirty, full)
+            except Exception:
+                graph_changes.restore(CLUSTERS_CONSUMER, user_id, dirty)
+                raise
+
+    async def _recompute(self, user_id: UUID, dirty: Set[UUID], full: bool) -> int:
+        nodes = (await self.db.execute(
+            select(GraphNode.id, GraphNode.memory_card_id, GraphNode.label, GraphNode.tags)
+            .filter(GraphNode.user_id == user_id)
+        )).all()
+        if not nodes:
+            return 0
+        previous = dict((await self.db.execute(
+            select(ClusterAssignment.node_id, ClusterAssignment.cluster_id).filter(ClusterAssignment.user_id == user_id)
+        )).all())
+        if not full and previous and not dirty and previous.keys() >= {node.id for node in nodes}:
+            return 0
+        edges = (await self.db.execute(
+            select(GraphEdge.source_node_id, GraphEdge.target_node_id, GraphEdge.type, GraphEdge.strength)
+            .filter(GraphEdge.user_id == user_id)
+        )).all()
+
+        node_ids = [node.id for node in nodes]
+        row_of = {node_id: row for row, node_id in enumerate(node_ids)}
+
+        # Label space: one label per node, plus surviving cluster ids whose seed node is gone
+        label_ids = list(node_ids)
+        label_of = dict(row_of)
+        for cluster_id in set(previous.values()):
+            if cluster_id not in label_of:
+                label_of[cluster_id] = len(label_ids)
+                label_ids.append(cluster_id)
+        labels = np.array([label_of[previous.get(node_id, node_id)] for node_id in node_ids], dtype=np.int64)
+
+        edges = [edge for edge in edges if edge.source_node_id in row_of and edge.target_node_id in row_of]
+        sources = np.array([row_of[edge.source_node_id] for edge in edges], dtype=np.int64)
+        targets = np.array([row_of[edge.target_node_id] for edge in edges], dtype=np.int64)
+        weights = np.array([
+            (edge.strength if edge.strength is not None else 1.0)
+            * (settings.CLUSTERING_INFERRED_EDGE_WEIGHT if edge.type == INFERRED_EDGE_TYPE else 1.0)
+            for edge in edges
+        ], dtype=np.float64)
+
+        if full or not previous:
+            active = np.ones(len(node_ids), dtype=bool)
+        else:
+            # Only the dirty neighbourhood and never-clustered nodes may move
+            active = np.array([node_id not in previous for node_id in node_ids], dtype=bool)
+            dirty_rows = np.array([row_of[node_id] for node_id in dirty if node_id in row_of], dtype=np.int64)
+            active[dirty_rows] = True
+            touched = np.isin(sources, dirty_rows) | np.isin(targets, dirty_rows)
+            active[sources[touched]] = True
+            active[targets[touched]] = True
+
+        # Cap the number of rounds so one recompute stays within the edge-visit budget
+        visits_per_round = max(int(np.count_nonzero(active[sources]) + np.count_nonzero(active[targets])), 1)
+        max_rounds = max(1, min(settings.CLUSTERING_MAX_ITERATIONS, settings.CLUSTERING_EDGE_VISIT_BUDGET // visits_per_round))
+        new_labels, _ = label_propagation(sources, targets, weights, labels, active, max_rounds)
+
+        touched_clusters = set(new_labels[active].tolist()) | set(labels[new_labels != labels].tolist())
+        members: Dict[int, List[int]] = defaultdict(list)
+        for row, label in enumerate(new_labels.tolist()):
+            if label in touched_clusters:
+                members[label].append(row)
+
+        degree = np.bincount(sources, weights, minlength=len(node_ids)) + np.bincount(targets, weights, minlength=len(node_ids))
+        rows = []
+        for label, member_rows in members.items():
+            tags = Counter(tag for row in member_rows for tag in (nodes[row].tags or []))
+            if tags:
+                cluster_label = tags.most_common(1)[0][0]
+            else:
+                cluster_label = nodes[max(member_rows, key=lambda row: degree[row])].label
+            rows.extend(
+                {
+                    "node_id": node_ids[row],
+                    "user_id": user_id,
+                    "memory_card_id": nodes[row].memory_card_id,
+                    "cluster_id": label_ids[label],
+                    "cluster_label": cluster_label,
+                }
+                for row in member_rows
+            )
+
+        for start in range(0, len(rows), ASSIGNMENT_UPSERT_BATCH_SIZE):
+            stmt = upsert_insert(ClusterAssignment).values(rows[start:start + ASSIGNMENT_UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ClusterAssignment.node_id],
+                set_={
+                    "memory_card_id": stmt.excluded.memory_card_id,
+                    "cluster_id": stmt.excluded.cluster_id,
+                    "cluster_label": stmt.excluded.cluster_label,
+                    "updated_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
+        await self.db.commit()
+        return len(rows)
+
+
+# Entry points for run_with_session background tasks
+async def recompute_clusters_job(db: AsyncSession, user_id: UUID, full: bool = False):
+    await ClusteringService(db).recompute_clusters(user_id, full=full)
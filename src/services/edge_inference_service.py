@@ -0,0 +1,147 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, func, or_, tuple_
+from uuid import UUID
+from typing import Dict, List, Sequence, Tuple
+
+from src.ai.graph_algorithms import knn_similarity_pairs
+from src.ai.graph_changes import graph_changes
+from src.ai.vector_index import VectorIndex, vector_index
+from src.core.events import ChangeEvent, change_broker
+from src.config.settings import settings
+from src.database.dialect import upsert_insert
+from src.models.embedding import Embedding
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+
+INFERRED_EDGE_TYPE = "inferred"
+GRAPH_NODE_NAMESPACE = "graph_node"
+
+# Rows per multi-row INSERT, well under the driver's bind parameter limit
+EDGE_INSERT_BATCH_SIZE = 1000
+
+EdgeKey = Tuple[UUID, UUID]
+
+
+def _edge_key(a: UUID, b: UUID) -> EdgeKey:
+    # Similarity is symmetric, so each pair is stored once in a canonical direction
+    return (a, b) if a < b else (b, a)
+
+
+class EdgeInferenceService:
+    def __init__(self, db: AsyncSession, index: VectorIndex = vector_index):
+        self.db = db
+        self.index = index
+
+    async def _load_node_vectors(self, user_id: UUID, node_ids: Sequence[UUID] | None = None) -> Tuple[List[UUID], List[List[float]]]:
+        query = (
+            select(GraphNode.id, Embedding.vector)
+            .join(Embedding, GraphNode.embedding_id == Embedding.id)
+            .filter(GraphNode.user_id == user_id)
+        )
+        if node_ids is not None:
+            query = query.filter(GraphNode.id.in_(node_ids))
+        rows = (await self.db.execute(query)).all()
+        return [row.id for row in rows], [row.vector for row in rows]
+
+    async def ensure_index(self, user_id: UUID):
+        if not self.index.is_loaded(user_id, GRAPH_NODE_NAMESPACE):
+            ids, vectors = await self._load_node_vectors(user_id)
+            self.index.load(user_id, GRAPH_NODE_NAMESPACE, ids, vectors)
+
+    async def _upsert_edges(self, user_id: UUID, pairs: Dict[EdgeKey, float]) -> List[UUID]:
+        rows = [
+            {
+                "user_id": user_id,
+                "source_node_id": source_id,
+                "target_node_id": target_id,
+                "type": INFERRED_EDGE_TYPE,
+                "strength": min(max(similarity, 0.0), 1.0),
+            }
+            for (source_id, target_id), similarity in pairs.items()
+        ]
+        edge_ids = []
+        for start in range(0, len(rows), EDGE_INSERT_BATCH_SIZE):
+            stmt = upsert_insert(GraphEdge).values(rows[start:start + EDGE_INSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[GraphEdge.source_node_id, GraphEdge.target_node_id],
+                index_where=GraphEdge.type == INFERRED_EDGE_TYPE,
+                set_={"strength": stmt.excluded.strength, "updated_at": func.now()},
+            )
+            result = await self.db.execute(stmt.returning(GraphEdge.id))
+            edge_ids.extend(result.scalars().all())
+        return edge_ids
+
+    async def infer_edges_for_nodes(self, user_id: UUID, node_ids: Sequence[UUID]) -> int:
+        await self.ensure_index(user_id)
+        ids, vectors = await self._load_node_vectors(user_id, node_ids)
+        if not ids:
+            return 0
+        self.index.upsert(user_id, GRAPH_NODE_NAMESPACE, ids, vectors)
+
+        pairs: Dict[EdgeKey, float] = {}
+        for node_id, vector in zip(ids, vectors):
+            neighbours = self.index.search(
+                user_id,
+                GRAPH_NODE_NAMESPACE,
+                vector,
+                k=settings.EDGE_INFERENCE_TOP_K,
+                min_similarity=settings.EDGE_INFERENCE_MIN_SIMILARITY,
+                exclude=[node_id],
+            )
+            for neighbour_id, similarity in neighbours:
+                pairs[_edge_key(node_id, neighbour_id)] = similarity
+
+        # A re-embedded node drops the similarity edges it no longer qualifies for
+        stale = delete(GraphEdge).where(
+            GraphEdge.user_id == user_id,
+            GraphEdge.type == INFERRED_EDGE_TYPE,
+            or_(GraphEdge.source_node_id.in_(ids), GraphEdge.target_node_id.in_(ids)),
+        )
+        if pairs:
+            stale = stale.where(tuple_(GraphEdge.source_node_id, GraphEdge.target_node_id).notin_(list(pairs)))
+        stale_ids = (await self.db.execute(stale.returning(GraphEdge.id))).scalars().all()
+
+        edge_ids = await self._upsert_edges(user_id, pairs)
+        await self.db.commit()
+        graph_changes.mark(user_id, [*ids, *(node_id for pair in pairs for node_id in pair)])
+        change_broker.publish(
+            user_id,
+            *(ChangeEvent("graph_edge", "deleted", edge_id) for edge_id in stale_ids),
+            *(ChangeEvent("graph_edge", "updated", edge_id) for edge_id in edge_ids),
+        )
+        return len(pairs)
+
+    async def rebuild_inferred_edges(self, user_id: UUID) -> int:
+        ids, vectors = await self._load_node_vectors(user_id)
+        self.index.load(user_id, GRAPH_NODE_NAMESPACE, ids, vectors)
+        _, matrix = self.index.snapshot(user_id, GRAPH_NODE_NAMESPACE)
+
+        rows, cols, similarities = knn_similarity_pairs(
+            matrix,
+            k=settings.EDGE_INFERENCE_TOP_K,
+            min_similarity=settings.EDGE_INFERENCE_MIN_SIMILARITY,
+            block_size=settings.EDGE_INFERENCE_BLOCK_SIZE,
+        )
+        pairs = {
+            _edge_key(ids[row], ids[col]): similarity
+            for row, col, similarity in zip(rows.tolist(), cols.tolist(), similarities.tolist())
+        }
+
+        await self.db.execute(
+            delete(GraphEdge).where(GraphEdge.user_id == user_id, GraphEdge.type == INFERRED_EDGE_TYPE)
+        )
+        await self._upsert_edges(user_id, pairs)
+        await self.db.commit()
+        graph_changes.mark(user_id, ids)
+        # Too many edges to enumerate; clients refetch the graph
+        change_broker.publish(user_id, ChangeEvent("graph", "rebuilt", user_id))
+        return len(pairs)
+
+
+# Entry points for run_with_session background tasks
+async def infer_edges_job(db: AsyncSession, user_id: UUID, node_ids: Sequence[UUID]):
+    await EdgeInferenceService(db).infer_edges_for_nodes(user_id, node_ids)
+
+async def rebuild_inferred_edges_job(db: AsyncSession, user_id: UUID):
+    await EdgeInferenceService(db).rebuild_inferred_edges(user_id)
@@ -0,0 +1,196 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from uuid import UUID
+from typing import Any, AsyncIterator, Dict, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import io
+import json
+import os
+import zipfile
+
+import pydantic_core
+
+from src.config.settings import settings
+from src.database.pagination import stream_keyset
+from src.models.attachment import Attachment
+from src.models.chat_message import ChatMessage
+from src.models.cluster_assignment import ClusterAssignment
+from src.models.conversation import Conversation
+from src.models.embedding import Embedding
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+from src.models.habit import Habit
+from src.models.habit_completion import HabitCompletion
+from src.models.memory_card import MemoryCard
+from src.models.mood_log import MoodLog
+from src.models.timeline_event import TimelineEvent
+from src.models.user import User
+from src.models.wiki_entry import WikiEntry
+
+EXPORT_FORMAT_VERSION = 1
+FILE_CHUNK_SIZE = 1024 * 1024 # Bytes read from an attachment per thread hop
+
+# One <table>.ndjson per model; parents come before the rows that reference them
+EXPORT_TABLES = (
+    MemoryCard,
+    Attachment,
+    Embedding,
+    GraphNode,
+    GraphEdge,
+    ClusterAssignment,
+    Conversation,
+    ChatMessage,
+    MoodLog,
+    TimelineEvent,
+    WikiEntry,
+    Habit,
+    HabitCompletion,
+)
+
+
+class _ArchiveBuffer(io.RawIOBase):
+    # Write-only and unseekable, so zipfile streams each entry with a data descriptor
+    # instead of seeking back to patch its header. The export drains it after every
+    # write, which keeps at most one batch of archive bytes in memory.
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _file_entry(path: str, name: str, modified: datetime):
+    source = open(path, "rb")
+    info = zipfile.ZipInfo(name, modified.timetuple()[:6])
+    # Media is already compressed; storing it costs no CPU
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = os.fstat(source.fileno()).st_size
+    return source, info
+
+
+class ExportService:
+    """Streams a user's whole account as a zip archive.
+
+    The archive holds `user.json`, one NDJSON file per table (rows exactly as
+    stored, one object per line), the attachment files under `files/` and a
+    closing `manifest.json` with row counts. Every table is read through a
+    server-side cursor in STREAM_BATCH_SIZE batches, and archive bytes are
+    handed to the caller after each batch, so memory stays flat however big
+    the account is. With `since`, only rows created or updated at or after
+    that time are included; the manifest's `next_since` is the `since` to
+    pass for the next incremental run.
+
+    Rows are stamped with the database time their transaction started, so
+    a row can commit after the export has read its table yet carry a time
+    before `exported_at`. `next_since` therefore reaches back
+    EXPORT_SINCE_OVERLAP_SECONDS: consecutive incremental archives may
+    repeat a row, and a restore applies them in order, keeping the last
+    copy of each id.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def export_archive(self, user_id: UUID, since: Optional[datetime] = None) -> AsyncIterator[bytes]:
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # Database time, like the updated_at it is compared with, and taken before the first read
+        exported_at = await self.db.scalar(select(func.now()))
+        if exported_at.tzinfo is None:
+            exported_at = exported_at.replace(tzinfo=timezone.utc) # SQLite: naive UTC
+        manifest: Dict[str, Any] = {
+            "format_version": EXPORT_FORMAT_VERSION,
+            "user_id": user_id,
+            "exported_at": exported_at,
+            "next_since": exported_at - timedelta(seconds=settings.EXPORT_SINCE_OVERLAP_SECONDS),
+            "since": since,
+            "tables": {},
+            "files": 0,
+            "file_bytes": 0,
+            "missing_files": [],
+        }
+
+        buffer = _ArchiveBuffer()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            profile = (await self.db.execute(
+                select(User.id, User.username, User.email, User.created_at, User.updated_at).filter(User.id == user_id)
+            )).one()
+            archive.writestr("user.json", pydantic_core.to_json(profile._asdict(), indent=2))
+
+            for model in EXPORT_TABLES:
+                count = 0
+                # Size unknown up front, so always leave room for entries over 4 GB
+                with archive.open(f"{model.__tablename__}.ndjson", "w", force_zip64=True) as entry:
+                    async for batch in self._stream_table(user_id, model, since):
+                        payload = b"".join(pydantic_core.to_json(row._asdict()) + b"\n" for row in batch)
+                        # Deflating a batch of embedding vectors takes long enough to stall the loop
+                        await asyncio.to_thread(entry.write, payload)
+                        count += len(batch)
+                        chunk = buffer.drain()
+                        if chunk:
+                            yield chunk
+                manifest["tables"][model.__tablename__] = count
+
+            async for chunk in self._write_files(archive, buffer, user_id, since, manifest):
+                yield chunk
+
+            archive.writestr("manifest.json", pydantic_core.to_json(manifest, indent=2))
+        yield buffer.drain()
+
+    def _stream_table(self, user_id: UUID, model, since: Optional[datetime]) -> AsyncIterator:
+        table = model.__table__
+        changed = table.c.updated_at if "updated_at" in table.c else table.c.created_at
+        sort_column = table.c.created_at if "created_at" in table.c else changed
+        (id_column,) = table.primary_key.columns
+
+        query = select(*table.columns)
+        if model is ChatMessage:
+            query = query.filter(ChatMessage.conversation_id.in_(select(Conversation.id).filter(Conversation.user_id == user_id)))
+        else:
+            query = query.filter(table.c.user_id == user_id)
+        if since is not None:
+            query = query.filter(changed >= since)
+        return stream_keyset(self.db, query, sort_column, id_column, descending=False)
+
+    async def _write_files(self, archive: zipfile.ZipFile, buffer: _ArchiveBuffer, user_id: UUID, since: Optional[datetime], manifest: Dict[str, Any]) -> AsyncIterator[bytes]:
+        # Stored as files/<attachment id><extension>, for the attachments in this export
+        query = select(Attachment.id, Attachment.file_url, Attachment.updated_at).filter(Attachment.user_id == user_id)
+        if since is not None:
+            query = query.filter(Attachment.updated_at >= since)
+
+        async for batch in stream_keyset(self.db, query, Attachment.created_at, Attachment.id, descending=False):
+            for row in batch:
+                name = f"files/{row.id}{os.path.splitext(row.file_url)[1]}"
+                try:
+                    source, info = await asyncio.to_thread(_file_entry, row.file_url, name, row.updated_at or manifest["exported_at"])
+                except FileNotFoundError:
+                    manifest["missing_files"].append(row.id)
+                    continue
+                try:
+                    with archive.open(info, "w") as entry:
+                        while data := await asyncio.to_thread(source.read, FILE_CHUNK_SIZE):
+                            entry.write(data)
+                            yield buffer.drain()
+                finally:
+                    source.close()
+                manifest["files"] += 1
+                manifest["file_bytes"] += info.file_size
+
+
+def read_manifest(archive_path: str) -> Dict[str, Any]:
+    # The manifest of a previous export, e.g. to take its next_since as the next `since`
+    with zipfile.ZipFile(archive_path) as archive:
+        return json.loads(archive.read("manifest.json"))
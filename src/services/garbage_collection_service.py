@@ -0,0 +1,225 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, insert, exists
+from uuid import UUID
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+import os
+
+from src.config.settings import settings
+from src.models.attachment import Attachment
+from src.models.chat_message import ChatMessage
+from src.models.deleted_file import DeletedFile
+from src.models.embedding import Embedding
+from src.models.graph_node import GraphNode
+from src.models.memory_card import MemoryCard
+from src.models.wiki_entry import WikiEntry
+
+logger = logging.getLogger(__name__)
+
+# Embedding.source_type -> primary key of the table its source_id points into
+EMBEDDING_SOURCES = {
+    "memory_card": MemoryCard.id,
+    "graph_node": GraphNode.id,
+    "chat_message": ChatMessage.id,
+}
+# Foreign keys into embeddings; a referenced embedding is never collected
+EMBEDDING_REFERENCES = (MemoryCard.embedding_id, GraphNode.embedding_id, WikiEntry.embedding_id)
+
+
+@dataclass
+class GarbageCollectionReport:
+    files: int = 0 # Tombstoned and stray files unlinked
+    bytes: int = 0 # Disk space those files actually freed
+    tombstones: int = 0
+    embeddings: int = 0
+
+    def add(self, other: "GarbageCollectionReport"):
+        for field, value in asdict(other).items():
+            setattr(self, field, getattr(self, field) + value)
+
+
+class GarbageCollectionStats:
+    # Totals since process start, served at /metrics/gc
+
+    def __init__(self):
+        self.runs = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run = GarbageCollectionReport()
+        self.total = GarbageCollectionReport()
+
+    def record(self, report: GarbageCollectionReport):
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_run = report
+        self.total.add(report)
+
+    def snapshot(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_run_at": self.last_run_at,
+            "last_run": asdict(self.last_run),
+            "total": asdict(self.total),
+        }
+
+
+gc_stats = GarbageCollectionStats()
+
+
+async def defer_file_deletion(db: AsyncSession, user_id: UUID, files: Iterable[Any]):
+    # Records tombstones for (file_url, size) rows deleted in the caller's transaction, so the
+    # files outlive their rows only until the next collection and a rollback keeps them both
+    tombstones = [{"user_id": user_id, "path": file.file_url, "size": file.size} for file in files]
+    if tombstones:
+        await db.execute(insert(DeletedFile), tombstones)
+
+
+def _unlink_files(paths: Sequence[str]) -> int:
+    freed = 0
+    for path in paths:
+        try:
+            size = os.stat(path).st_size
+            os.remove(path)
+        except FileNotFoundError:
+            continue # Already gone, e.g. collected by another worker
+        freed += size
+    return freed
+
+
+def _stray_candidates(directory: str, cutoff: float) -> List[str]:
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return []
+    return [entry.name for entry in entries if entry.is_file() and entry.stat().st_mtime < cutoff]
+
+
+def _user_directories(media_path: str) -> List[UUID]:
+    user_ids = []
+    try:
+        entries = list(os.scandir(media_path))
+    except FileNotFoundError:
+        return user_ids
+    for entry in entries:
+        try:
+            user_ids.append(UUID(entry.name))
+        except ValueError:
+            continue
+    return user_ids
+
+
+class GarbageCollectionService:
+    """Reclaims what deletes leave behind, off the request path.
+
+    Deleting cards, attachments and graph nodes removes the rows users can
+    see and tombstones their files in `deleted_files`; embeddings are left
+    in place, since finding them by source id scans the whole table. This
+    collector then, in transactions of at most GC_BATCH_SIZE:
+    unlinks tombstoned files, deletes embeddings whose source row is gone
+    (anti-joins per source type, skipping anything still referenced), and unlinks files in
+    users' attachment directories that no attachment row names. Unreferenced
+    rows and files younger than GC_GRACE_SECONDS are left alone, as they may
+    belong to a write still in progress. All file I/O runs in worker threads.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def collect(self) -> GarbageCollectionReport:
+        report = GarbageCollectionReport()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.GC_GRACE_SECONDS)
+        await self._collect_tombstoned_files(report)
+        await self._collect_orphaned_embeddings(report, cutoff)
+        await self._collect_stray_files(report, cutoff)
+        return report
+
+    async def _collect_tombstoned_files(self, report: GarbageCollectionReport):
+        while True:
+            rows = (await self.db.execute(
+                select(DeletedFile.id, DeletedFile.path)
+                .order_by(DeletedFile.deleted_at)
+                .limit(settings.GC_BATCH_SIZE)
+            )).all()
+            if not rows:
+                return
+            # Unlinked before the tombstones go, so a crash in between only repeats work
+            report.bytes += await asyncio.to_thread(_unlink_files, [row.path for row in rows])
+            await self.db.execute(
+                delete(DeletedFile)
+                .where(DeletedFile.id.in_([row.id for row in rows]))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+            report.files += len(rows)
+            report.tombstones += len(rows)
+            if len(rows) < settings.GC_BATCH_SIZE:
+                return
+
+    def _orphaned_embeddings(self, source_type: str, source_id, cutoff: datetime, after: Optional[UUID]):
+        # One source table per query and only AND-ed NOT EXISTS, which the planner runs as anti-joins
+        # against the source primary key and the indexed embedding_id references
+        query = (
+            select(Embedding.id)
+            .where(
+                Embedding.source_type == source_type,
+                Embedding.created_at < cutoff,
+                ~exists().where(source_id == Embedding.source_id),
+                *(~exists().where(reference == Embedding.id) for reference in EMBEDDING_REFERENCES),
+            )
+            .order_by(Embedding.id)
+            .limit(settings.GC_BATCH_SIZE)
+        )
+        if after is not None:
+            query = query.where(Embedding.id > after)
+        return query
+
+    async def _collect_orphaned_embeddings(self, report: GarbageCollectionReport, cutoff: datetime):
+        for source_type, source_id in EMBEDDING_SOURCES.items():
+            # Keyset on id, so each batch starts where the last one stopped instead of rescanning
+            after = None
+            while True:
+                ids = (await self.db.execute(self._orphaned_embeddings(source_type, source_id, cutoff, after))).scalars().all()
+                if not ids:
+                    break
+                await self.db.execute(
+                    delete(Embedding)
+                    .where(Embedding.id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+                await self.db.commit()
+                report.embeddings += len(ids)
+                if len(ids) < settings.GC_BATCH_SIZE:
+                    break
+                after = ids[-1]
+
+    async def _collect_stray_files(self, report: GarbageCollectionReport, cutoff: datetime):
+        # Matched by file name, which is unique per stored file, so a moved MEDIA_PATH can't
+        # make every file look unreferenced
+        for user_id in await asyncio.to_thread(_user_directories, settings.MEDIA_PATH):
+            directory = os.path.join(settings.MEDIA_PATH, str(user_id), "attachments")
+            names = await asyncio.to_thread(_stray_candidates, directory, cutoff.timestamp())
+            if not names:
+                continue
+            stored = (await self.db.execute(
+                select(Attachment.file_url).filter(Attachment.user_id == user_id)
+            )).scalars().all()
+            known = {os.path.basename(file_url) for file_url in stored}
+            stray = [os.path.join(directory, name) for name in names if name not in known]
+            for start in range(0, len(stray), settings.GC_BATCH_SIZE):
+                batch = stray[start:start + settings.GC_BATCH_SIZE]
+                report.bytes += await asyncio.to_thread(_unlink_files, batch)
+                report.files += len(batch)
+
+
+# Entry point for run_periodically
+async def collect_garbage_job(db: AsyncSession):
+    report = await GarbageCollectionService(db).collect()
+    gc_stats.record(report)
+    if report.files or report.embeddings:
+        logger.info(
+            "Garbage collection freed %d bytes: %d files (%d tombstones), %d embeddings",
+            report.bytes, report.files, report.tombstones, report.embeddings,
+        )
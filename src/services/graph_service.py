@@ -1,12 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete
-from uuid import UUID
-from typing import List
+from sqlalchemy import Row, Select, delete, insert
+from uuid import UUID, uuid4
+from typing import AsyncIterator, List, Dict, Sequence, Tuple, Optional
 
 from src.models.graph_node import GraphNode
 from src.models.graph_edge import GraphEdge
-from src.schemas.graph import GraphNodeCreate, GraphNodeUpdate, GraphEdgeCreate, GraphEdgeUpdate
+from src.ai.graph_changes import graph_changes
+from src.database.connection import pin_to_primary
+from src.database.pagination import paginate, stream_keyset, DEFAULT_PAGE_SIZE
+from src.database.repository import OwnedRepository
+from src.core.events import ChangeEvent, change_broker
+from src.core.serialization import response_columns
+from src.services.cascade_delete_service import CascadeDeleteService
+from src.schemas.graph import GraphNodeCreate, GraphNodeUpdate, GraphNodeResponse, GraphEdgeCreate, GraphEdgeUpdate, GraphEdgeResponse, GraphBatchRequest, GraphBatchResponse
+from src.core.exceptions import InvalidGraphBatchException
 from src.core.exceptions import UserNotFoundException, MemoryCardNotFoundException, UnauthorizedAccessException, AttachmentNotFoundException # Added exceptions for clarity
 from src.core.exceptions import MemoryCardNotFoundException, UnauthorizedAccessException # Corrected to existing exceptions
 from src.core.exceptions import MemoryCardNotFoundException, UnauthorizedAccessException # Corrected again
@@ -22,6 +30,8 @@ class GraphEdgeNotFoundException(Exception):
 class GraphService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.nodes = OwnedRepository(db, GraphNode)
+        self.edges = OwnedRepository(db, GraphEdge)
 
     # --- Graph Nodes ---
     async def get_node_by_id(self, user_id: UUID, node_id: UUID) -> GraphNode:
@@ -33,32 +43,35 @@ class GraphService:
             raise GraphNodeNotFoundException(f"GraphNode with id {node_id} not found.")
         return node
 
-    async def get_all_nodes(self, user_id: UUID) -> List[GraphNode]:
-        result = await self.db.execute(select(GraphNode).filter(GraphNode.user_id == user_id))
-        return result.scalars().all()
+    def _nodes_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(GraphNode, GraphNodeResponse)).filter(GraphNode.user_id == user_id)
+
+    async def get_all_nodes(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._nodes_query(user_id), GraphNode.created_at, GraphNode.id, limit, cursor)
+
+    def stream_all_nodes(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._nodes_query(user_id), GraphNode.created_at, GraphNode.id, cursor)
 
     async def create_node(self, user_id: UUID, node_data: GraphNodeCreate) -> GraphNode:
-        new_node = GraphNode(**node_data.model_dump(), user_id=user_id)
-        self.db.add(new_node)
-        await self.db.commit()
-        await self.db.refresh(new_node)
+        new_node = await self.nodes.insert({**node_data.model_dump(), "user_id": user_id})
+        graph_changes.mark(user_id, [new_node.id])
+        change_broker.publish(user_id, ChangeEvent("graph_node", "created", new_node.id))
         return new_node
 
     async def update_node(self, user_id: UUID, node_id: UUID, node_data: GraphNodeUpdate) -> GraphNode:
-        node = await self.get_node_by_id(user_id, node_id)
-        
-        update_data = node_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(node, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(node)
+        node = await self.nodes.update(user_id, node_id, node_data.model_dump(exclude_unset=True))
+        if not node:
+            raise GraphNodeNotFoundException(f"GraphNode with id {node_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("graph_node", "updated", node.id))
         return node
 
     async def delete_node(self, user_id: UUID, node_id: UUID):
-        node = await self.get_node_by_id(user_id, node_id)
-        await self.db.delete(node)
-        await self.db.commit()
+        # Edges, cluster assignment and the node's embedding go with it
+        if not await CascadeDeleteService(self.db).delete_graph_nodes(user_id, [node_id]):
+            raise GraphNodeNotFoundException(f"GraphNode with id {node_id} not found.")
+
+    async def delete_nodes(self, user_id: UUID, node_ids: List[UUID]) -> int:
+        return await CascadeDeleteService(self.db).delete_graph_nodes(user_id, node_ids)
 
     # --- Graph Edges ---
     async def get_edge_by_id(self, user_id: UUID, edge_id: UUID) -> GraphEdge:
@@ -70,33 +83,95 @@ class GraphService:
             raise GraphEdgeNotFoundException(f"GraphEdge with id {edge_id} not found.")
         return edge
 
-    async def get_all_edges(self, user_id: UUID) -> List[GraphEdge]:
-        result = await self.db.execute(select(GraphEdge).filter(GraphEdge.user_id == user_id))
-        return result.scalars().all()
+    def _edges_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(GraphEdge, GraphEdgeResponse)).filter(GraphEdge.user_id == user_id)
+
+    async def get_all_edges(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._edges_query(user_id), GraphEdge.created_at, GraphEdge.id, limit, cursor)
+
+    def stream_all_edges(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._edges_query(user_id), GraphEdge.created_at, GraphEdge.id, cursor)
 
     async def create_edge(self, user_id: UUID, edge_data: GraphEdgeCreate) -> GraphEdge:
         # Ensure both source and target nodes exist and belong to the user
         await self.get_node_by_id(user_id, edge_data.source_node_id)
         await self.get_node_by_id(user_id, edge_data.target_node_id)
 
-        new_edge = GraphEdge(**edge_data.model_dump(), user_id=user_id)
-        self.db.add(new_edge)
-        await self.db.commit()
-        await self.db.refresh(new_edge)
+        new_edge = await self.edges.insert({**edge_data.model_dump(), "user_id": user_id})
+        graph_changes.mark(user_id, [new_edge.source_node_id, new_edge.target_node_id])
+        change_broker.publish(user_id, ChangeEvent("graph_edge", "created", new_edge.id))
         return new_edge
 
     async def update_edge(self, user_id: UUID, edge_id: UUID, edge_data: GraphEdgeUpdate) -> GraphEdge:
-        edge = await self.get_edge_by_id(user_id, edge_id)
-        
-        update_data = edge_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(edge, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(edge)
+        edge = await self.edges.update(user_id, edge_id, edge_data.model_dump(exclude_unset=True))
+        if not edge:
+            raise GraphEdgeNotFoundException(f"GraphEdge with id {edge_id} not found.")
+        graph_changes.mark(user_id, [edge.source_node_id, edge.target_node_id])
+        change_broker.publish(user_id, ChangeEvent("graph_edge", "updated", edge.id))
         return edge
 
     async def delete_edge(self, user_id: UUID, edge_id: UUID):
-        edge = await self.get_edge_by_id(user_id, edge_id)
-        await self.db.delete(edge)
+        edge = await self.edges.delete(user_id, edge_id, GraphEdge.source_node_id, GraphEdge.target_node_id)
+        if not edge:
+            raise GraphEdgeNotFoundException(f"GraphEdge with id {edge_id} not found.")
+        graph_changes.mark(user_id, [edge.source_node_id, edge.target_node_id])
+        change_broker.publish(user_id, ChangeEvent("graph_edge", "deleted", edge_id))
+
+    # --- Batch mutations ---
+    async def apply_batch(self, user_id: UUID, batch: GraphBatchRequest) -> GraphBatchResponse:
+        # Node ids are generated up front so edges can point at nodes from the same batch
+        temp_ids: Dict[str, UUID] = {}
+        node_rows = []
+        for node_data in batch.nodes:
+            node_id = uuid4()
+            if node_data.temp_id is not None:
+                if node_data.temp_id in temp_ids:
+                    raise InvalidGraphBatchException(f"Duplicate temp_id {node_data.temp_id!r}")
+                temp_ids[node_data.temp_id] = node_id
+            node_rows.append({**node_data.model_dump(exclude={"temp_id"}), "id": node_id, "user_id": user_id})
+
+        existing_ids = set()
+        edge_rows = []
+        for edge_data in batch.edges:
+            endpoints = []
+            for ref in (edge_data.source, edge_data.target):
+                if ref in temp_ids:
+                    endpoints.append(temp_ids[ref])
+                    continue
+                try:
+                    node_id = UUID(ref)
+                except ValueError:
+                    raise InvalidGraphBatchException(f"Unknown node reference {ref!r}")
+                existing_ids.add(node_id)
+                endpoints.append(node_id)
+            edge_rows.append({
+                "user_id": user_id,
+                "source_node_id": endpoints[0],
+                "target_node_id": endpoints[1],
+                "type": edge_data.type,
+                "strength": edge_data.strength,
+            })
+
+        # One set-based ownership check for every pre-existing node the edges touch
+        if existing_ids:
+            # Decides what gets written, so read from the primary: a node created moments ago may
+            # still be missing on a lagging replica
+            pin_to_primary(self.db)
+            result = await self.db.execute(
+                select(GraphNode.id).filter(GraphNode.id.in_(existing_ids), GraphNode.user_id == user_id)
+            )
+            missing = existing_ids - set(result.scalars().all())
+            if missing:
+                raise GraphNodeNotFoundException(f"GraphNodes not found: {', '.join(sorted(map(str, missing)))}")
+
+        nodes = (await self.db.scalars(insert(GraphNode).returning(GraphNode), node_rows)).all() if node_rows else []
+        edges = (await self.db.scalars(insert(GraphEdge).returning(GraphEdge), edge_rows)).all() if edge_rows else []
         await self.db.commit()
+
+        graph_changes.mark(user_id, [row["id"] for row in node_rows] + list(existing_ids))
+        change_broker.publish(
+            user_id,
+            *(ChangeEvent("graph_node", "created", node.id) for node in nodes),
+            *(ChangeEvent("graph_edge", "created", edge.id) for edge in edges),
+        )
+        return GraphBatchResponse(nodes=nodes, edges=edges, temp_ids=temp_ids)
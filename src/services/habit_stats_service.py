@@ -0,0 +1,196 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import Row, and_, insert, update, func
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
+from collections import defaultdict
+
+import numpy as np
+
+from src.config.settings import settings
+from src.core.serialization import response_columns
+from src.models.habit import Habit
+from src.models.habit_completion import HabitCompletion
+from src.schemas.life_os import HabitResponse
+
+RECENT_PERIODS = 12 # Period totals returned per habit, the current period last
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _utc_naive(timestamp: datetime) -> datetime:
+    # SQLite hands back naive timestamps, which are already UTC
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _period_index(frequency: str, days: np.ndarray) -> np.ndarray:
+    # UTC day numbers -> consecutive period numbers, so a streak is a run of consecutive integers
+    if frequency == "weekly":
+        return (days + 3) // 7 # Weeks start on Monday; the epoch was a Thursday
+    if frequency == "monthly":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return days
+
+
+def _period_start(frequency: str, index: int) -> date:
+    if frequency == "weekly":
+        return (_EPOCH + np.timedelta64(index * 7 - 3, "D")).item()
+    if frequency == "monthly":
+        return np.datetime64(index, "M").astype("datetime64[D]").item()
+    return (_EPOCH + np.timedelta64(index, "D")).item()
+
+
+def habit_stats(
+    frequency: str,
+    target_value: Optional[float],
+    completed_at: Sequence[datetime],
+    values: Sequence[float],
+    today: date,
+) -> Dict[str, Any]:
+    """Streaks, period totals and a daily heatmap from one habit's completions.
+
+    A period (UTC day, Monday-based week or month, after `frequency`) counts
+    towards a streak when its total reaches `target_value`, or has any
+    completion when there is no target. The current period is still open,
+    so an unmet one doesn't break the streak that ended just before it.
+    """
+    days = np.array([_utc_naive(timestamp) for timestamp in completed_at], dtype="datetime64[D]").astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    today_day = int((np.datetime64(today, "D") - _EPOCH).astype(np.int64))
+    keep = days <= today_day # Ignore anything stamped ahead of the server clock
+    days, values = days[keep], values[keep]
+
+    periods = _period_index(frequency, days)
+    current = int(_period_index(frequency, np.array([today_day]))[0])
+    first = min(int(periods.min()) if periods.size else current, current - RECENT_PERIODS + 1)
+    totals = np.bincount(periods - first, weights=values, minlength=current - first + 1)
+    met = totals >= target_value if target_value else totals > 0
+
+    end = len(met) - 1 if met[-1] else len(met) - 2
+    misses = np.flatnonzero(~met[:end + 1])
+    current_streak = end - int(misses[-1]) if misses.size else end + 1
+    edges = np.diff(np.concatenate(([0], met.astype(np.int8), [0])))
+    runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+    heatmap_start = today_day - settings.HABIT_HEATMAP_DAYS + 1
+    in_heatmap = days >= heatmap_start
+    heatmap = np.bincount(days[in_heatmap] - heatmap_start, weights=values[in_heatmap], minlength=settings.HABIT_HEATMAP_DAYS)
+
+    recent = range(len(totals) - RECENT_PERIODS, len(totals))
+    return {
+        "current_value": float(totals[-1]),
+        "streak_count": current_streak,
+        "longest_streak": int(runs.max()) if runs.size else 0,
+        "completions": int(days.size),
+        "periods": [
+            {"period_start": _period_start(frequency, first + i), "total": float(totals[i]), "met": bool(met[i])}
+            for i in recent
+        ],
+        "heatmap_start": _period_start("daily", heatmap_start),
+        "heatmap": heatmap.tolist(),
+    }
+
+
+class HabitStatsService:
+    """Habit progress derived from the habit_completions event log.
+
+    Each completion is one row; streaks, per-period totals and the daily
+    heatmap are recomputed from a habit's last HABIT_STATS_LOOKBACK_DAYS of
+    completions with a handful of numpy array operations, so they reset per
+    `frequency` and survive edits to the habit. A completion also writes the
+    fresh current-period total and streak back to the habit row, but reads
+    never trust those: a period can end or a streak break without any write,
+    so every habit response recomputes them as of today.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _lookback_start(self, today: date) -> datetime:
+        return datetime.combine(today - timedelta(days=settings.HABIT_STATS_LOOKBACK_DAYS), datetime.min.time(), timezone.utc)
+
+    async def record_completion(self, user_id: UUID, habit_id: UUID, value: float = 1.0) -> Optional[Habit]:
+        """Logs a completion and refreshes the habit's counters; the caller commits."""
+        # Row lock, so concurrent completions of one habit each see the other's event
+        habit = (await self.db.execute(
+            select(Habit.frequency, Habit.target_value)
+            .filter(Habit.id == habit_id, Habit.user_id == user_id)
+            .with_for_update()
+        )).first()
+        if habit is None:
+            return None
+        await self.db.execute(insert(HabitCompletion).values(user_id=user_id, habit_id=habit_id, value=value))
+
+        today = datetime.now(timezone.utc).date()
+        history = (await self.db.execute(
+            select(HabitCompletion.completed_at, HabitCompletion.value)
+            .filter(HabitCompletion.habit_id == habit_id, HabitCompletion.completed_at >= self._lookback_start(today))
+        )).all()
+        stats = habit_stats(habit.frequency, habit.target_value, [row.completed_at for row in history], [row.value for row in history], today)
+        return await self.db.scalar(
+            update(Habit)
+            .where(Habit.id == habit_id)
+            .values(current_value=stats["current_value"], streak_count=stats["streak_count"], last_completed=func.now())
+            .returning(Habit)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+
+    async def with_current_stats(self, habits: Sequence[Row]) -> List[Dict[str, Any]]:
+        """The habit rows as dicts, with current_value and streak_count recomputed as of today."""
+        if not habits:
+            return []
+        today = datetime.now(timezone.utc).date()
+        history: Dict[UUID, List[Row]] = defaultdict(list)
+        for row in (await self.db.execute(
+            select(HabitCompletion.habit_id, HabitCompletion.completed_at, HabitCompletion.value)
+            .filter(
+                HabitCompletion.habit_id.in_([habit.id for habit in habits]),
+                HabitCompletion.completed_at >= self._lookback_start(today),
+            )
+        )).all():
+            history[row.habit_id].append(row)
+
+        result = []
+        for habit in habits:
+            habit = habit._asdict()
+            completed = history.get(habit["id"], [])
+            stats = habit_stats(
+                habit["frequency"],
+                habit["target_value"],
+                [row.completed_at for row in completed],
+                [row.value for row in completed],
+                today,
+            )
+            result.append({**habit, "current_value": stats["current_value"], "streak_count": stats["streak_count"]})
+        return result
+
+    async def get_habit_summaries(self, user_id: UUID) -> List[Dict[str, Any]]:
+        today = datetime.now(timezone.utc).date()
+        # Habits outer-joined to their recent completions: one round trip however many habits there are
+        rows = (await self.db.execute(
+            select(*response_columns(Habit, HabitResponse), HabitCompletion.completed_at, HabitCompletion.value.label("completion_value"))
+            .outerjoin(HabitCompletion, and_(
+                HabitCompletion.habit_id == Habit.id,
+                HabitCompletion.completed_at >= self._lookback_start(today),
+            ))
+            .filter(Habit.user_id == user_id)
+            .order_by(Habit.created_at, Habit.id)
+        )).all()
+
+        return [self._summary(list(habit_rows), today) for _, habit_rows in groupby(rows, key=lambda row: row.id)]
+
+    def _summary(self, rows: Sequence[Row], today: date) -> Dict[str, Any]:
+        habit = rows[0]._asdict()
+        completed = [row for row in rows if row.completed_at is not None]
+        stats = habit_stats(
+            habit["frequency"],
+            habit["target_value"],
+            [row.completed_at for row in completed],
+            [row.completion_value for row in completed],
+            today,
+        )
+        del habit["completed_at"], habit["completion_value"]
+        return {**habit, **stats}
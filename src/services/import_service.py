@@ -0,0 +1,362 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import Row, insert, update, func
+from sqlalchemy.exc import DBAPIError
+from uuid import UUID, uuid4
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import json
+import mimetypes
+import os
+import shutil
+import zipfile
+
+from pydantic import ValidationError
+
+from src.ai.graph_changes import graph_changes
+from src.config.settings import settings
+from src.core.events import ChangeEvent, change_broker
+from src.core.exceptions import ImportJobNotFoundException, ImportTooLargeException
+from src.core.serialization import response_columns
+from src.database.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.database.repository import OwnedRepository
+from src.models.attachment import Attachment
+from src.models.embedding import Embedding
+from src.models.graph_edge import GraphEdge
+from src.models.graph_node import GraphNode
+from src.models.import_job import ImportJob
+from src.models.memory_card import MemoryCard
+from src.schemas.import_job import ImportJobResponse, ImportRecord
+from src.services.ai_pipeline_service import AiPipelineService
+from src.services.clustering_service import ClusteringService
+from src.services.edge_inference_service import EdgeInferenceService
+
+CHUNK_EDGE_TYPE = "chunk_of"
+
+# (source file, line number, decoded JSON or the reason it could not be decoded)
+ParsedLine = Tuple[Optional[str], int, Any]
+
+
+def _ndjson_lines(source: Optional[str], stream) -> Iterator[ParsedLine]:
+    for line_no, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            yield source, line_no, json.loads(raw)
+        except ValueError as exc:
+            yield source, line_no, ValueError(f"Invalid JSON: {exc}")
+
+
+def _chunk_text(text: str, size: int) -> List[str]:
+    # Pack whole paragraphs up to `size` characters; a paragraph longer than that is cut hard
+    chunks, current = [], ""
+    for paragraph in text.split("\n\n"):
+        while len(paragraph) > size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:size])
+            paragraph = paragraph[size:]
+        if current and len(current) + len(paragraph) + 2 > size:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def _extract_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, file_path: str):
+    with archive.open(info) as source, open(file_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer)
+
+
+class ImportService:
+    """Bulk creation of memory cards from an uploaded NDJSON file or zip archive.
+
+    Uploads are spooled to disk and processed by a background job in two
+    phases: cards (and their attachment files) go in with multi-row INSERTs,
+    IMPORT_BATCH_SIZE per transaction; then embeddings, graph nodes and
+    chunk nodes are built IMPORT_ENRICH_BATCH_SIZE cards at a time, followed
+    by edge inference for each batch and one clustering pass at the end.
+    Progress counters are committed with every batch, so the job resource
+    always reflects what is durably in the database.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.jobs = OwnedRepository(db, ImportJob)
+        self._errors: List[Dict[str, Any]] = []
+        self._extracted_bytes = 0
+
+    async def get_job(self, user_id: UUID, job_id: UUID) -> ImportJob:
+        job = await self.jobs.get(user_id, job_id)
+        if not job:
+            raise ImportJobNotFoundException()
+        return job
+
+    async def get_all_jobs(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        query = select(*response_columns(ImportJob, ImportJobResponse)).filter(ImportJob.user_id == user_id)
+        return await paginate(self.db, query, ImportJob.created_at, ImportJob.id, limit, cursor)
+
+    async def create_job(self, user_id: UUID, chunks: AsyncIterator[bytes], filename: Optional[str] = None) -> ImportJob:
+        job_id = uuid4()
+        import_dir = os.path.join(settings.MEDIA_PATH, str(user_id), "imports")
+        os.makedirs(import_dir, exist_ok=True)
+        upload_path = os.path.join(import_dir, f"{job_id}.upload")
+
+        # Written as it arrives, so the upload never sits in memory
+        max_bytes = settings.IMPORT_MAX_UPLOAD_MB * 1024 * 1024
+        size = 0
+        try:
+            with open(upload_path, "wb") as buffer:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ImportTooLargeException(f"Import uploads are limited to {settings.IMPORT_MAX_UPLOAD_MB} MB")
+                    buffer.write(chunk)
+        except BaseException:
+            os.remove(upload_path)
+            raise
+
+        return await self.jobs.insert({
+            "id": job_id,
+            "user_id": user_id,
+            "status": "pending",
+            "source_filename": filename,
+            "upload_path": upload_path,
+            "errors": [],
+        })
+
+    async def run_import(self, user_id: UUID, job_id: UUID):
+        job = await self.get_job(user_id, job_id)
+        upload_path = job.upload_path
+        self._errors = list(job.errors or [])
+        try:
+            archive = zipfile.ZipFile(upload_path) if zipfile.is_zipfile(upload_path) else None
+            try:
+                card_ids = await self._import_cards(user_id, job_id, archive, upload_path)
+            finally:
+                if archive is not None:
+                    archive.close()
+            await self._enrich(user_id, job_id, card_ids)
+            await self._finish(user_id, job_id, "completed")
+        except Exception as exc:
+            await self.db.rollback()
+            self._report(None, 0, f"Import aborted: {exc}")
+            await self._finish(user_id, job_id, "failed")
+            raise
+        finally:
+            if os.path.exists(upload_path):
+                os.remove(upload_path)
+
+    # --- Phase 1: cards ---
+    def _records(self, upload_path: str, archive: Optional[zipfile.ZipFile]) -> Iterator[ParsedLine]:
+        if archive is None:
+            with open(upload_path, "rb") as stream:
+                yield from _ndjson_lines(None, stream)
+            return
+        # Every .ndjson file in the archive, in name order; other members are attachment blobs
+        for name in sorted(name for name in archive.namelist() if name.endswith(".ndjson")):
+            with archive.open(name) as stream:
+                yield from _ndjson_lines(name, stream)
+
+    async def _import_cards(self, user_id: UUID, job_id: UUID, archive: Optional[zipfile.ZipFile], upload_path: str) -> List[UUID]:
+        await self._update_job(job_id, status="importing")
+        await self.db.commit()
+        self._publish_progress(user_id, job_id, "importing")
+
+        card_ids: List[UUID] = []
+        batch: List[ParsedLine] = []
+        for parsed in self._records(upload_path, archive):
+            batch.append(parsed)
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                card_ids.extend(await self._insert_batch(user_id, job_id, archive, batch))
+                batch = []
+        if batch:
+            card_ids.extend(await self._insert_batch(user_id, job_id, archive, batch))
+        return card_ids
+
+    async def _insert_batch(self, user_id: UUID, job_id: UUID, archive: Optional[zipfile.ZipFile], batch: List[ParsedLine]) -> List[UUID]:
+        now = datetime.now(timezone.utc)
+        cards: List[Dict[str, Any]] = []
+        attachments: List[Dict[str, Any]] = []
+        failed = 0
+        for source, line_no, value in batch:
+            try:
+                if isinstance(value, Exception):
+                    raise value
+                record = ImportRecord.model_validate(value)
+                card_id = uuid4()
+                if record.file:
+                    attachments.append(await self._store_file(user_id, card_id, archive, record.file))
+            except ValidationError as exc:
+                failed += 1
+                self._report(source, line_no, "; ".join(f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in exc.errors()))
+                continue
+            except ValueError as exc:
+                failed += 1
+                self._report(source, line_no, str(exc))
+                continue
+            cards.append({
+                **record.model_dump(exclude={"file", "created_at"}),
+                "id": card_id,
+                "user_id": user_id,
+                "created_at": record.created_at or now,
+                "updated_at": record.created_at or now,
+            })
+
+        try:
+            # Multi-row INSERTs (insertmanyvalues) in one transaction per batch; nothing is loaded back
+            if cards:
+                await self.db.execute(insert(MemoryCard), cards)
+            if attachments:
+                await self.db.execute(insert(Attachment), attachments)
+                await self.db.execute(
+                    update(MemoryCard),
+                    [{"id": attachment["memory_card_id"], "attachment_id": attachment["id"]} for attachment in attachments],
+                )
+        except DBAPIError as exc:
+            await self.db.rollback()
+            for attachment in attachments:
+                os.remove(attachment["file_url"])
+            failed += len(cards)
+            self._report(batch[0][0], batch[0][1], f"Batch of {len(cards)} records rejected: {exc.orig}")
+            cards = []
+
+        await self._update_job(
+            job_id,
+            total_records=ImportJob.total_records + len(batch),
+            imported_records=ImportJob.imported_records + len(cards),
+            failed_records=ImportJob.failed_records + failed,
+            errors=self._errors,
+        )
+        await self.db.commit()
+        self._publish_progress(user_id, job_id, "importing")
+        if cards:
+            # A batch larger than a subscriber's buffer overflows it, and that client is told to resync
+            change_broker.publish(user_id, *(ChangeEvent("memory_card", "created", card["id"]) for card in cards))
+        return [card["id"] for card in cards]
+
+    async def _store_file(self, user_id: UUID, card_id: UUID, archive: Optional[zipfile.ZipFile], name: str) -> Dict[str, Any]:
+        if archive is None:
+            raise ValueError("File references need a zip upload")
+        try:
+            info = archive.getinfo(name)
+        except KeyError:
+            raise ValueError(f"File {name!r} not found in the archive")
+        # The upload cap says nothing about what its members inflate to. Reading a member stops at
+        # its declared size (and fails the CRC check if the data was longer), so checking that is enough.
+        if info.file_size > settings.IMPORT_MAX_FILE_MB * 1024 * 1024:
+            raise ValueError(f"File {name!r} is larger than {settings.IMPORT_MAX_FILE_MB} MB uncompressed")
+        if self._extracted_bytes + info.file_size > settings.IMPORT_MAX_EXTRACTED_MB * 1024 * 1024:
+            raise ValueError(f"File {name!r} would take the import past {settings.IMPORT_MAX_EXTRACTED_MB} MB of extracted files")
+
+        user_media_dir = os.path.join(settings.MEDIA_PATH, str(user_id), "attachments")
+        os.makedirs(user_media_dir, exist_ok=True)
+        # The archive path only contributes its extension, never a directory
+        file_path = os.path.join(user_media_dir, f"{uuid4()}{os.path.splitext(name)[1]}")
+        try:
+            await asyncio.to_thread(_extract_member, archive, info, file_path)
+        except zipfile.BadZipFile as exc:
+            os.remove(file_path)
+            raise ValueError(f"File {name!r} is corrupt: {exc}")
+        self._extracted_bytes += info.file_size
+        return {
+            "id": uuid4(),
+            "user_id": user_id,
+            "memory_card_id": card_id,
+            "filename": os.path.basename(name),
+            "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "file_url": file_path,
+            "size": info.file_size,
+        }
+
+    # --- Phase 2: embeddings and graph ---
+    async def _enrich(self, user_id: UUID, job_id: UUID, card_ids: List[UUID]):
+        await self._update_job(job_id, status="enriching")
+        await self.db.commit()
+        self._publish_progress(user_id, job_id, "enriching")
+
+        pipeline = AiPipelineService(self.db)
+        edge_inference = EdgeInferenceService(self.db)
+        for start in range(0, len(card_ids), settings.IMPORT_ENRICH_BATCH_SIZE):
+            batch_ids = card_ids[start:start + settings.IMPORT_ENRICH_BATCH_SIZE]
+            node_ids = await self._enrich_batch(user_id, pipeline, batch_ids)
+            await self._update_job(job_id, enriched_records=ImportJob.enriched_records + len(batch_ids))
+            await self.db.commit()
+            graph_changes.mark(user_id, node_ids)
+            self._publish_progress(user_id, job_id, "enriching")
+            await edge_inference.infer_edges_for_nodes(user_id, node_ids)
+
+        if card_ids:
+            await ClusteringService(self.db).recompute_clusters(user_id)
+            change_broker.publish(user_id, ChangeEvent("graph", "rebuilt", user_id))
+
+    async def _enrich_batch(self, user_id: UUID, pipeline: AiPipelineService, card_ids: List[UUID]) -> List[UUID]:
+        rows = (await self.db.execute(
+            select(MemoryCard.id, MemoryCard.title, MemoryCard.content, MemoryCard.tags)
+            .filter(MemoryCard.user_id == user_id, MemoryCard.id.in_(card_ids))
+        )).all()
+        # Don't keep the read transaction open while the embedding model runs
+        await self.db.commit()
+
+        # One embedding per card, plus one per chunk when the content is long enough to split
+        units: List[Tuple[Any, Optional[int], str]] = []
+        for row in rows:
+            chunks = _chunk_text(row.content or "", settings.IMPORT_CHUNK_CHARS)
+            units.append((row, None, f"{row.title}\n{chunks[0] if chunks else ''}"))
+            if len(chunks) > 1:
+                units.extend((row, index, chunk) for index, chunk in enumerate(chunks))
+        vectors = await pipeline.generate_embeddings_batch([text for _, _, text in units])
+
+        embeddings, nodes, edges, cards = [], [], [], []
+        card_nodes: Dict[UUID, UUID] = {}
+        for (row, index, text), vector in zip(units, vectors):
+            node_id, embedding_id = uuid4(), uuid4()
+            node = {"id": node_id, "user_id": user_id, "memory_card_id": row.id, "embedding_id": embedding_id}
+            if index is None:
+                card_nodes[row.id] = node_id
+                embeddings.append({"id": embedding_id, "user_id": user_id, "vector": vector, "source_type": "memory_card", "source_id": row.id})
+                nodes.append({**node, "label": row.title, "description": None, "type": "memory-card", "tags": row.tags or []})
+                cards.append({"id": row.id, "embedding_id": embedding_id})
+            else:
+                embeddings.append({"id": embedding_id, "user_id": user_id, "vector": vector, "source_type": "graph_node", "source_id": node_id})
+                nodes.append({**node, "label": f"{row.title} ({index + 1})", "description": text, "type": "chunk", "tags": []})
+                edges.append({"user_id": user_id, "source_node_id": node_id, "target_node_id": card_nodes[row.id], "type": CHUNK_EDGE_TYPE, "strength": 1.0})
+
+        if embeddings:
+            await self.db.execute(insert(Embedding), embeddings)
+            await self.db.execute(insert(GraphNode), nodes)
+            await self.db.execute(update(MemoryCard), cards)
+        if edges:
+            await self.db.execute(insert(GraphEdge), edges)
+        return [node["id"] for node in nodes]
+
+    # --- Job bookkeeping ---
+    def _report(self, source: Optional[str], line_no: int, error: str):
+        if len(self._errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self._errors.append({"source": source, "line": line_no, "error": error})
+
+    async def _update_job(self, job_id: UUID, **values):
+        await self.db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _finish(self, user_id: UUID, job_id: UUID, status: str):
+        await self._update_job(job_id, status=status, errors=self._errors, finished_at=func.now())
+        await self.db.commit()
+        self._publish_progress(user_id, job_id, status)
+
+    def _publish_progress(self, user_id: UUID, job_id: UUID, status: str):
+        change_broker.publish(user_id, ChangeEvent("import_job", "updated", job_id, {"status": status}))
+
+
+# Entry point for run_with_session background tasks
+async def run_import_job(db: AsyncSession, user_id: UUID, job_id: UUID):
+    await ImportService(db).run_import(user_id, job_id)
@@ -1,13 +1,25 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, update
+from sqlalchemy import Row, Select, delete, update
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from src.models.mood_log import MoodLog
 from src.models.timeline_event import TimelineEvent
 from src.models.wiki_entry import WikiEntry
+from src.models.wiki_entry_source import WikiEntrySource
+from src.models.dismissed_wiki_cluster import DismissedWikiCluster
+from src.models.memory_card import MemoryCard
 from src.models.habit import Habit
+from src.models.habit_completion import HabitCompletion
+from src.database.dialect import upsert_insert
+from src.database.fulltext import SEARCHABLE, match_clause
+from src.database.pagination import paginate, stream_keyset, DEFAULT_PAGE_SIZE
+from src.database.repository import OwnedRepository
+from src.core.events import ChangeEvent, change_broker
+from src.core.serialization import response_columns
+from src.services.mood_analytics_service import MoodAnalyticsService
+from src.services.habit_stats_service import HabitStatsService
 from src.schemas.life_os import (
     MoodLogCreate, MoodLogResponse,
     TimelineEventCreate, TimelineEventResponse,
@@ -38,6 +50,10 @@ class HabitNotFoundException(Exception):
 class LifeOsService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.mood_logs = OwnedRepository(db, MoodLog)
+        self.timeline_events = OwnedRepository(db, TimelineEvent)
+        self.wiki_entries = OwnedRepository(db, WikiEntry)
+        self.habits = OwnedRepository(db, Habit)
 
     # --- Mood Logs ---
     async def get_mood_log_by_id(self, user_id: UUID, log_id: UUID) -> MoodLog:
@@ -49,21 +65,30 @@ class LifeOsService:
             raise MoodLogNotFoundException(f"MoodLog with id {log_id} not found.")
         return mood_log
 
-    async def get_all_mood_logs(self, user_id: UUID) -> List[MoodLog]:
-        result = await self.db.execute(select(MoodLog).filter(MoodLog.user_id == user_id).order_by(MoodLog.timestamp.desc()))
-        return result.scalars().all()
+    def _mood_logs_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(MoodLog, MoodLogResponse)).filter(MoodLog.user_id == user_id)
+
+    async def get_all_mood_logs(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._mood_logs_query(user_id), MoodLog.timestamp, MoodLog.id, limit, cursor)
+
+    def stream_all_mood_logs(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._mood_logs_query(user_id), MoodLog.timestamp, MoodLog.id, cursor)
 
     async def create_mood_log(self, user_id: UUID, log_data: MoodLogCreate) -> MoodLog:
-        new_log = MoodLog(**log_data.model_dump(), user_id=user_id)
-        self.db.add(new_log)
+        mood_log = await self.mood_logs.insert({**log_data.model_dump(), "user_id": user_id}, commit=False)
+        # Rollups change in the same transaction, so analytics never disagree with the logs
+        await MoodAnalyticsService(self.db).apply(user_id, [mood_log])
         await self.db.commit()
-        await self.db.refresh(new_log)
-        return new_log
+        change_broker.publish(user_id, ChangeEvent("mood_log", "created", mood_log.id))
+        return mood_log
 
     async def delete_mood_log(self, user_id: UUID, log_id: UUID):
-        mood_log = await self.get_mood_log_by_id(user_id, log_id)
-        await self.db.delete(mood_log)
+        deleted = await self.mood_logs.delete(user_id, log_id, MoodLog.timestamp, MoodLog.mood_label, MoodLog.score, commit=False)
+        if not deleted:
+            raise MoodLogNotFoundException(f"MoodLog with id {log_id} not found.")
+        await MoodAnalyticsService(self.db).apply(user_id, [deleted], sign=-1)
         await self.db.commit()
+        change_broker.publish(user_id, ChangeEvent("mood_log", "deleted", log_id))
 
     # --- Timeline Events ---
     async def get_timeline_event_by_id(self, user_id: UUID, event_id: UUID) -> TimelineEvent:
@@ -75,21 +100,24 @@ class LifeOsService:
             raise TimelineEventNotFoundException(f"TimelineEvent with id {event_id} not found.")
         return event
 
-    async def get_all_timeline_events(self, user_id: UUID) -> List[TimelineEvent]:
-        result = await self.db.execute(select(TimelineEvent).filter(TimelineEvent.user_id == user_id).order_by(TimelineEvent.timestamp.desc()))
-        return result.scalars().all()
+    def _timeline_events_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(TimelineEvent, TimelineEventResponse)).filter(TimelineEvent.user_id == user_id)
+
+    async def get_all_timeline_events(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._timeline_events_query(user_id), TimelineEvent.timestamp, TimelineEvent.id, limit, cursor)
+
+    def stream_all_timeline_events(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._timeline_events_query(user_id), TimelineEvent.timestamp, TimelineEvent.id, cursor)
 
     async def create_timeline_event(self, user_id: UUID, event_data: TimelineEventCreate) -> TimelineEvent:
-        new_event = TimelineEvent(**event_data.model_dump(), user_id=user_id)
-        self.db.add(new_event)
-        await self.db.commit()
-        await self.db.refresh(new_event)
-        return new_event
+        event = await self.timeline_events.insert({**event_data.model_dump(), "user_id": user_id})
+        change_broker.publish(user_id, ChangeEvent("timeline_event", "created", event.id))
+        return event
     
     async def delete_timeline_event(self, user_id: UUID, event_id: UUID):
-        event = await self.get_timeline_event_by_id(user_id, event_id)
-        await self.db.delete(event)
-        await self.db.commit()
+        if not await self.timeline_events.delete(user_id, event_id):
+            raise TimelineEventNotFoundException(f"TimelineEvent with id {event_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("timeline_event", "deleted", event_id))
 
     # --- Wiki Entries ---
     async def get_wiki_entry_by_id(self, user_id: UUID, entry_id: UUID) -> WikiEntry:
@@ -101,78 +129,110 @@ class LifeOsService:
             raise WikiEntryNotFoundException(f"WikiEntry with id {entry_id} not found.")
         return entry
 
-    async def get_all_wiki_entries(self, user_id: UUID, search_query: Optional[str] = None) -> List[WikiEntry]:
-        query = select(WikiEntry).filter(WikiEntry.user_id == user_id)
+    def _wiki_entries_query(self, user_id: UUID, search_query: Optional[str] = None) -> Select:
+        query = select(*response_columns(WikiEntry, WikiEntryResponse)).filter(WikiEntry.user_id == user_id)
         if search_query:
-            query = query.filter(WikiEntry.title.ilike(f"%{search_query}%") | WikiEntry.summary.ilike(f"%{search_query}%"))
-        result = await self.db.execute(query.order_by(WikiEntry.created_at.desc()))
-        return result.scalars().all()
+            # Full-text index match rather than a leading-wildcard ILIKE scan
+            query = query.filter(match_clause(SEARCHABLE["wiki_entry"], search_query))
+        return query
+
+    async def get_all_wiki_entries(self, user_id: UUID, search_query: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._wiki_entries_query(user_id, search_query), WikiEntry.created_at, WikiEntry.id, limit, cursor)
+
+    def stream_all_wiki_entries(self, user_id: UUID, search_query: Optional[str] = None, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._wiki_entries_query(user_id, search_query), WikiEntry.created_at, WikiEntry.id, cursor)
 
     async def create_wiki_entry(self, user_id: UUID, entry_data: WikiEntryCreate) -> WikiEntry:
-        new_entry = WikiEntry(**entry_data.model_dump(), user_id=user_id)
-        self.db.add(new_entry)
-        await self.db.commit()
-        await self.db.refresh(new_entry)
-        return new_entry
+        entry = await self.wiki_entries.insert({**entry_data.model_dump(), "user_id": user_id})
+        change_broker.publish(user_id, ChangeEvent("wiki_entry", "created", entry.id))
+        return entry
 
     async def update_wiki_entry(self, user_id: UUID, entry_id: UUID, entry_data: WikiEntryUpdate) -> WikiEntry:
-        entry = await self.get_wiki_entry_by_id(user_id, entry_id)
-        
-        update_data = entry_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(entry, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(entry)
+        entry = await self.wiki_entries.update(user_id, entry_id, entry_data.model_dump(exclude_unset=True))
+        if not entry:
+            raise WikiEntryNotFoundException(f"WikiEntry with id {entry_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("wiki_entry", "updated", entry.id))
         return entry
 
+    async def get_wiki_entry_sources(self, user_id: UUID, entry_id: UUID) -> List[Row]:
+        await self.get_wiki_entry_by_id(user_id, entry_id)
+        result = await self.db.execute(
+            select(WikiEntrySource.memory_card_id, MemoryCard.title, WikiEntrySource.content_hash)
+            .join(MemoryCard, MemoryCard.id == WikiEntrySource.memory_card_id)
+            .filter(WikiEntrySource.user_id == user_id, WikiEntrySource.wiki_entry_id == entry_id)
+            .order_by(MemoryCard.created_at)
+        )
+        return result.all()
+
     async def delete_wiki_entry(self, user_id: UUID, entry_id: UUID):
-        entry = await self.get_wiki_entry_by_id(user_id, entry_id)
-        await self.db.delete(entry)
+        await self.db.execute(
+            delete(WikiEntrySource)
+            .where(WikiEntrySource.user_id == user_id, WikiEntrySource.wiki_entry_id == entry_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = await self.wiki_entries.delete(user_id, entry_id, WikiEntry.cluster_id, commit=False)
+        if deleted is None:
+            await self.db.rollback()
+            raise WikiEntryNotFoundException(f"WikiEntry with id {entry_id} not found.")
+        if deleted.cluster_id is not None:
+            # Otherwise the next generation run would write the entry again for the same cluster
+            await self.db.execute(
+                upsert_insert(DismissedWikiCluster)
+                .values(user_id=user_id, cluster_id=deleted.cluster_id)
+                .on_conflict_do_nothing()
+            )
         await self.db.commit()
+        change_broker.publish(user_id, ChangeEvent("wiki_entry", "deleted", entry_id))
 
     # --- Habits ---
-    async def get_habit_by_id(self, user_id: UUID, habit_id: UUID) -> Habit:
-        result = await self.db.execute(
-            select(Habit).filter(Habit.id == habit_id, Habit.user_id == user_id)
-        )
-        habit = result.scalar_one_or_none()
+    # Habit reads come back as dicts: current_value and streak_count are recomputed from the
+    # completion log, since the counters on the row go stale as soon as a period ends
+    async def get_habit_by_id(self, user_id: UUID, habit_id: UUID) -> Dict[str, Any]:
+        habit = (await self.db.execute(self._habits_query(user_id).filter(Habit.id == habit_id))).first()
         if not habit:
             raise HabitNotFoundException(f"Habit with id {habit_id} not found.")
-        return habit
+        return (await HabitStatsService(self.db).with_current_stats([habit]))[0]
+
+    def _habits_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(Habit, HabitResponse)).filter(Habit.user_id == user_id)
+
+    async def get_all_habits(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        habits, next_cursor = await paginate(self.db, self._habits_query(user_id), Habit.created_at, Habit.id, limit, cursor, descending=False)
+        return await HabitStatsService(self.db).with_current_stats(habits), next_cursor
 
-    async def get_all_habits(self, user_id: UUID) -> List[Habit]:
-        result = await self.db.execute(select(Habit).filter(Habit.user_id == user_id).order_by(Habit.created_at))
-        return result.scalars().all()
+    async def stream_all_habits(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        stats = HabitStatsService(self.db)
+        async for batch in stream_keyset(self.db, self._habits_query(user_id), Habit.created_at, Habit.id, cursor, descending=False):
+            yield await stats.with_current_stats(batch)
 
     async def create_habit(self, user_id: UUID, habit_data: HabitCreate) -> Habit:
-        new_habit = Habit(**habit_data.model_dump(), user_id=user_id)
-        self.db.add(new_habit)
-        await self.db.commit()
-        await self.db.refresh(new_habit)
-        return new_habit
+        habit = await self.habits.insert({**habit_data.model_dump(), "user_id": user_id})
+        change_broker.publish(user_id, ChangeEvent("habit", "created", habit.id))
+        return habit
 
     async def update_habit(self, user_id: UUID, habit_id: UUID, habit_data: HabitUpdate) -> Habit:
-        habit = await self.get_habit_by_id(user_id, habit_id)
-        
-        update_data = habit_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(habit, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(habit)
+        habit = await self.habits.update(user_id, habit_id, habit_data.model_dump(exclude_unset=True))
+        if not habit:
+            raise HabitNotFoundException(f"Habit with id {habit_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("habit", "updated", habit.id))
         return habit
     
     async def complete_habit_step(self, user_id: UUID, habit_id: UUID, value_increment: float = 1.0) -> Habit:
-        habit = await self.get_habit_by_id(user_id, habit_id)
-        habit.current_value += value_increment
-        habit.streak_count += 1 # Simple increment for demo
-        habit.last_completed = datetime.now()
+        # Logged as an event; the counters on the row are recomputed for the habit's current period
+        habit = await HabitStatsService(self.db).record_completion(user_id, habit_id, value_increment)
+        if not habit:
+            raise HabitNotFoundException(f"Habit with id {habit_id} not found.")
         await self.db.commit()
-        await self.db.refresh(habit)
+        change_broker.publish(user_id, ChangeEvent("habit", "updated", habit.id))
         return habit
 
     async def delete_habit(self, user_id: UUID, habit_id: UUID):
-        habit = await self.get_habit_by_id(user_id, habit_id)
-        await self.db.delete(habit)
-        await self.db.commit()
+        await self.db.execute(
+            delete(HabitCompletion)
+            .where(HabitCompletion.user_id == user_id, HabitCompletion.habit_id == habit_id)
+            .execution_options(synchronize_session=False)
+        )
+        if not await self.habits.delete(user_id, habit_id):
+            await self.db.rollback()
+            raise HabitNotFoundException(f"Habit with id {habit_id} not found.")
+        change_broker.publish(user_id, ChangeEvent("habit", "deleted", habit_id))
@@ -1,16 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update
+from sqlalchemy import Row, Select, update, values, column, func, bindparam, and_, Float, Uuid
 from uuid import UUID
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Sequence, Tuple, Optional
 
 from src.models.memory_card import MemoryCard
-from src.schemas.memory_card import MemoryCardCreate, MemoryCardUpdate, MemoryCardCanvasPositionUpdate
+from src.schemas.memory_card import MemoryCardCreate, MemoryCardResponse, MemoryCardUpdate, MemoryCardCanvasPositionUpdate, CanvasCardSummary, CanvasDensityTile, CanvasViewportResponse
+from src.config.settings import settings
+from src.database.dialect import IS_SQLITE
+from src.database.pagination import paginate, stream_keyset, DEFAULT_PAGE_SIZE
+from src.database.repository import OwnedRepository
+from src.core.events import ChangeEvent, change_broker
+from src.core.serialization import response_columns
 from src.core.exceptions import MemoryCardNotFoundException, UnauthorizedAccessException
+from src.services.cascade_delete_service import CascadeDeleteService
+
+# Rows per canvas position UPDATE: 3 bind parameters each, well under asyncpg's 32767
+CANVAS_POSITION_WRITE_BATCH_SIZE = 5000
+
+
+def _in_canvas_box(min_x: float, min_y: float, max_x: float, max_y: float):
+    if IS_SQLITE:
+        return and_(MemoryCard.canvas_position_x.between(min_x, max_x), MemoryCard.canvas_position_y.between(min_y, max_y))
+    # Spelled like ix_memory_cards_user_canvas_point's expression, so the planner can use the GiST index
+    canvas_point = func.point(MemoryCard.canvas_position_x, MemoryCard.canvas_position_y)
+    return canvas_point.op("<@")(func.box(func.point(min_x, min_y), func.point(max_x, max_y)))
+
 
 class MemoryCardService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.memory_cards = OwnedRepository(db, MemoryCard)
 
     async def get_memory_card_by_id(self, user_id: UUID, memory_card_id: UUID) -> MemoryCard:
         result = await self.db.execute(
@@ -21,39 +41,130 @@ class MemoryCardService:
             raise MemoryCardNotFoundException()
         return memory_card
 
-    async def get_all_memory_cards(self, user_id: UUID) -> List[MemoryCard]:
-        result = await self.db.execute(select(MemoryCard).filter(MemoryCard.user_id == user_id))
-        return result.scalars().all()
+    def _memory_cards_query(self, user_id: UUID) -> Select:
+        return select(*response_columns(MemoryCard, MemoryCardResponse)).filter(MemoryCard.user_id == user_id)
+
+    async def get_all_memory_cards(self, user_id: UUID, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Row], Optional[str]]:
+        return await paginate(self.db, self._memory_cards_query(user_id), MemoryCard.created_at, MemoryCard.id, limit, cursor)
+
+    def stream_all_memory_cards(self, user_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Sequence[Row]]:
+        return stream_keyset(self.db, self._memory_cards_query(user_id), MemoryCard.created_at, MemoryCard.id, cursor)
+
+    async def get_canvas_viewport(self, user_id: UUID, min_x: float, min_y: float, max_x: float, max_y: float, zoom: float) -> CanvasViewportResponse:
+        in_viewport = (MemoryCard.user_id == user_id, _in_canvas_box(min_x, min_y, max_x, max_y))
+
+        if zoom < settings.CANVAS_TILE_ZOOM_THRESHOLD:
+            # Zoomed out: aggregate into fixed screen-size tiles instead of shipping cards
+            tile_size = settings.CANVAS_TILE_SIZE / zoom
+            tile_x = func.floor(MemoryCard.canvas_position_x / tile_size)
+            tile_y = func.floor(MemoryCard.canvas_position_y / tile_size)
+            result = await self.db.execute(
+                select(
+                    tile_x.label("tile_x"),
+                    tile_y.label("tile_y"),
+                    func.count().label("count"),
+                    func.avg(MemoryCard.canvas_position_x).label("center_x"),
+                    func.avg(MemoryCard.canvas_position_y).label("center_y"),
+                )
+                .filter(*in_viewport)
+                .group_by(tile_x, tile_y)
+            )
+            tiles = [
+                CanvasDensityTile(tile_x=int(row.tile_x), tile_y=int(row.tile_y), count=row.count, center_x=row.center_x, center_y=row.center_y)
+                for row in result.all()
+            ]
+            return CanvasViewportResponse(mode="tiles", tile_size=tile_size, tiles=tiles)
+
+        # Zoomed in: lightweight projection, no content or metadata
+        limit = settings.CANVAS_VIEWPORT_MAX_CARDS
+        result = await self.db.execute(
+            select(
+                MemoryCard.id,
+                MemoryCard.title,
+                MemoryCard.type,
+                MemoryCard.tags,
+                MemoryCard.canvas_position_x,
+                MemoryCard.canvas_position_y,
+                MemoryCard.updated_at,
+            )
+            .filter(*in_viewport)
+            .limit(limit + 1)
+        )
+        rows = result.all()
+        cards = [CanvasCardSummary.model_validate(row) for row in rows[:limit]]
+        return CanvasViewportResponse(mode="cards", cards=cards, truncated=len(rows) > limit)
 
     async def create_memory_card(self, user_id: UUID, card_data: MemoryCardCreate) -> MemoryCard:
-        new_card = MemoryCard(**card_data.model_dump(), user_id=user_id)
-        self.db.add(new_card)
-        await self.db.commit()
-        await self.db.refresh(new_card)
+        new_card = await self.memory_cards.insert({**card_data.model_dump(), "user_id": user_id})
+        change_broker.publish(user_id, ChangeEvent("memory_card", "created", new_card.id))
         return new_card
 
     async def update_memory_card(self, user_id: UUID, memory_card_id: UUID, card_data: MemoryCardUpdate) -> MemoryCard:
-        memory_card = await self.get_memory_card_by_id(user_id, memory_card_id)
-        
-        update_data = card_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(memory_card, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(memory_card)
+        memory_card = await self.memory_cards.update(user_id, memory_card_id, card_data.model_dump(exclude_unset=True))
+        if not memory_card:
+            raise MemoryCardNotFoundException()
+        change_broker.publish(user_id, ChangeEvent("memory_card", "updated", memory_card.id))
         return memory_card
     
     async def update_memory_card_canvas_position(self, user_id: UUID, memory_card_id: UUID, position_data: MemoryCardCanvasPositionUpdate) -> MemoryCard:
-        memory_card = await self.get_memory_card_by_id(user_id, memory_card_id)
-        
-        memory_card.canvas_position_x = position_data.x
-        memory_card.canvas_position_y = position_data.y
-
-        await self.db.commit()
-        await self.db.refresh(memory_card)
+        memory_card = await self.memory_cards.update(
+            user_id, memory_card_id, {"canvas_position_x": position_data.x, "canvas_position_y": position_data.y}
+        )
+        if not memory_card:
+            raise MemoryCardNotFoundException()
+        change_broker.publish(user_id, ChangeEvent("memory_card", "updated", memory_card.id, {"x": position_data.x, "y": position_data.y}))
         return memory_card
 
+    async def update_canvas_positions(self, user_id: UUID, positions: Dict[UUID, Tuple[float, float]]) -> int:
+        # One UPDATE ... FROM (VALUES ...) per chunk; cards the user doesn't own are skipped. A flush
+        # can coalesce several requests' batches, so chunks keep each statement under the driver's
+        # bind parameter limit, and each one commits and publishes on its own.
+        items = list(positions.items())
+        total = 0
+        for start in range(0, len(items), CANVAS_POSITION_WRITE_BATCH_SIZE):
+            chunk = dict(items[start:start + CANVAS_POSITION_WRITE_BATCH_SIZE])
+            if IS_SQLITE:
+                moved = await self._update_canvas_positions_executemany(user_id, chunk)
+            else:
+                moved = await self._update_canvas_positions_values(user_id, chunk)
+            await self.db.commit()
+            change_broker.publish(user_id, *(ChangeEvent("memory_card", "updated", card_id, {"x": x, "y": y}) for card_id, x, y in moved))
+            total += len(moved)
+        return total
+
+    async def _update_canvas_positions_values(self, user_id: UUID, positions: Dict[UUID, Tuple[float, float]]) -> List[Tuple[UUID, float, float]]:
+        new_positions = values(
+            column("id", Uuid(as_uuid=True)), column("x", Float), column("y", Float), name="new_positions"
+        ).data([(memory_card_id, x, y) for memory_card_id, (x, y) in positions.items()])
+        result = await self.db.execute(
+            update(MemoryCard)
+            .where(MemoryCard.id == new_positions.c.id, MemoryCard.user_id == user_id)
+            .values(canvas_position_x=new_positions.c.x, canvas_position_y=new_positions.c.y)
+            .returning(MemoryCard.id, MemoryCard.canvas_position_x, MemoryCard.canvas_position_y)
+            .execution_options(synchronize_session=False)
+        )
+        return [(row.id, row.canvas_position_x, row.canvas_position_y) for row in result.all()]
+
+    async def _update_canvas_positions_executemany(self, user_id: UUID, positions: Dict[UUID, Tuple[float, float]]) -> List[Tuple[UUID, float, float]]:
+        # SQLite can't alias the columns of a VALUES list, so filter to owned cards and
+        # run one prepared UPDATE over the batch; it's an in-process call, not a round trip
+        owned = await self.db.execute(
+            select(MemoryCard.id).filter(MemoryCard.user_id == user_id, MemoryCard.id.in_(list(positions)))
+        )
+        moved = [(card_id, *positions[card_id]) for card_id in owned.scalars().all()]
+        if moved:
+            await self.db.execute(
+                update(MemoryCard.__table__)
+                .where(MemoryCard.__table__.c.id == bindparam("card_id"))
+                .values(canvas_position_x=bindparam("x"), canvas_position_y=bindparam("y")),
+                [{"card_id": card_id, "x": x, "y": y} for card_id, x, y in moved],
+            )
+        return moved
+
     async def delete_memory_card(self, user_id: UUID, memory_card_id: UUID):
-        memory_card = await self.get_memory_card_by_id(user_id, memory_card_id)
-        await self.db.delete(memory_card)
-        await self.db.commit()
+        # Graph nodes, embeddings, attachments and timeline events go with it
+        if not await CascadeDeleteService(self.db).delete_memory_cards(user_id, [memory_card_id]):
+            raise MemoryCardNotFoundException()
+
+    async def delete_memory_cards(self, user_id: UUID, memory_card_ids: List[UUID]) -> int:
+        return await CascadeDeleteService(self.db).delete_memory_cards(user_id, memory_card_ids)
@@ -0,0 +1,165 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete
+from uuid import UUID
+from typing import Any, Dict, Iterable, Optional
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+
+from src.database.dialect import upsert_insert
+from src.models.mood_rollup import MoodRollup
+
+ROLLUP_PERIODS = ("day", "week", "month")
+DEFAULT_BUCKETS = 90 # Range ending at `end` when no `start` is given
+MAX_BUCKETS = 3660 # Earlier starts are clamped; ten years of days
+
+
+def period_start(period: str, day: date) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def shift_period(period: str, start: date, periods: int) -> date:
+    # `start` must already be a bucket start of `period`
+    if period == "week":
+        return start + timedelta(weeks=periods)
+    if period == "month":
+        months = start.year * 12 + start.month - 1 + periods
+        return date(months // 12, months % 12 + 1, 1)
+    return start + timedelta(days=periods)
+
+
+def _utc_date(timestamp: datetime) -> date:
+    # SQLite hands back naive timestamps, which are already UTC
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def _average(score_sum: int, score_count: int) -> Optional[float]:
+    return score_sum / score_count if score_count else None
+
+
+class MoodAnalyticsService:
+    """Day, week and month mood aggregates kept in the mood_rollups table.
+
+    Every mood log insert or delete adjusts the count and score sums of its
+    three buckets with one upsert, in the same transaction as the log, so
+    analytics read a few hundred pre-aggregated rows however long the
+    history is. Buckets are UTC calendar periods.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, user_id: UUID, logs: Iterable[Any], sign: int = 1):
+        """Adds (sign=1) or removes (sign=-1) mood logs from their buckets; the caller commits."""
+        deltas: Dict[tuple, Dict[str, Any]] = {}
+        for log in logs:
+            day = _utc_date(log.timestamp)
+            for period in ROLLUP_PERIODS:
+                key = (period, period_start(period, day), log.mood_label)
+                row = deltas.setdefault(key, {
+                    "user_id": user_id, "period": key[0], "period_start": key[1], "mood_label": key[2],
+                    "count": 0, "score_sum": 0, "score_count": 0,
+                })
+                row["count"] += sign
+                if log.score is not None:
+                    row["score_sum"] += sign * log.score
+                    row["score_count"] += sign
+        if not deltas:
+            return
+
+        stmt = upsert_insert(MoodRollup).values(list(deltas.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MoodRollup.user_id, MoodRollup.period, MoodRollup.period_start, MoodRollup.mood_label],
+            set_={
+                "count": MoodRollup.count + stmt.excluded.count,
+                "score_sum": MoodRollup.score_sum + stmt.excluded.score_sum,
+                "score_count": MoodRollup.score_count + stmt.excluded.score_count,
+            },
+        )
+        await self.db.execute(stmt)
+        if sign < 0:
+            await self.db.execute(
+                delete(MoodRollup)
+                .where(MoodRollup.user_id == user_id, MoodRollup.count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def get_mood_analytics(
+        self,
+        user_id: UUID,
+        period: str = "day",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        window: int = 7,
+    ) -> Dict[str, Any]:
+        end = period_start(period, end or datetime.now(timezone.utc).date())
+        start = period_start(period, start) if start else shift_period(period, end, -(DEFAULT_BUCKETS - 1))
+        start = max(start, shift_period(period, end, -(MAX_BUCKETS - 1)))
+        # The moving average of the first buckets reaches back before `start`
+        fetch_from = shift_period(period, start, -(window - 1))
+
+        rows = (await self.db.execute(
+            select(MoodRollup.period_start, MoodRollup.mood_label, MoodRollup.count, MoodRollup.score_sum, MoodRollup.score_count)
+            .filter(
+                MoodRollup.user_id == user_id,
+                MoodRollup.period == period,
+                MoodRollup.period_start >= fetch_from,
+                MoodRollup.period_start <= end,
+            )
+        )).all()
+
+        buckets: Dict[date, Dict[str, Any]] = {}
+        for row in rows:
+            bucket = buckets.setdefault(row.period_start, {"count": 0, "score_sum": 0, "score_count": 0, "labels": {}})
+            bucket["count"] += row.count
+            bucket["score_sum"] += row.score_sum
+            bucket["score_count"] += row.score_count
+            bucket["labels"][row.mood_label] = row.count
+
+        # Walk the calendar so empty periods still count towards the window
+        results, labels = [], {}
+        total = {"count": 0, "score_sum": 0, "score_count": 0}
+        trailing = deque()
+        window_sum = window_count = 0
+        current = fetch_from
+        while current <= end:
+            bucket = buckets.get(current)
+            score_sum, score_count = (bucket["score_sum"], bucket["score_count"]) if bucket else (0, 0)
+            trailing.append((score_sum, score_count))
+            window_sum += score_sum
+            window_count += score_count
+            if len(trailing) > window:
+                dropped_sum, dropped_count = trailing.popleft()
+                window_sum -= dropped_sum
+                window_count -= dropped_count
+
+            if bucket and current >= start:
+                results.append({
+                    "period_start": current,
+                    "count": bucket["count"],
+                    "average_score": _average(score_sum, score_count),
+                    "moving_average": _average(window_sum, window_count),
+                    "labels": bucket["labels"],
+                })
+                for key in total:
+                    total[key] += bucket[key]
+                for label, count in bucket["labels"].items():
+                    labels[label] = labels.get(label, 0) + count
+            current = shift_period(period, current, 1)
+
+        return {
+            "period": period,
+            "start": start,
+            "end": end,
+            "window": window,
+            "count": total["count"],
+            "average_score": _average(total["score_sum"], total["score_count"]),
+            "labels": labels,
+            "buckets": results,
+        }
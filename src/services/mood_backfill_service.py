@@ -0,0 +1,133 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from collections import defaultdict
+from uuid import UUID
+import asyncio
+import time
+
+from src.ai.mood_classifier import MoodClassifier, get_mood_classifier
+from src.config.settings import settings
+from src.core.events import ChangeEvent, change_broker
+from src.models.chat_message import ChatMessage
+from src.models.conversation import Conversation
+from src.models.timeline_event import TimelineEvent
+
+
+@dataclass(frozen=True)
+class _Target:
+    model: Any
+    entity: str # Change-event entity of the rows
+    owner: Any # Column holding the owning user's id
+    columns: Tuple[Any, ...]
+    text: Callable[[Any], str]
+    joins: Tuple[Any, ...] = ()
+    data: Callable[[Any], Dict[str, Any]] = lambda row: {} # Extra change-event payload
+
+
+# Tables with a mood_context column, and the text each row is classified from
+MOOD_BACKFILL_TARGETS: Dict[str, _Target] = {
+    "chat_messages": _Target(
+        ChatMessage,
+        "chat_message",
+        Conversation.user_id,
+        (ChatMessage.conversation_id, ChatMessage.content),
+        lambda row: row.content,
+        joins=((Conversation, Conversation.id == ChatMessage.conversation_id),),
+        data=lambda row: {"conversation_id": row.conversation_id},
+    ),
+    "timeline_events": _Target(
+        TimelineEvent,
+        "timeline_event",
+        TimelineEvent.user_id,
+        (TimelineEvent.title, TimelineEvent.description),
+        lambda row: f"{row.title}\n{row.description or ''}",
+    ),
+}
+
+
+@dataclass
+class MoodBackfillProgress:
+    table: str
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class MoodBackfillService:
+    """Fills `mood_context` for existing rows with the batched mood classifier.
+
+    Rows are read in primary-key order, MOOD_BACKFILL_BATCH_SIZE at a time,
+    classified in one call off the event loop and written back with a
+    single executemany UPDATE per batch, each batch in its own transaction.
+    Only rows without a mood are touched unless `overwrite` is set; an
+    interrupted run can simply be started again. Each batch publishes its
+    updates, which only reaches this process's broker and response cache:
+    against a running server, run it there (`backfill_moods_job`).
+    """
+
+    def __init__(self, db: AsyncSession, classifier: Optional[MoodClassifier] = None):
+        self.db = db
+        self.classifier = classifier or get_mood_classifier()
+
+    async def backfill(
+        self,
+        table: str,
+        overwrite: bool = False,
+        user_id: Optional[UUID] = None,
+        batch_size: Optional[int] = None,
+        on_batch: Optional[Callable[[MoodBackfillProgress], None]] = None,
+    ) -> MoodBackfillProgress:
+        target = MOOD_BACKFILL_TARGETS[table]
+        model = target.model
+        batch_size = batch_size or settings.MOOD_BACKFILL_BATCH_SIZE
+        progress = MoodBackfillProgress(table)
+        started = time.monotonic()
+
+        last_id = None
+        while True:
+            query = select(model.id, target.owner.label("owner_id"), *target.columns).order_by(model.id).limit(batch_size)
+            for join in target.joins:
+                query = query.join(*join)
+            if user_id is not None:
+                query = query.filter(target.owner == user_id)
+            if not overwrite:
+                query = query.filter(model.mood_context.is_(None))
+            if last_id is not None:
+                query = query.filter(model.id > last_id)
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+
+            results = await asyncio.to_thread(self.classifier.classify, [target.text(row) for row in rows])
+            params: List[Dict[str, Any]] = [
+                {"id": row.id, "mood_context": label} for row, (label, _) in zip(rows, results)
+            ]
+            await self.db.execute(update(model), params)
+            await self.db.commit()
+            events: Dict[UUID, List[ChangeEvent]] = defaultdict(list)
+            for row, (label, _) in zip(rows, results):
+                events[row.owner_id].append(ChangeEvent(target.entity, "updated", row.id, {**target.data(row), "mood_context": label}))
+            for owner_id, owner_events in events.items():
+                change_broker.publish(owner_id, *owner_events)
+
+            last_id = rows[-1].id
+            progress.rows += len(rows)
+            progress.seconds = time.monotonic() - started
+            if on_batch is not None:
+                on_batch(progress)
+            if len(rows) < batch_size:
+                break
+        return progress
+
+
+# Entry point for run_with_session background tasks
+async def backfill_moods_job(db: AsyncSession, user_id: UUID):
+    service = MoodBackfillService(db)
+    for table in MOOD_BACKFILL_TARGETS:
+        await service.backfill(table, user_id=user_id)
@@ -0,0 +1,55 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import tuple_, union_all
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.database.dialect import IS_SQLITE
+from src.database.fulltext import SEARCHABLE, fts5_query, headline, hits_query
+from src.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        user_id: UUID,
+        query: str,
+        entity_types: Optional[Sequence[str]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        # Ranked across entity types; the cursor is (rank, id) of the last hit
+        if not query.strip() or (IS_SQLITE and fts5_query(query) is None):
+            return [], None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        entities = [SEARCHABLE[entity_type] for entity_type in (entity_types or SEARCHABLE)]
+        parts = [hits_query(entity, user_id, query) for entity in entities]
+        hits = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("hits")
+
+        page = select(hits)
+        if cursor is not None:
+            page = page.where(tuple_(hits.c.rank, hits.c.id) < tuple_(*decode_cursor(cursor)))
+        page = page.order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit + 1)
+        if not IS_SQLITE:
+            # ts_headline re-parses the document, so only run it on the rows being returned
+            page = page.subquery("page")
+            page = select(
+                page.c.entity_type, page.c.id, page.c.title, page.c.created_at, page.c.rank,
+                headline(page.c.text, query).label("text"),
+            ).order_by(page.c.rank.desc(), page.c.id.desc())
+
+        rows = (await self.db.execute(page)).all()
+        next_cursor = encode_cursor(rows[limit - 1].rank, rows[limit - 1].id) if len(rows) > limit else None
+        return [
+            {
+                "entity_type": row.entity_type,
+                "id": row.id,
+                "title": row.title,
+                "snippet": row.text,
+                "rank": row.rank,
+                "created_at": row.created_at,
+            }
+            for row in rows[:limit]
+        ], next_cursor
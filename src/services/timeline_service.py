@@ -0,0 +1,117 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import Row, func
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, time, timedelta, timezone
+
+from src.core.serialization import response_columns
+from src.database.dialect import time_bucket
+from src.database.pagination import paginate, DEFAULT_PAGE_SIZE
+from src.models.timeline_event import TimelineEvent
+from src.schemas.life_os import TimelineEventResponse
+from src.services.mood_analytics_service import period_start, shift_period
+
+DEFAULT_BUCKETS = 90 # Range ending at `end` when no `start` is given
+MAX_BUCKETS = 3660 # Earlier starts are clamped; ten years of days
+
+
+def _utc(moment: datetime) -> datetime:
+    # Naive timestamps (query strings, SQLite rows) are taken to be UTC
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def bucket_floor(bucket: str, moment: datetime) -> datetime:
+    moment = _utc(moment)
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return datetime.combine(period_start(bucket, moment.date()), time(), timezone.utc)
+
+
+def shift_bucket(bucket: str, start: datetime, buckets: int) -> datetime:
+    # `start` must already be a bucket start of `bucket`
+    if bucket == "hour":
+        return start + timedelta(hours=buckets)
+    return datetime.combine(shift_period(bucket, start.date(), buckets), time(), timezone.utc)
+
+
+class TimelineService:
+    """Zoomable Life OS timeline: bucketed counts for a range, full events for a window.
+
+    The overview is a single GROUP BY over (bucket, type, mood_context) that
+    reads only the `(user_id, timestamp, type, mood_context)` index, so it
+    costs one row per bucket and combination present rather than one per
+    event, and an old range is as fast as a recent one. Full rows are read
+    only for the detail window, one keyset page at a time. Buckets are UTC
+    hours, days, Monday-based weeks or months.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_timeline(
+        self,
+        user_id: UUID,
+        bucket: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        detail_start: Optional[datetime] = None,
+        detail_end: Optional[datetime] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        # [start, end) always covers whole buckets; `end` falls in the last one
+        last = bucket_floor(bucket, end or datetime.now(timezone.utc))
+        first = bucket_floor(bucket, start) if start else shift_bucket(bucket, last, -(DEFAULT_BUCKETS - 1))
+        first = max(first, shift_bucket(bucket, last, -(MAX_BUCKETS - 1)))
+        end = shift_bucket(bucket, last, 1)
+
+        events, next_cursor = [], None
+        if detail_start or detail_end:
+            detail_start = _utc(detail_start) if detail_start else first
+            detail_end = _utc(detail_end) if detail_end else end
+            events, next_cursor = await self._detail(user_id, detail_start, detail_end, limit, cursor)
+
+        return {
+            "bucket": bucket,
+            "start": first,
+            "end": end,
+            "buckets": await self._buckets(user_id, bucket, first, end),
+            "events": [event._asdict() for event in events],
+            "next_cursor": next_cursor,
+        }
+
+    async def _buckets(self, user_id: UUID, bucket: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        bucket_start = time_bucket(TimelineEvent.timestamp, bucket)
+        rows = (await self.db.execute(
+            select(bucket_start.label("bucket_start"), TimelineEvent.type, TimelineEvent.mood_context, func.count().label("count"))
+            .filter(TimelineEvent.user_id == user_id, TimelineEvent.timestamp >= start, TimelineEvent.timestamp < end)
+            .group_by(bucket_start, TimelineEvent.type, TimelineEvent.mood_context)
+        )).all()
+
+        buckets: Dict[datetime, Dict[str, Any]] = {}
+        for row in rows:
+            key = row.bucket_start if isinstance(row.bucket_start, datetime) else datetime.fromisoformat(row.bucket_start)
+            summary = buckets.setdefault(_utc(key), {"count": 0, "types": {}, "moods": {}})
+            summary["count"] += row.count
+            summary["types"][row.type] = summary["types"].get(row.type, 0) + row.count
+            if row.mood_context is not None:
+                summary["moods"][row.mood_context] = summary["moods"].get(row.mood_context, 0) + row.count
+
+        results = []
+        for key in sorted(buckets):
+            summary = buckets[key]
+            moods = summary.pop("moods")
+            # Ties go to the alphabetically first mood, so the answer is stable between requests
+            dominant_mood = min(moods, key=lambda mood: (-moods[mood], mood), default=None)
+            results.append({"start": key, **summary, "dominant_mood": dominant_mood})
+        return results
+
+    async def _detail(self, user_id: UUID, start: datetime, end: datetime, limit: int, cursor: Optional[str]) -> Tuple[List[Row], Optional[str]]:
+        query = (
+            select(*response_columns(TimelineEvent, TimelineEventResponse))
+            .filter(TimelineEvent.user_id == user_id, TimelineEvent.timestamp >= start, TimelineEvent.timestamp < end)
+        )
+        return await paginate(self.db, query, TimelineEvent.timestamp, TimelineEvent.id, limit, cursor)
@@ -5,7 +5,7 @@ from uuid import UUID
 from src.models.user import User
 from src.schemas.user import UserCreate
 from src.core.exceptions import UserNotFoundException, DuplicateUserException
-from src.core.security import get_password_hash
+from src.core.security import password_hasher
 
 class UserService:
     def __init__(self, db: AsyncSession):
@@ -32,7 +32,7 @@ class UserService:
         if await self.get_user_by_username(user_data.username):
             raise DuplicateUserException(detail="Username already registered")
         
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         new_user = User(
             username=user_data.username,
             email=user_data.email,
@@ -0,0 +1,313 @@
+from collections import Counter, defaultdict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, insert, update, func
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import logging
+import time
+
+from src.config.settings import settings
+from src.core.events import ChangeEvent, change_broker
+from src.models.cluster_assignment import ClusterAssignment
+from src.models.dismissed_wiki_cluster import DismissedWikiCluster
+from src.models.memory_card import MemoryCard
+from src.models.wiki_entry import WikiEntry
+from src.models.wiki_entry_source import WikiEntrySource
+from src.services.ai_pipeline_service import AiPipelineService
+
+logger = logging.getLogger(__name__)
+
+GENERATED_ENTRY_TYPE = "Topic"
+GENERATED_TAG_COUNT = 5
+
+
+def card_content_hash(title: str, content: Optional[str], tags: Optional[List[str]]) -> str:
+    # Everything a generated entry is written from; canvas moves and other edits don't count
+    payload = "\0".join([title, content or "", ",".join(sorted(tags or []))])
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class ClusterChange:
+    user_id: UUID
+    cluster_id: UUID
+    label: Optional[str]
+    entry_id: Optional[UUID] # Existing generated entry, if any
+    hashes: Dict[UUID, str] # Current members and their content hashes
+    priority: int # Cards added, removed or edited since the entry was generated
+    checked_at: datetime # When `hashes` were read
+
+
+@dataclass
+class WikiGenerationReport:
+    generated: int = 0
+    removed: int = 0
+    pending: int = 0 # Changed clusters left for the next run once the budget ran out
+    seconds: float = 0.0
+    users: Set[UUID] = field(default_factory=set)
+
+
+class WikiGenerationService:
+    """Keeps one LLM-written wiki entry per memory cluster, regenerating only what changed.
+
+    Each entry records its source cards and their content hashes in
+    `wiki_entry_sources`. A run first compares every cluster's membership
+    and card `updated_at` with its entry's provenance, which needs no card
+    text; only clusters that fail that check have their cards read and
+    hashed, and only those whose hashes actually differ are regenerated.
+    Changed clusters across all users are then summarized most-changed
+    first until WIKI_GENERATION_BUDGET_SECONDS of LLM time is spent; the
+    rest still differ from their provenance, so the next run picks them up.
+    Entries whose cluster is gone or has shrunk below WIKI_MIN_CLUSTER_SIZE
+    are removed. User-written entries (no cluster) are never touched, and
+    neither are clusters whose generated entry the user deleted.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ai = AiPipelineService(db)
+
+    async def run(self, user_ids: Optional[List[UUID]] = None) -> WikiGenerationReport:
+        report = WikiGenerationReport()
+        changes: List[ClusterChange] = []
+        for user_id in user_ids if user_ids is not None else await self._users_with_clusters():
+            user_changes, removed = await self._detect_changes(user_id)
+            changes.extend(user_changes)
+            report.removed += removed
+
+        changes.sort(key=lambda change: change.priority, reverse=True)
+        deadline = time.monotonic() + settings.WIKI_GENERATION_BUDGET_SECONDS
+        started = time.monotonic()
+        for position, change in enumerate(changes):
+            if time.monotonic() >= deadline:
+                report.pending = len(changes) - position
+                break
+            if await self._generate(change):
+                report.generated += 1
+                report.users.add(change.user_id)
+        report.seconds = time.monotonic() - started
+        return report
+
+    async def _users_with_clusters(self) -> List[UUID]:
+        # Users with generated entries but no clusters left still need those entries removed
+        result = await self.db.execute(
+            select(ClusterAssignment.user_id)
+            .union(select(WikiEntry.user_id).filter(WikiEntry.cluster_id.is_not(None)))
+        )
+        return list(result.scalars().all())
+
+    async def _detect_changes(self, user_id: UUID) -> Tuple[List[ClusterChange], int]:
+        members = (await self.db.execute(
+            select(ClusterAssignment.cluster_id, ClusterAssignment.cluster_label, MemoryCard.id, MemoryCard.updated_at)
+            .join(MemoryCard, MemoryCard.id == ClusterAssignment.memory_card_id)
+            .filter(ClusterAssignment.user_id == user_id)
+        )).all()
+        clusters: Dict[UUID, Dict[UUID, Any]] = defaultdict(dict)
+        labels: Dict[UUID, Counter] = defaultdict(Counter)
+        for row in members:
+            # A card with several graph nodes (e.g. per-chunk ones) counts once per cluster
+            clusters[row.cluster_id][row.id] = row.updated_at
+            if row.cluster_label:
+                labels[row.cluster_id][row.cluster_label] += 1
+        dismissed = set((await self.db.execute(
+            select(DismissedWikiCluster.cluster_id).filter(DismissedWikiCluster.user_id == user_id)
+        )).scalars().all())
+        if dismissed - clusters.keys():
+            # The cluster is gone, so a dismissal can no longer match anything
+            await self.db.execute(
+                delete(DismissedWikiCluster)
+                .where(DismissedWikiCluster.user_id == user_id, DismissedWikiCluster.cluster_id.in_(dismissed - clusters.keys()))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        clusters = {
+            cluster_id: cards for cluster_id, cards in clusters.items()
+            if len(cards) >= settings.WIKI_MIN_CLUSTER_SIZE and cluster_id not in dismissed
+        }
+
+        entries = {
+            row.cluster_id: row
+            for row in (await self.db.execute(
+                select(WikiEntry.id, WikiEntry.cluster_id, WikiEntry.sources_checked_at)
+                .filter(WikiEntry.user_id == user_id, WikiEntry.cluster_id.is_not(None))
+            )).all()
+        }
+        provenance: Dict[UUID, Dict[UUID, str]] = defaultdict(dict)
+        for row in (await self.db.execute(
+            select(WikiEntrySource.wiki_entry_id, WikiEntrySource.memory_card_id, WikiEntrySource.content_hash)
+            .filter(WikiEntrySource.user_id == user_id)
+        )).all():
+            provenance[row.wiki_entry_id][row.memory_card_id] = row.content_hash
+
+        removed = await self._remove_entries(user_id, [entry.id for cluster_id, entry in entries.items() if cluster_id not in clusters])
+
+        # Cheap screen: same members and no card written since the last check means nothing to do.
+        # Card writes that leave the text alone (e.g. canvas moves) only cost a re-hash.
+        suspects = []
+        for cluster_id, cards in clusters.items():
+            entry = entries.get(cluster_id)
+            if entry is not None and entry.sources_checked_at is not None and cards.keys() == provenance[entry.id].keys() and all(
+                updated_at is None or updated_at < entry.sources_checked_at for updated_at in cards.values()
+            ):
+                continue
+            suspects.append(cluster_id)
+        if not suspects:
+            return [], removed
+
+        # Database time, comparable with updated_at; taken before the cards are read
+        checked_at = await self.db.scalar(select(func.now()))
+        card_ids = [card_id for cluster_id in suspects for card_id in clusters[cluster_id]]
+        hashes = {
+            row.id: card_content_hash(row.title, row.content, row.tags)
+            for row in (await self.db.execute(
+                select(MemoryCard.id, MemoryCard.title, MemoryCard.content, MemoryCard.tags)
+                .filter(MemoryCard.user_id == user_id, MemoryCard.id.in_(card_ids))
+            )).all()
+        }
+
+        changes, unchanged = [], []
+        for cluster_id in suspects:
+            entry = entries.get(cluster_id)
+            current = {card_id: hashes[card_id] for card_id in clusters[cluster_id] if card_id in hashes}
+            previous = provenance[entry.id] if entry is not None else {}
+            difference = set(current.items()) ^ set(previous.items())
+            if not difference:
+                if entry is not None:
+                    unchanged.append(entry.id)
+                continue
+            changes.append(ClusterChange(
+                user_id=user_id,
+                cluster_id=cluster_id,
+                label=labels[cluster_id].most_common(1)[0][0] if labels[cluster_id] else None,
+                entry_id=entry.id if entry is not None else None,
+                hashes=current,
+                # Both halves of an edited card are in the difference; count each card once
+                priority=len({card_id for card_id, _ in difference}),
+                checked_at=checked_at,
+            ))
+        if unchanged:
+            await self.db.execute(
+                update(WikiEntry)
+                .where(WikiEntry.id.in_(unchanged))
+                .values(sources_checked_at=checked_at)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        return changes, removed
+
+    async def _remove_entries(self, user_id: UUID, entry_ids: List[UUID]) -> int:
+        if not entry_ids:
+            return 0
+        await self.db.execute(
+            delete(WikiEntrySource)
+            .where(WikiEntrySource.wiki_entry_id.in_(entry_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(
+            delete(WikiEntry)
+            .where(WikiEntry.user_id == user_id, WikiEntry.id.in_(entry_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        change_broker.publish(user_id, *(ChangeEvent("wiki_entry", "deleted", entry_id) for entry_id in entry_ids))
+        return len(entry_ids)
+
+    def _prompt(self, cards: List[Any]) -> Tuple[str, List[str]]:
+        context, remaining = [], settings.WIKI_PROMPT_MAX_CHARS
+        for card in cards:
+            text = f"{card.title}\n{card.content or ''}".strip()[:remaining]
+            if not text:
+                break
+            context.append(text)
+            remaining -= len(text)
+        prompt = (
+            "Write a short encyclopedia-style summary of the topic these personal memories share. "
+            "Describe what they have in common and the key facts, in the third person."
+        )
+        return prompt, context
+
+    async def _generate(self, change: ClusterChange) -> bool:
+        cards = (await self.db.execute(
+            select(MemoryCard.id, MemoryCard.title, MemoryCard.content, MemoryCard.tags)
+            .filter(MemoryCard.user_id == change.user_id, MemoryCard.id.in_(list(change.hashes)))
+            .order_by(MemoryCard.created_at)
+        )).all()
+        # Nothing stays open across the LLM call: a held transaction would keep its connection
+        # (on SQLite, the only writer) busy for as long as the model runs
+        await self.db.commit()
+        if not cards:
+            return False # Deleted since detection
+        prompt, context = self._prompt(cards)
+        summary = await self.ai.llm_inference(prompt, context=context)
+
+        # The cards may have changed while the model ran. Lock them and write only if they still
+        # match what was summarized; otherwise the next run sees the difference and redoes it.
+        current = {
+            row.id: card_content_hash(row.title, row.content, row.tags)
+            for row in (await self.db.execute(
+                select(MemoryCard.id, MemoryCard.title, MemoryCard.content, MemoryCard.tags)
+                .filter(MemoryCard.user_id == change.user_id, MemoryCard.id.in_([card.id for card in cards]))
+                .with_for_update()
+            )).all()
+        }
+        if current != {card.id: change.hashes[card.id] for card in cards}:
+            await self.db.rollback()
+            return False
+
+        tags = Counter(tag for card in cards for tag in (card.tags or []))
+        values = {
+            "title": change.label or cards[0].title,
+            "type": GENERATED_ENTRY_TYPE,
+            "summary": summary,
+            "tags": [tag for tag, _ in tags.most_common(GENERATED_TAG_COUNT)],
+            "generated_at": func.now(),
+            # A card edited after detection is newer than this, so the next run looks at it again
+            "sources_checked_at": change.checked_at,
+        }
+        if change.entry_id is None:
+            entry_id = await self.db.scalar(
+                insert(WikiEntry)
+                .values(user_id=change.user_id, cluster_id=change.cluster_id, **values)
+                .returning(WikiEntry.id)
+            )
+            action = "created"
+        else:
+            entry_id = await self.db.scalar(
+                update(WikiEntry)
+                .where(WikiEntry.id == change.entry_id)
+                .values(**values)
+                .returning(WikiEntry.id)
+                .execution_options(synchronize_session=False)
+            )
+            if entry_id is None:
+                await self.db.rollback()
+                return False # Deleted by the user while the model ran
+            await self.db.execute(
+                delete(WikiEntrySource)
+                .where(WikiEntrySource.wiki_entry_id == entry_id)
+                .execution_options(synchronize_session=False)
+            )
+            action = "updated"
+
+        sources = [
+            {"wiki_entry_id": entry_id, "memory_card_id": card.id, "user_id": change.user_id, "content_hash": change.hashes[card.id]}
+            for card in cards
+        ]
+        await self.db.execute(insert(WikiEntrySource), sources)
+        await self.db.commit()
+        change_broker.publish(change.user_id, ChangeEvent("wiki_entry", action, entry_id))
+        return True
+
+
+# Entry point for the periodic run started in the app lifespan
+async def generate_wiki_entries_job(db: AsyncSession):
+    report = await WikiGenerationService(db).run()
+    if report.generated or report.removed:
+        logger.info(
+            "Wiki generation: %d entries written for %d users in %.1fs, %d removed, %d left for the next run",
+            report.generated, len(report.users), report.seconds, report.removed, report.pending,
+        )
@@ -0,0 +1,62 @@
+"""Keyset pagination on embedded SQLite, where timestamps are stored as text."""
+import asyncio
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import Column, String, func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.future import select
+
+from src.database.pagination import paginate
+from src.database.types import UUID, DateTime
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+async def _walk_pages(descending: bool, page_size: int = 3):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        # Server defaults land in the same second; app-bound values straddle it with and without microseconds
+        db.add_all(Row(title=f"default {i}") for i in range(7))
+        await db.flush()
+        stored = (await db.execute(select(Row.created_at).limit(1))).scalar_one()
+        second = stored.replace(microsecond=0)
+        db.add_all([
+            Row(title="same second", created_at=second),
+            Row(title="later", created_at=second + timedelta(microseconds=250)),
+            Row(title="earlier", created_at=second - timedelta(seconds=1)),
+        ])
+        await db.commit()
+
+        seen, cursor = [], None
+        for _ in range(20):
+            rows, cursor = await paginate(db, select(Row), Row.created_at, Row.id, page_size, cursor, descending)
+            seen.extend(row.title for row in rows)
+            if cursor is None:
+                break
+    await engine.dispose()
+    return seen
+
+
+def test_descending_pages_visit_every_row_once():
+    seen = asyncio.run(_walk_pages(descending=True))
+    assert len(seen) == 10 and len(set(seen)) == 10
+    assert seen[0] == "later" and seen[-1] == "earlier"
+
+
+def test_ascending_pages_visit_every_row_once():
+    seen = asyncio.run(_walk_pages(descending=False))
+    assert len(seen) == 10 and len(set(seen)) == 10
+    assert seen[0] == "earlier" and seen[-1] == "later"